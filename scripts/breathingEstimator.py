@@ -0,0 +1,160 @@
+"""
+Breathing Estimator
+
+Author: Louis H
+Date: 2026-10-18
+
+This module estimates breathing rates from periodic amplitude streams, such as the mean CSI amplitude of a
+link, and maps them to the WiFiSimulator's breathing labels. Each link keeps its latest window of samples in a
+ring buffer and a sliding DFT of the window, restricted to the bins of the breathing band. A new sample updates
+each tracked bin in O(1), so a frame costs O(bins) per link instead of a full FFT of the window, and all links
+are updated together with vectorized operations. To stop rounding errors from accumulating in the recursion,
+the bins are recomputed exactly from the ring buffer once per window length, which adds amortized O(bins) work
+per frame.
+
+Modules:
+    - numpy: Provides the ring buffers and vectorized DFT updates.
+    - scripts.csiGenerator: Provides the breathing rate of each breathing label.
+
+Classes:
+    - BreathingEstimator: Estimates the breathing rates of many links from streaming samples.
+
+Functions:
+    - csi_amplitude: Reduces CSI frames to one amplitude sample per frame.
+"""
+
+import numpy as np
+from scripts.csiGenerator import BREATHING_RATES_BPM
+
+def csi_amplitude(frames):
+    """
+    Reduces CSI frames to one amplitude sample per frame by averaging over antennas and subcarriers. The
+    average is insensitive to the random common phase offset of each frame.
+
+    Args:
+        frames (numpy.ndarray): CSI of shape (frames, antennas, subcarriers).
+
+    Returns:
+        numpy.ndarray: The amplitude of every frame.
+    """
+    return np.abs(frames).mean(axis=(1, 2))
+
+class BreathingEstimator:
+    """
+    Estimates the breathing rates of many links from streaming samples with a sliding DFT over a window.
+
+    Attributes:
+        n_links (int): The number of links estimated together.
+        sample_rate (float): The samples per second of every stream.
+        window (int): The window length in samples.
+        frequencies (numpy.ndarray): The frequency in Hz of every tracked bin.
+        samples (int): The number of samples received per link so far.
+    """
+
+    def __init__(self, n_links=1, sample_rate=100, window_seconds=30, min_bpm=6, max_bpm=42):
+        """
+        Initializes the BreathingEstimator.
+
+        Args:
+            n_links (int): The number of links estimated together.
+            sample_rate (float): The samples per second of every stream.
+            window_seconds (float): The window length; its inverse is the frequency resolution.
+            min_bpm (float): The lowest breathing rate tracked, in breaths per minute.
+            max_bpm (float): The highest breathing rate tracked, in breaths per minute.
+        """
+        self.n_links = n_links
+        self.sample_rate = sample_rate
+        self.window = int(round(window_seconds * sample_rate))
+        first = max(int(np.floor(min_bpm / 60 * window_seconds)), 1)
+        last = int(np.ceil(max_bpm / 60 * window_seconds))
+        self._bins = np.arange(first, last + 1)
+        self.frequencies = self._bins / (self.window / sample_rate)
+        self.samples = 0
+        self._buffer = np.zeros((n_links, self.window))
+        self._position = 0
+        self._spectrum = np.zeros((n_links, len(self._bins)), dtype=np.complex128)
+        self._since_refresh = 0
+        self._rotation = np.exp(2j * np.pi * self._bins / self.window)
+        self._dft = np.exp(-2j * np.pi * np.outer(np.arange(self.window), self._bins) / self.window)
+        # Labels ordered by rate, with boundaries halfway between neighbouring rates
+        ordered = sorted(BREATHING_RATES_BPM.items(), key=lambda item: item[1])
+        self._labels = [label for label, _ in ordered]
+        rates = [rate for _, rate in ordered]
+        self._boundaries = np.array([(low + high) / 2 for low, high in zip(rates, rates[1:])])
+
+    @property
+    def ready(self):
+        """
+        bool: Whether a full window has been received, so that rates are available.
+        """
+        return self.samples >= self.window
+
+    def update(self, samples):
+        """
+        Adds samples to every link's stream.
+
+        Args:
+            samples (numpy.ndarray): One sample per link, of shape (n_links,), or a block of consecutive samples
+                                     of shape (n_frames, n_links).
+        """
+        block = np.asarray(samples, dtype=np.float64).reshape(-1, self.n_links)
+        for start in range(0, len(block), self.window):
+            self._slide(block[start:start + self.window])
+
+    def rates(self):
+        """
+        Estimates every link's breathing rate from the strongest bin of its window, refined by parabolic
+        interpolation between the neighbouring bins.
+
+        Returns:
+            numpy.ndarray: The rates in breaths per minute, NaN until a full window has been received.
+        """
+        if not self.ready:
+            return np.full(self.n_links, np.nan)
+        magnitudes = np.abs(self._spectrum)
+        peaks = np.argmax(magnitudes, axis=1)
+        links = np.arange(self.n_links)
+        inner = np.clip(peaks, 1, len(self._bins) - 2)
+        left, centre, right = (magnitudes[links, inner - 1], magnitudes[links, inner],
+                               magnitudes[links, inner + 1])
+        denominator = left - 2 * centre + right
+        shift = np.where(denominator < 0, 0.5 * (left - right) / np.where(denominator < 0, denominator, 1), 0)
+        shift = np.where(inner == peaks, shift, 0)
+        bins = self._bins[peaks] + shift
+        return bins / (self.window / self.sample_rate) * 60
+
+    def labels(self):
+        """
+        Maps every link's estimated rate to the nearest breathing label.
+
+        Returns:
+            list: One of 'Slow', 'Normal' or 'Fast' per link, or None until a full window has been received.
+        """
+        if not self.ready:
+            return [None] * self.n_links
+        return [self._labels[i] for i in np.searchsorted(self._boundaries, self.rates()).tolist()]
+
+    def _slide(self, block):
+        m = len(block)
+        positions = (self._position + np.arange(m)) % self.window
+        delta = block.T - self._buffer[:, positions]
+        self._buffer[:, positions] = block.T
+        self._position = (self._position + m) % self.window
+        self.samples += m
+        self._since_refresh += m
+        if self._since_refresh >= self.window:
+            self._refresh()
+            return
+        # X_k <- (X_k + x_new - x_old) * w_k per sample, with w_k = exp(2j*pi*k/N), applied to the whole block
+        if m == 1:
+            self._spectrum += delta
+            self._spectrum *= self._rotation
+            return
+        steps = np.arange(m, 0, -1)[:, None] * self._bins[None, :]
+        self._spectrum *= self._rotation ** m
+        self._spectrum += delta @ np.exp(2j * np.pi * steps / self.window)
+
+    def _refresh(self):
+        # Exact DFT of the window, oldest sample first, on the tracked bins only
+        self._spectrum = np.roll(self._buffer, -self._position, axis=1) @ self._dft
+        self._since_refresh = 0
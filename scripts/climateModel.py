@@ -0,0 +1,260 @@
+"""
+Climate Model
+
+Author: Louis H
+Date: 2026-10-18
+
+This module models the temperature and humidity of many sites as continuous functions of time. The temperature of
+a site is its annual mean plus a seasonal and a diurnal cycle, a slowly varying weather anomaly and sensor noise:
+
+    T(t) = mean + seasonal cos(2 pi (t - coldest day) / year + pi) + diurnal cos(2 pi (t - warmest hour) / day)
+           + weather(t) + noise
+
+Relative humidity falls as the air warms, so it follows the temperature's deviation from the site mean with a
+negative coupling, plus its own weather anomaly and noise, clipped to 0-100 %.
+
+Every cycle is a combination of the cosine and sine of the time's phase, so the cycles of all sites are one
+matrix product of per-site coefficients with four shared basis rows. Weather anomalies are Ornstein-Uhlenbeck
+processes sampled at hourly knots by an AR(1) recurrence and interpolated linearly, so their cost does not depend
+on the sampling rate. Knots are extended lazily in both directions, and series of any length are generated in
+chunks of float32 arrays, e.g. a year at 2-second resolution for many sites, without lookup lists.
+
+Times are seconds since 1 January 00:00; Unix timestamps work too, as every cycle is periodic.
+
+Modules:
+    - numpy: Provides the vectorized series.
+    - scripts.sampling: Provides the module-wide random stream.
+
+Classes:
+    - ClimateModel: Continuous temperature and humidity of many sites with diurnal and seasonal cycles.
+"""
+
+import numpy as np
+from scripts.sampling import default_stream, make_stream
+
+DAY = 86_400.0
+YEAR = 365.25 * DAY
+KNOT_SECONDS = 3_600.0  # Spacing of the weather anomaly knots
+
+class ClimateModel:
+    """
+    Continuous temperature and humidity of many sites. Every parameter is a scalar shared by all sites or an
+    array with one value per site.
+
+    Attributes:
+        sites (int): The number of sites.
+        mean (numpy.ndarray): The annual mean temperature in degrees Celsius.
+        seasonal (numpy.ndarray): The amplitude of the seasonal cycle in degrees.
+        coldest_day (numpy.ndarray): The day of the year with the lowest seasonal temperature, from 0.
+        diurnal (numpy.ndarray): The amplitude of the diurnal cycle in degrees.
+        warmest_hour (numpy.ndarray): The hour of the day with the highest diurnal temperature.
+        humidity (numpy.ndarray): The mean relative humidity in percent.
+        coupling (numpy.ndarray): The change of relative humidity per degree above the mean, in percent.
+        weather (numpy.ndarray): The standard deviation of the temperature's weather anomaly in degrees.
+        weather_days (numpy.ndarray): The correlation time of the temperature's weather anomaly in days.
+        humidity_weather (numpy.ndarray): The standard deviation of the humidity's weather anomaly in percent.
+        humidity_days (numpy.ndarray): The correlation time of the humidity's weather anomaly in days.
+        noise (float): The standard deviation of the sensor noise, in degrees and percent.
+        rng (RandomStream): The stream drawing the weather and noise.
+    """
+
+    def __init__(self, sites=1, mean=12.0, seasonal=10.0, coldest_day=15.0, diurnal=4.0, warmest_hour=15.0,
+                 humidity=65.0, coupling=-2.5, weather=3.0, weather_days=3.0, humidity_weather=8.0,
+                 humidity_days=1.0, noise=0.1, rng=None):
+        """
+        Initializes the ClimateModel.
+
+        Args:
+            sites (int): The number of sites.
+            mean (float or list): The annual mean temperature in degrees Celsius.
+            seasonal (float or list): The amplitude of the seasonal cycle in degrees.
+            coldest_day (float or list): The day of the year with the lowest seasonal temperature.
+            diurnal (float or list): The amplitude of the diurnal cycle in degrees.
+            warmest_hour (float or list): The hour of the day with the highest diurnal temperature.
+            humidity (float or list): The mean relative humidity in percent.
+            coupling (float or list): The change of relative humidity per degree above the mean, in percent.
+            weather (float or list): The standard deviation of the temperature's weather anomaly in degrees.
+            weather_days (float or list): The correlation time of the temperature's weather anomaly in days.
+            humidity_weather (float or list): The standard deviation of the humidity's weather anomaly.
+            humidity_days (float or list): The correlation time of the humidity's weather anomaly in days.
+            noise (float): The standard deviation of the sensor noise.
+            rng: The random source: a seed, a random.Random, a numpy.random.Generator or a RandomStream.
+                 Defaults to a module-wide stream.
+        """
+        if sites < 1:
+            raise ValueError("sites must be at least 1")
+        self.sites = sites
+        site = lambda value: np.broadcast_to(np.asarray(value, dtype=np.float64), sites).copy()
+        self.mean, self.seasonal, self.coldest_day = site(mean), site(seasonal), site(coldest_day)
+        self.diurnal, self.warmest_hour = site(diurnal), site(warmest_hour)
+        self.humidity, self.coupling = site(humidity), site(coupling)
+        self.weather, self.weather_days = site(weather), site(weather_days)
+        self.humidity_weather, self.humidity_days = site(humidity_weather), site(humidity_days)
+        if (self.weather_days <= 0).any() or (self.humidity_days <= 0).any():
+            raise ValueError("Weather correlation times must be positive")
+        if (self.weather < 0).any() or (self.humidity_weather < 0).any() or noise < 0:
+            raise ValueError("Standard deviations must not be negative")
+        self.noise = noise
+        self.rng = default_stream() if rng is None else make_stream(rng)
+        # Coefficients of cos and sin of the seasonal and diurnal phases, so that cycles are one matrix product;
+        # the seasonal minimum at coldest_day is a maximum half a year later
+        seasonal_phase = 2 * np.pi * (self.coldest_day * DAY / YEAR + 0.5)
+        diurnal_phase = 2 * np.pi * self.warmest_hour / 24
+        self._coefficients = np.stack([self.seasonal * np.cos(seasonal_phase),
+                                       self.seasonal * np.sin(seasonal_phase),
+                                       self.diurnal * np.cos(diurnal_phase),
+                                       self.diurnal * np.sin(diurnal_phase)], axis=1).astype(np.float32)
+        days = np.stack([self.weather_days, self.humidity_days])
+        self._decay = np.exp(-KNOT_SECONDS / (days * DAY))
+        self._innovation = np.stack([self.weather, self.humidity_weather]) * np.sqrt(1 - self._decay ** 2)
+        self._first_knot = None
+        self._knots = None
+        self._slopes = None
+
+    @classmethod
+    def random_sites(cls, sites, rng=None, **parameters):
+        """
+        Builds a model of sites with varied climates: mean temperatures from 2 to 22 degrees, seasonal
+        amplitudes from 3 to 12 degrees, diurnal amplitudes from 2 to 7 degrees and mean humidities from 40 to
+        80 %.
+
+        Args:
+            sites (int): The number of sites.
+            rng: The random source of the site parameters and the model.
+            **parameters: Further ClimateModel parameters, shared by all sites.
+
+        Returns:
+            ClimateModel: The model.
+        """
+        stream = make_stream(rng)
+        uniform = stream.generator.uniform
+        return cls(sites, mean=uniform(2, 22, sites), seasonal=uniform(3, 12, sites),
+                   diurnal=uniform(2, 7, sites), humidity=uniform(40, 80, sites), rng=stream, **parameters)
+
+    def at(self, time, noise=True):
+        """
+        Returns the temperature and humidity of every site at one time.
+
+        Args:
+            time (float): The time in seconds.
+            noise (bool): Whether to add sensor noise.
+
+        Returns:
+            tuple: The float32 temperature and humidity of every site.
+        """
+        temperature, humidity = self.series(time, 1, noise=noise)
+        return temperature[:, 0], humidity[:, 0]
+
+    def series(self, start, n, step=2.0, noise=True):
+        """
+        Generates n readings of every site at regular times.
+
+        Args:
+            start (float): The time of the first reading in seconds.
+            n (int): The number of readings per site.
+            step (float): The seconds between readings.
+            noise (bool): Whether to add sensor noise.
+
+        Returns:
+            tuple: The float32 temperature and humidity arrays of shape (sites, n).
+        """
+        return self._evaluate(start + step * np.arange(n), noise)
+
+    def chunks(self, start, n, step=2.0, chunk_size=86_400, noise=True):
+        """
+        Generates n readings of every site at regular times in chunks, e.g. a year at 2-second resolution in
+        bounded memory.
+
+        Args:
+            start (float): The time of the first reading in seconds.
+            n (int): The number of readings per site.
+            step (float): The seconds between readings.
+            chunk_size (int): The number of readings per chunk.
+            noise (bool): Whether to add sensor noise.
+
+        Yields:
+            tuple: The index of the chunk's first reading and its float32 temperature and humidity arrays of
+                   shape (sites, chunk length).
+        """
+        for first in range(0, n, chunk_size):
+            yield (first,) + self.series(start + first * step, min(chunk_size, n - first), step, noise)
+
+    def sample(self, time, sites, noise=True):
+        """
+        Returns the readings of many devices at one time, e.g. the devices of a fleet, each at one site.
+
+        Args:
+            time (float): The time in seconds.
+            sites (numpy.ndarray): The site index of every device.
+            noise (bool): Whether to add sensor noise.
+
+        Returns:
+            tuple: The float32 temperature and humidity of every device.
+        """
+        temperature, humidity = self.at(time, noise=False)
+        temperature, humidity = temperature[sites], humidity[sites]
+        if noise and self.noise:
+            generator = self.rng.generator
+            temperature = temperature + self.noise * generator.standard_normal(len(temperature), dtype=np.float32)
+            humidity = humidity + self.noise * generator.standard_normal(len(humidity), dtype=np.float32)
+            np.clip(humidity, 0, 100, out=humidity)
+        return temperature, humidity
+
+    def _evaluate(self, times, noise):
+        times = np.asarray(times, dtype=np.float64)
+        # Phases are reduced in float64 so that large times keep their precision, then evaluated in float32
+        seasonal = (2 * np.pi / YEAR * np.mod(times, YEAR)).astype(np.float32)
+        diurnal = (2 * np.pi / DAY * np.mod(times, DAY)).astype(np.float32)
+        basis = np.stack([np.cos(seasonal), np.sin(seasonal), np.cos(diurnal), np.sin(diurnal)])
+        cycles = self._coefficients @ basis
+        weather, humidity_weather = self._anomaly(times)
+        temperature = cycles + weather
+        humidity = self.coupling.astype(np.float32)[:, None] * temperature
+        humidity += humidity_weather
+        temperature += self.mean.astype(np.float32)[:, None]
+        humidity += self.humidity.astype(np.float32)[:, None]
+        if noise and self.noise:
+            generator = self.rng.generator
+            temperature += self.noise * generator.standard_normal(temperature.shape, dtype=np.float32)
+            humidity += self.noise * generator.standard_normal(humidity.shape, dtype=np.float32)
+        np.clip(humidity, 0, 100, out=humidity)
+        return temperature, humidity
+
+    def _anomaly(self, times):
+        # Linear interpolation between the hourly knots around every time
+        position = times / KNOT_SECONDS
+        lower = np.floor(position).astype(np.int64)
+        self._extend(int(lower.min()), int(lower.max()) + 1)
+        index = lower - self._first_knot
+        fraction = (position - lower).astype(np.float32)
+        anomaly = np.take(self._knots, index, axis=2)
+        anomaly += np.take(self._slopes, index, axis=2) * fraction
+        return anomaly[0], anomaly[1]
+
+    def _extend(self, first, last):
+        # Grows the knots to cover [first, last] by at least doubling. A stationary AR(1) process run backwards
+        # has the same distribution as forwards, so earlier knots use the same recurrence.
+        generator = self.rng.generator
+        if self._knots is None:
+            start = generator.standard_normal((2, self.sites)) * np.stack([self.weather, self.humidity_weather])
+            self._knots = start[:, :, None].astype(np.float32)
+            self._first_knot = first
+        count = self._knots.shape[2]
+        before = max(0, self._first_knot - first)
+        after = max(0, last - (self._first_knot + count - 1))
+        if not before and not after:
+            return
+        before = max(before, count) if before else 0
+        after = max(after, count) if after else 0
+        parts = []
+        for length, edge in ((before, self._knots[:, :, 0]), (after, self._knots[:, :, -1])):
+            values = np.empty((2, self.sites, length), dtype=np.float32)
+            shocks = generator.standard_normal((length, 2, self.sites)) * self._innovation
+            value = edge.astype(np.float64)
+            for k in range(length):
+                value = self._decay * value + shocks[k]
+                values[:, :, k] = value
+            parts.append(values)
+        self._knots = np.concatenate([parts[0][:, :, ::-1], self._knots, parts[1]], axis=2)
+        self._first_knot -= before
+        self._slopes = np.diff(self._knots, axis=2, append=self._knots[:, :, -1:])
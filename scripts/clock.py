@@ -0,0 +1,140 @@
+"""
+Simulation Clocks
+
+Author: Louis H
+Date: 2026-10-18
+
+This module provides the clocks injected into the simulators' run loops. A run loop only ever asks its clock
+for the current time and to sleep for a number of simulated seconds, so the same loop can run in real time,
+scaled up (e.g. 1000x faster than real time), or as fast as possible on a virtual timeline. Every simulator's
+sleep is scaled by the same factor, so the relative cadence of the 2 s and 5 s loops is preserved.
+
+Every clock can also sleep asynchronously, so the simulators' async loops can share one asyncio event loop.
+
+Modules:
+    - abc: Provides the abstract base class of the clocks.
+    - asyncio: Provides asynchronous sleeps.
+    - time: Provides the wall and monotonic clocks and real sleeps.
+
+Classes:
+    - Clock: The interface shared by all clocks.
+    - RealTimeClock: Sleeps in real time.
+    - ScaledClock: Runs simulated time a fixed factor faster than real time.
+    - VirtualClock: Advances simulated time instantly, without sleeping.
+"""
+
+import abc
+import asyncio
+import time
+
+class Clock(abc.ABC):
+    """
+    The interface shared by all clocks. Times are simulated seconds.
+    """
+
+    @abc.abstractmethod
+    def now(self):
+        """
+        Returns the current simulated time.
+
+        Returns:
+            float: The current time in seconds.
+        """
+
+    @abc.abstractmethod
+    def sleep(self, seconds):
+        """
+        Waits for a number of simulated seconds.
+
+        Args:
+            seconds (float): The simulated duration. Negative durations return at once.
+        """
+
+    @abc.abstractmethod
+    async def asleep(self, seconds):
+        """
+        Waits for a number of simulated seconds without blocking the event loop.
+
+        Args:
+            seconds (float): The simulated duration. Negative durations return at once.
+        """
+
+class RealTimeClock(Clock):
+    """
+    A clock whose simulated time is real time, in seconds since the Unix epoch, so that time-of-day models such
+    as the climate model see the actual date and hour. It is anchored to the wall clock once and then advances
+    with the monotonic clock, so adjustments of the system clock never make it jump.
+    """
+
+    def __init__(self):
+        """
+        Initializes the RealTimeClock at the current wall-clock time.
+        """
+        self._offset = time.time() - time.monotonic()
+
+    def now(self):
+        return time.monotonic() + self._offset
+
+    def sleep(self, seconds):
+        time.sleep(max(seconds, 0))
+
+    async def asleep(self, seconds):
+        await asyncio.sleep(max(seconds, 0))
+
+class ScaledClock(Clock):
+    """
+    A clock whose simulated time runs a fixed factor faster than real time.
+
+    Attributes:
+        speedup (float): Simulated seconds per real second, e.g. 1000 for 1000x.
+    """
+
+    def __init__(self, speedup, start=0.0):
+        """
+        Initializes the ScaledClock.
+
+        Args:
+            speedup (float): Simulated seconds per real second.
+            start (float): The simulated time at creation.
+        """
+        if speedup <= 0:
+            raise ValueError("speedup must be positive")
+        self.speedup = speedup
+        self._start = start
+        self._real_start = time.monotonic()
+
+    def now(self):
+        return self._start + (time.monotonic() - self._real_start) * self.speedup
+
+    def sleep(self, seconds):
+        time.sleep(max(seconds, 0) / self.speedup)
+
+    async def asleep(self, seconds):
+        await asyncio.sleep(max(seconds, 0) / self.speedup)
+
+class VirtualClock(Clock):
+    """
+    A clock that advances simulated time instantly, so runs go as fast as the simulation itself allows.
+
+    Every sleep advances the one shared timeline, so a VirtualClock paces a single loop; concurrent loops that
+    must interleave in simulated time belong on an EventScheduler instead.
+    """
+
+    def __init__(self, start=0.0):
+        """
+        Initializes the VirtualClock.
+
+        Args:
+            start (float): The simulated time at creation.
+        """
+        self._now = start
+
+    def now(self):
+        return self._now
+
+    def sleep(self, seconds):
+        self._now += max(seconds, 0)
+
+    async def asleep(self, seconds):
+        self._now += max(seconds, 0)
+        await asyncio.sleep(0)
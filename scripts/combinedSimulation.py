@@ -1,8 +1,67 @@
-import random
-import time
+import copy
+import numpy as np
 from scripts.wifiSimulation import WiFiSimulator
 from scripts.embeddedSystem import EmbeddedSystemSimulator
 from scripts.environmentalSimulation import EnvironmentalSimulator
+from scripts.clock import RealTimeClock
+from scripts.outputSinks import ConsoleSink
+from scripts.performanceRules import PERFORMANCE_LABELS, PerformanceRules
+from scripts.performanceTable import PerformanceTable
+from scripts.sampling import make_stream, probabilities
+
+class CombinedSampleBatch:
+    """
+    A struct-of-arrays batch of combined simulator inputs.
+
+    Attributes:
+        temperature (numpy.ndarray): Temperatures in degrees Celsius.
+        humidity (numpy.ndarray): Humidities in percent.
+        response (numpy.ndarray): Embedded response codes indexing response_labels.
+        signal (numpy.ndarray): Signal codes indexing signal_labels.
+        movement (numpy.ndarray): Movement codes indexing movement_labels.
+        response_labels (tuple): The label table for response codes.
+        signal_labels (tuple): The label table for signal codes.
+        movement_labels (tuple): The label table for movement codes.
+    """
+
+    def __init__(self, temperature, humidity, response, signal, movement,
+                 response_labels, signal_labels, movement_labels):
+        """
+        Initializes the batch from value and code arrays and their label tables.
+        """
+        self.temperature = temperature
+        self.humidity = humidity
+        self.response = response
+        self.signal = signal
+        self.movement = movement
+        self.response_labels = tuple(response_labels)
+        self.signal_labels = tuple(signal_labels)
+        self.movement_labels = tuple(movement_labels)
+
+    def __len__(self):
+        return len(self.temperature)
+
+    def columns(self):
+        """
+        Returns the arrays in the argument order of CombinedSimulator.evaluate_arrays.
+
+        Returns:
+            tuple: The temperature, humidity, response, signal and movement arrays.
+        """
+        return self.temperature, self.humidity, self.response, self.signal, self.movement
+
+    def row(self, i):
+        """
+        Returns one sample in the argument order of CombinedSimulator.classify_performance.
+
+        Args:
+            i (int): The sample index.
+
+        Returns:
+            tuple: The temperature, humidity, embedded response, signal and movement of the sample.
+        """
+        return (self.temperature[i].item(), self.humidity[i].item(), self.response_labels[self.response[i]],
+                self.signal_labels[self.signal[i]], self.movement_labels[self.movement[i]])
 
 class CombinedSimulator:
     """
@@ -15,53 +74,337 @@ class CombinedSimulator:
                                                      sending and receiving data.
         environmental_simulator (EnvironmentalSimulator): An instance of EnvironmentalSimulator to simulate 
                                                          environmental factors like temperature and humidity.
+        rules (PerformanceRules): The ordered performance rules; replace them with set_rules or load_rules.
+        performance_table (PerformanceTable): The performance rules compiled into a lookup table over the
+                                              simulators' value lists.
+        rng (RandomStream): The simulator's own random stream; each sub-simulator draws from a child of it.
+        sink (OutputSink): Where evaluated readings are emitted; shared with the sub-simulators.
+        latest_performance (str): The performance level of the latest scheduled evaluation.
     """
     
-    def __init__(self):
+    def __init__(self, rng=None, sink=None):
         """
         Initializes the CombinedSimulator with instances of WiFiSimulator, EmbeddedSystemSimulator, and EnvironmentalSimulator.
+
+        Args:
+            rng: The random source: a seed, a random.Random, a numpy.random.Generator or a RandomStream.
+                 Defaults to fresh OS entropy.
+            sink (OutputSink, optional): Where evaluated readings are emitted. Defaults to the console.
+        """
+        self.rng = make_stream(rng)
+        self.sink = sink or ConsoleSink()
+        wifi_rng, embedded_rng, environmental_rng = self.rng.spawn(3)
+        self.wifi_simulator = WiFiSimulator(wifi_rng, self.sink)
+        self.embedded_simulator = EmbeddedSystemSimulator(embedded_rng, self.sink)
+        self.environmental_simulator = EnvironmentalSimulator(environmental_rng, self.sink)
+        self.rules = PerformanceRules.default_rules()
+        self.performance_table = PerformanceTable(self)
+        self.latest_performance = None
+
+    def set_rules(self, rules):
+        """
+        Replaces the performance rules. The performance table recompiles on its next use.
+
+        Args:
+            rules (PerformanceRules or dict): The rules, or a configuration accepted by PerformanceRules.from_dict.
+
+        Raises:
+            ValueError: If the rules are malformed or allow labels the sub-simulators cannot produce.
         """
-        self.wifi_simulator = WiFiSimulator()
-        self.embedded_simulator = EmbeddedSystemSimulator()
-        self.environmental_simulator = EnvironmentalSimulator()
+        if not isinstance(rules, PerformanceRules):
+            rules = PerformanceRules.from_dict(rules)
+        rules.check_labels(self.wifi_simulator.signals, self.wifi_simulator.movements,
+                           self.embedded_simulator.responses)
+        self.rules = rules
 
-    def evaluate_performance(self):
+    def load_rules(self, path):
+        """
+        Replaces the performance rules with those of a JSON, TOML or YAML rule file.
+
+        Args:
+            path (str): The rule file.
+
+        Raises:
+            ValueError: If the file or its rules are invalid.
+        """
+        self.set_rules(PerformanceRules.load(path))
+
+    def evaluate_performance(self, inputs=None):
         """
         Evaluates the WiFi performance based on combined environmental and embedded system factors.
 
         Simulates temperature, humidity, embedded system responses, WiFi signal strength, and movement, then
         evaluates the performance as 'Excellent', 'Ideal', 'Optimized', or 'Poor' based on predefined thresholds.
 
+        Args:
+            inputs (tuple, optional): A recorded (temperature, humidity, embedded response, signal, movement)
+                                      sample to evaluate instead of simulating one, e.g. during trace replay.
+
         Returns:
             str: The evaluated WiFi performance level ('Excellent', 'Ideal', 'Optimized', 'Poor').
         """
-        temperature = self.environmental_simulator.simulate_temperature()
-        humidity = self.environmental_simulator.simulate_humidity()
-        embedded_response = self.embedded_simulator.receive_data()
-        signal = self.wifi_simulator.simulate_signal()
-        movement = self.wifi_simulator.simulate_movement()
+        if inputs is not None:
+            temperature, humidity, embedded_response, signal, movement = inputs
+        else:
+            temperature = self.environmental_simulator.simulate_temperature()
+            humidity = self.environmental_simulator.simulate_humidity()
+            embedded_response = self.embedded_simulator.receive_data()
+            signal = self.wifi_simulator.simulate_signal()
+            movement = self.wifi_simulator.simulate_movement()
 
-        print(f"Temperature: {temperature}°C, Humidity: {humidity}%, Embedded Response: {embedded_response}, WiFi Signal: {signal}, Movement: {movement}")
+        self.sink.emit('combined_reading', {'temperature': temperature, 'humidity': humidity,
+                                            'embedded_response': embedded_response, 'signal': signal,
+                                            'movement': movement})
 
-        if signal == 'Strong' and 20 <= temperature <= 30 and 30 <= humidity <= 60 and embedded_response == 'Acknowledge' and movement == 'None':
-            return 'Excellent'
-        elif signal in ['Strong', 'Weak'] and 10 <= temperature <= 35 and 20 <= humidity <= 70 and embedded_response in ['Acknowledge', 'Timeout'] and movement in ['None', 'Walking']:
-            return 'Ideal'
-        elif signal in ['Strong', 'Weak'] and -10 <= temperature <= 40 and 0 <= humidity <= 100 and movement in ['None', 'Walking', 'Running']:
-            return 'Optimized'
-        else:
-            return 'Poor'
+        return self.classify_performance(temperature, humidity, embedded_response, signal, movement)
+
+    def classify_performance(self, temperature, humidity, embedded_response, signal, movement):
+        """
+        Classifies one combination of inputs into a WiFi performance level.
+
+        Args:
+            temperature (int): The temperature in degrees Celsius.
+            humidity (int): The humidity in percent.
+            embedded_response (str): The embedded system response.
+            signal (str): The WiFi signal strength.
+            movement (str): The detected movement.
+
+        Returns:
+            str: The WiFi performance level ('Excellent', 'Ideal', 'Optimized', 'Poor') of the first matching rule.
+        """
+        return self.rules.classify(temperature, humidity, embedded_response, signal, movement)
+
+    def evaluate_arrays(self, temperature, humidity, response, signal, movement):
+        """
+        Evaluates WiFi performance for whole arrays of inputs at once.
+
+        Looks the samples up in the compiled performance table, and falls back to evaluate_rules if any of them
+        lies outside its domain. Categorical inputs are codes that index into the sub-simulators' value lists,
+        as returned by their batch methods.
+
+        Args:
+            temperature (numpy.ndarray): Temperatures in degrees Celsius.
+            humidity (numpy.ndarray): Humidities in percent.
+            response (numpy.ndarray): Embedded response codes indexing embedded_simulator.responses.
+            signal (numpy.ndarray): Signal codes indexing wifi_simulator.signals.
+            movement (numpy.ndarray): Movement codes indexing wifi_simulator.movements.
+
+        Returns:
+            tuple: An array of label codes indexing PERFORMANCE_LABELS and a dict of counts per label.
+        """
+        try:
+            codes = self.performance_table.lookup_arrays(temperature, humidity, response, signal, movement)
+        except (ValueError, TypeError):
+            codes = self.evaluate_rules(temperature, humidity, response, signal, movement)
+        return codes, self.count_labels(codes)
+
+    def evaluate_rules(self, temperature, humidity, response, signal, movement):
+        """
+        Applies the same rules as classify_performance as boolean masks over arrays of inputs.
+
+        Inputs broadcast against each other. Categorical inputs are codes that index into the sub-simulators'
+        value lists.
+
+        Args:
+            temperature (numpy.ndarray): Temperatures in degrees Celsius.
+            humidity (numpy.ndarray): Humidities in percent.
+            response (numpy.ndarray): Embedded response codes indexing embedded_simulator.responses.
+            signal (numpy.ndarray): Signal codes indexing wifi_simulator.signals.
+            movement (numpy.ndarray): Movement codes indexing wifi_simulator.movements.
 
-    def run(self):
+        Returns:
+            numpy.ndarray: An array of label codes indexing PERFORMANCE_LABELS.
+        """
+        return self.rules.evaluate(temperature, humidity, response, signal, movement,
+                                   self.embedded_simulator.responses, self.wifi_simulator.signals,
+                                   self.wifi_simulator.movements)
+
+    def evaluate_performance_batch(self, n):
+        """
+        Simulates and evaluates n combined samples at once without printing them.
+
+        Args:
+            n (int): The number of samples.
+
+        Returns:
+            tuple: An array of label codes indexing PERFORMANCE_LABELS and a dict of counts per label.
+        """
+        temperature = self.environmental_simulator.simulate_temperature_batch(n)
+        humidity = self.environmental_simulator.simulate_humidity_batch(n)
+        response, _ = self.embedded_simulator.receive_data_batch(n)
+        signal, _ = self.wifi_simulator.simulate_signal_batch(n)
+        movement, _ = self.wifi_simulator.simulate_movement_batch(n)
+        return self.evaluate_arrays(temperature, humidity, response, signal, movement)
+
+    def performance_distribution(self):
+        """
+        Computes the exact probability of every performance level.
+
+        Enumerates the joint distribution of the WiFi, embedded system and environmental simulators, honoring
+        any weights configured on them, instead of sampling it. The enumeration covers the independent lookup-list
+        draws only, so temporal, propagation, fault and climate models are not supported.
+
+        Returns:
+            dict: A mapping from performance level to probability.
+
+        Raises:
+            ValueError: If a simulator has a model set that the enumeration cannot represent.
+        """
+        distribution = self.performance_table.label_probabilities(self._joint_probabilities(),
+                                                                  len(PERFORMANCE_LABELS))
+        return dict(zip(PERFORMANCE_LABELS, distribution.tolist()))
+
+    def sample_given(self, label, n, return_weights=False):
         """
-        Continuously evaluates and prints WiFi performance at regular intervals.
+        Draws input samples directly from the conditional distribution of one performance level.
+
+        Every drawn sample classifies as the requested level, without rejection sampling. The importance weight
+        of each sample is the likelihood ratio between the unconditional and the conditional distribution, which
+        is the probability of the level itself; weighting per-level results by it recovers unconditional estimates.
+        Like performance_distribution, it only supports the independent lookup-list draws.
+
+        Args:
+            label (str): The performance level to condition on.
+            n (int): The number of samples.
+            return_weights (bool): Whether to also return the importance weights.
+
+        Returns:
+            CombinedSampleBatch: The samples, or a tuple of the samples and their importance weights.
+
+        Raises:
+            ValueError: If the level is unknown or has probability zero, or a simulator has a model set that the
+                        enumeration cannot represent.
+        """
+        if label not in PERFORMANCE_LABELS:
+            raise ValueError(f"Unknown performance level: {label}")
+        code = PERFORMANCE_LABELS.index(label)
+        joint = self._joint_probabilities()
+        cells = self.performance_table.sample_cells(code, joint, n, self.rng)
+        signal, movement, response, temperature, humidity = cells
+        batch = CombinedSampleBatch(temperature, humidity, response, signal, movement,
+                                    self.embedded_simulator.responses, self.wifi_simulator.signals,
+                                    self.wifi_simulator.movements)
+        if not return_weights:
+            return batch
+        probability = self.performance_table.label_probabilities(joint, len(PERFORMANCE_LABELS))[code]
+        return batch, np.full(n, probability)
+
+    def _joint_probabilities(self):
+        """
+        Returns the probability of every cell of the performance table under the simulators' weights.
+        """
+        wifi = self.wifi_simulator
+        embedded = self.embedded_simulator
+        environment = self.environmental_simulator
+        models = {'signal_model': wifi.signal_model, 'movement_model': wifi.movement_model,
+                  'propagation': wifi.propagation, 'response_model': embedded.response_model,
+                  'fault_model': embedded.fault_model, 'temperature_model': environment.temperature_model,
+                  'humidity_model': environment.humidity_model, 'climate_model': environment.climate_model}
+        unsupported = [name for name, model in models.items() if model is not None]
+        if unsupported:
+            raise ValueError(f"The exact distribution only covers independent draws, but {', '.join(unsupported)} "
+                             "is set; sample with evaluate_performance_batch instead")
+        return self.performance_table.joint_probabilities(
+            probabilities(len(wifi.signals), wifi.signal_weights),
+            probabilities(len(wifi.movements), wifi.movement_weights),
+            probabilities(len(embedded.responses), embedded.response_weights),
+            probabilities(len(environment.temperatures), environment.temperature_weights),
+            probabilities(len(environment.humidities), environment.humidity_weights))
+
+    def spawn(self, n):
+        """
+        Creates copies of this simulator that draw from independent child streams of its random stream.
+
+        Use one copy per worker thread or process; each copy, and therefore each shard of a simulation, can be
+        reproduced from the parent's seed.
+
+        Args:
+            n (int): The number of copies.
+
+        Returns:
+            list: The CombinedSimulator copies.
+        """
+        children = []
+        for stream in self.rng.spawn(n):
+            child = copy.deepcopy(self, {id(self.sink): self.sink})
+            child.rng = stream
+            wifi_rng, embedded_rng, environmental_rng = stream.spawn(3)
+            child.wifi_simulator.rng = wifi_rng
+            child.embedded_simulator.rng = embedded_rng
+            child.environmental_simulator.rng = environmental_rng
+            children.append(child)
+        return children
+
+    @staticmethod
+    def count_labels(codes):
+        """
+        Counts how often each performance level occurs in an array of label codes.
+
+        Args:
+            codes (numpy.ndarray): Label codes indexing PERFORMANCE_LABELS.
+
+        Returns:
+            dict: A mapping from performance level to number of occurrences.
+        """
+        counts = np.bincount(np.ravel(codes), minlength=len(PERFORMANCE_LABELS))
+        return dict(zip(PERFORMANCE_LABELS, counts.tolist()))
+
+    def schedule(self, scheduler, interval=2, wifi_interval=2, embedded_interval=5, environment_interval=2,
+                 on_evaluation=None):
+        """
+        Registers the sub-simulators and periodic performance evaluations on a discrete-event scheduler.
+
+        Each sub-simulator runs at its own cadence. Evaluations are registered after the sub-simulators, so an
+        evaluation due at the same time as a component update sees the updated state, and every evaluation
+        classifies the latest state of each component.
+
+        Args:
+            scheduler (EventScheduler): The scheduler to register on.
+            interval (float or callable): The evaluation period in seconds, or a callable drawing each delay.
+            wifi_interval (float or callable): The WiFi sensing period.
+            embedded_interval (float or callable): The embedded send/receive period.
+            environment_interval (float or callable): The environmental sampling period.
+            on_evaluation (callable, optional): Called as on_evaluation(time, performance) after each evaluation.
+
+        Returns:
+            list: The handle of the evaluation event.
+        """
+        self.wifi_simulator.schedule(scheduler, wifi_interval)
+        self.embedded_simulator.schedule(scheduler, embedded_interval)
+        self.environmental_simulator.schedule(scheduler, environment_interval)
+
+        wifi = self.wifi_simulator
+        embedded = self.embedded_simulator
+        environment = self.environmental_simulator
+
+        def evaluate(scheduler):
+            self.latest_performance = self.classify_performance(
+                environment.latest_temperature, environment.latest_humidity, embedded.latest_response,
+                wifi.latest_signal, wifi.latest_movement)
+            if on_evaluation is not None:
+                on_evaluation(scheduler.now(), self.latest_performance)
+
+        if callable(interval):
+            return scheduler.schedule_stochastic(interval, evaluate)
+        return scheduler.schedule_periodic(interval, evaluate)
+
+    def run(self, clock=None, duration=None):
+        """
+        Continuously evaluates and emits WiFi performance at regular intervals.
         
-        Runs an infinite loop that calls the evaluate_performance method every 2 seconds and prints the performance level.
+        Runs an infinite loop that calls the evaluate_performance method every 2 seconds and emits the performance level.
+
+        Args:
+            clock (Clock, optional): The clock that paces the loop. Defaults to real time; pass a ScaledClock
+                                     or VirtualClock to run accelerated.
+            duration (float, optional): The simulated number of seconds to run for. Defaults to forever.
         """
-        while True:
+        clock = clock or RealTimeClock()
+        end = None if duration is None else clock.now() + duration
+        while end is None or clock.now() < end:
             performance = self.evaluate_performance()
-            print(f"WiFi Performance: {performance}")
-            time.sleep(2)
+            self.sink.emit('performance', {'performance': performance})
+            clock.sleep(2)
 
 if __name__ == "__main__":
     # Instantiate and run the CombinedSimulator
@@ -0,0 +1,179 @@
+"""
+CSI Generator
+
+Author: Louis H
+Date: 2026-10-18
+
+This module synthesizes WiFi channel state information (CSI): one complex channel gain per frame, receive
+antenna and OFDM subcarrier. The channel is a static multipath sum plus one dynamic path reflected off a
+person. The person's chest moves with the breathing pattern and their body moves with the movement state of the
+WiFiSimulator, which modulates the length of the dynamic path and therefore the amplitude and phase of every
+subcarrier. Complex Gaussian noise at the SNR of the signal state and a random common phase offset per frame,
+as left by carrier frequency offset, complete the frames.
+
+All work is vectorized over frames, antennas and subcarriers and written into preallocated complex64 buffers,
+and the generator keeps its body position and breathing phase between calls so consecutive calls form one
+continuous stream.
+
+Modules:
+    - numpy: Provides the vectorized channel model.
+    - scripts.sampling: Provides the generator's random stream.
+
+Classes:
+    - CSIGenerator: Generates CSI frames for one link driven by movement, breathing and signal states.
+"""
+
+import numpy as np
+from scripts.sampling import make_stream
+
+SPEED_OF_LIGHT = 299_792_458.0
+# Breaths per minute of each breathing pattern
+BREATHING_RATES_BPM = {'Normal': 15, 'Fast': 30, 'Slow': 8}
+# Body speed in m/s of each movement state
+MOVEMENT_SPEEDS = {'None': 0.0, 'Walking': 1.4, 'Running': 3.5, 'Falling': 2.5}
+# Signal-to-noise ratio in dB of each signal state
+SIGNAL_SNR_DB = {'Strong': 30.0, 'Weak': 10.0, 'No Signal': -10.0}
+CHEST_DISPLACEMENT = 0.005  # Peak chest displacement in metres while breathing
+HEADING_DRIFT = 0.05  # Standard deviation in radians of the per-frame change of walking direction
+PATH_LENGTH_RANGE = (2.0, 10.0)  # Shortest and longest path in metres of the reflection off a person in the room
+
+class CSIGenerator:
+    """
+    Generates CSI frames for one transmitter-receiver link.
+
+    Attributes:
+        n_antennas (int): The number of receive antennas.
+        n_subcarriers (int): The number of subcarriers.
+        sample_rate (float): The frames per second.
+        subcarrier_frequencies (numpy.ndarray): The absolute frequency of every subcarrier in Hz.
+        rng (RandomStream): The generator's own random stream.
+        frame (int): The number of frames generated so far.
+    """
+
+    def __init__(self, n_antennas=3, n_subcarriers=30, sample_rate=100, carrier_frequency=5.32e9, bandwidth=20e6,
+                 n_paths=6, rng=None):
+        """
+        Initializes the CSIGenerator with a random static multipath environment.
+
+        Args:
+            n_antennas (int): The number of receive antennas, spaced half a wavelength apart.
+            n_subcarriers (int): The number of subcarriers spread over the bandwidth.
+            sample_rate (float): The frames per second.
+            carrier_frequency (float): The centre frequency in Hz.
+            bandwidth (float): The bandwidth covered by the subcarriers in Hz.
+            n_paths (int): The number of static propagation paths.
+            rng: The random source: a seed, a random.Random, a numpy.random.Generator or a RandomStream.
+                 Defaults to fresh OS entropy.
+        """
+        self.n_antennas = n_antennas
+        self.n_subcarriers = n_subcarriers
+        self.sample_rate = sample_rate
+        self.rng = make_stream(rng)
+        self.frame = 0
+        generator = self.rng.generator
+        offsets = (np.arange(n_subcarriers) - (n_subcarriers - 1) / 2) * (bandwidth / n_subcarriers)
+        self.subcarrier_frequencies = carrier_frequency + offsets
+        antennas = np.arange(n_antennas)
+
+        # Static paths: a delay, an angle of arrival and a complex gain each, decaying with delay
+        delays = np.sort(generator.uniform(10e-9, 200e-9, n_paths))
+        angles = generator.uniform(-np.pi / 2, np.pi / 2, n_paths)
+        gains = np.exp(-delays / 50e-9) * np.exp(2j * np.pi * generator.random(n_paths))
+        steering = np.exp(-1j * np.pi * np.outer(antennas, np.sin(angles)))
+        frequency_response = np.exp(-2j * np.pi * np.outer(delays, offsets))
+        self._static = ((steering * gains) @ frequency_response).astype(np.complex64)
+
+        # The dynamic path off the person, weaker than the line of sight
+        self._dynamic_gain = 0.3 * np.abs(gains).max()
+        self._dynamic_steering = np.exp(-1j * np.pi * antennas * np.sin(generator.uniform(-np.pi / 2, np.pi / 2)))
+        self._wavenumbers = 2 * np.pi * self.subcarrier_frequencies / SPEED_OF_LIGHT
+        # Distance of the reflection's path length from its shortest, unfolded over a round trip of the room
+        self._walk = generator.uniform(3.0, 8.0) - PATH_LENGTH_RANGE[0]
+        self._heading = generator.uniform(0, 2 * np.pi)
+        self._breathing_phase = 0.0
+        self._power = float(np.mean(np.abs(self._static) ** 2))
+        self._noise = np.empty(0, dtype=np.float32)
+
+    def generate(self, n_frames, movement='None', breathing='Normal', signal='Strong', out=None):
+        """
+        Generates frames with constant movement, breathing and signal states.
+
+        Args:
+            n_frames (int): The number of frames.
+            movement (str): The movement state, a key of MOVEMENT_SPEEDS.
+            breathing (str): The breathing pattern, a key of BREATHING_RATES_BPM.
+            signal (str): The signal state, a key of SIGNAL_SNR_DB.
+            out (numpy.ndarray, optional): A complex64 buffer of shape (n_frames, antennas, subcarriers) to fill.
+
+        Returns:
+            numpy.ndarray: The CSI frames, of shape (n_frames, antennas, subcarriers).
+        """
+        return self._synthesize(np.full(n_frames, MOVEMENT_SPEEDS[movement]),
+                                np.full(n_frames, BREATHING_RATES_BPM[breathing] / 60),
+                                np.full(n_frames, SIGNAL_SNR_DB[signal]), out)
+
+    def generate_batch(self, batch, frames_per_sample=None, out=None):
+        """
+        Generates frames driven by a batch of WiFiSimulator samples, each sample holding for a segment of frames.
+
+        Args:
+            batch (WiFiSampleBatch): The signal, movement and breathing states, e.g. from simulate_batch.
+            frames_per_sample (int, optional): The frames per sample. Defaults to one 2 s simulator interval.
+            out (numpy.ndarray, optional): A complex64 buffer of shape (len(batch) * frames_per_sample, antennas,
+                                           subcarriers) to fill.
+
+        Returns:
+            numpy.ndarray: The CSI frames.
+        """
+        if frames_per_sample is None:
+            frames_per_sample = int(round(2 * self.sample_rate))
+        speeds = np.array([MOVEMENT_SPEEDS[label] for label in batch.movement_labels])[batch.movement]
+        rates = np.array([BREATHING_RATES_BPM[label] / 60 for label in batch.breathing_labels])[batch.breathing]
+        snrs = np.array([SIGNAL_SNR_DB[label] for label in batch.signal_labels])[batch.signal]
+        return self._synthesize(np.repeat(speeds, frames_per_sample), np.repeat(rates, frames_per_sample),
+                                np.repeat(snrs, frames_per_sample), out)
+
+    def _synthesize(self, speeds, breathing_rates, snrs_db, out):
+        n = len(speeds)
+        shape = (n, self.n_antennas, self.n_subcarriers)
+        if out is None:
+            out = np.empty(shape, dtype=np.complex64)
+        elif out.shape != shape or out.dtype != np.complex64:
+            raise ValueError(f"out must be a complex64 array of shape {shape}")
+        generator = self.rng.generator
+        dt = 1.0 / self.sample_rate
+
+        # Path length of the reflection: the body walks along the link's radial line at its full speed, away while
+        # its drifting heading faces away and back once it turns around, plus the chest's breathing motion. The
+        # walk is kept modulo a round trip of the room and folded, so the body turns back at the walls.
+        headings = self._heading + np.cumsum(generator.normal(0.0, HEADING_DRIFT, n))
+        low, high = PATH_LENGTH_RANGE
+        walks = np.mod(self._walk + np.cumsum(speeds * np.sign(np.cos(headings)) * dt), 2 * (high - low))
+        positions = high - np.abs(walks - (high - low))
+        breathing_phases = self._breathing_phase + np.cumsum(2 * np.pi * breathing_rates * dt)
+        lengths = positions + CHEST_DISPLACEMENT * np.sin(breathing_phases)
+        if n:
+            self._heading = float(headings[-1]) % (2 * np.pi)
+            self._walk = float(walks[-1])
+            self._breathing_phase = float(breathing_phases[-1]) % (2 * np.pi)
+
+        # Static paths, plus the dynamic path whose phase turns with its length on every subcarrier
+        dynamic = np.exp(-1j * np.outer(lengths, self._wavenumbers)).astype(np.complex64)
+        dynamic *= np.complex64(self._dynamic_gain)
+        np.multiply(dynamic[:, None, :], self._dynamic_steering.astype(np.complex64)[None, :, None], out=out)
+        out += self._static
+
+        # Noise at each frame's SNR, then a common phase offset per frame
+        noise = self._noise_buffer(out.size * 2)
+        generator.standard_normal(dtype=np.float32, out=noise)
+        scale = np.sqrt(self._power / 2 * 10 ** (-snrs_db / 10)).astype(np.float32)
+        out += noise.view(np.complex64).reshape(shape) * scale[:, None, None]
+        out *= np.exp(1j * generator.uniform(0, 2 * np.pi, n)).astype(np.complex64)[:, None, None]
+        self.frame += n
+        return out
+
+    def _noise_buffer(self, size):
+        # Reuse one scratch buffer across calls, growing it only when a call needs more frames
+        if self._noise.size < size:
+            self._noise = np.empty(size, dtype=np.float32)
+        return self._noise[:size]
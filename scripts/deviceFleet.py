@@ -0,0 +1,165 @@
+"""
+Device Fleet
+
+Author: Louis H
+Date: 2026-10-18
+
+This module runs a fleet of simulated devices concurrently on one asyncio event loop, e.g. to load-test an
+ingestion tier from a single process. Every device is a WiFiSimulator, EmbeddedSystemSimulator or
+EnvironmentalSimulator running its async loop with jittered intervals and a random start offset, so the fleet
+does not fire in lockstep. Readings go into bounded queues, each drained by a task calling one shared consumer.
+When the consumer falls behind, full queues make the devices wait, which applies backpressure instead of
+letting memory grow.
+
+Modules:
+    - asyncio: Provides the event loop, tasks and bounded queues.
+    - inspect: Detects asynchronous consumers.
+    - scripts.clock: Provides the clocks that pace the devices.
+    - scripts.embeddedSystem, scripts.environmentalSimulation, scripts.wifiSimulation: Provide the devices.
+    - scripts.outputSinks: Provides the sink that silences the devices' own output.
+    - scripts.sampling: Provides the random streams of the devices.
+
+Classes:
+    - DeviceFleet: Runs thousands of simulated devices on one event loop.
+"""
+
+import asyncio
+import inspect
+from scripts.clock import RealTimeClock
+from scripts.embeddedSystem import EmbeddedSystemSimulator
+from scripts.environmentalSimulation import EnvironmentalSimulator
+from scripts.outputSinks import NullSink
+from scripts.sampling import make_stream
+from scripts.wifiSimulation import WiFiSimulator
+
+# Simulator class of every device kind, with the period of its loop over which device start times are spread
+DEVICE_KINDS = {
+    'wifi': (WiFiSimulator, 2),
+    'embedded': (EmbeddedSystemSimulator, 10),
+    'environmental': (EnvironmentalSimulator, 2),
+}
+
+class DeviceFleet:
+    """
+    Runs thousands of simulated devices concurrently on one event loop.
+
+    Runs must be paced by a RealTimeClock or a ScaledClock: all devices share the clock, and a VirtualClock
+    cannot interleave concurrent sleeps.
+
+    Attributes:
+        devices (list): (kind, simulator) pairs; a device's id is its index in this list.
+        jitter (float): The largest relative deviation of each device interval from its nominal cadence.
+        queue_size (int): The capacity of each queue.
+        partitions (int): The number of queues, each drained by its own consumer task.
+        rng (RandomStream): The fleet's random stream; each device draws from a child of it.
+        produced (int): The number of readings produced by the latest run.
+        consumed (int): The number of readings passed to the consumer by the latest run.
+        errors (int): The number of readings the consumer raised an exception for in the latest run.
+        max_queue_depth (int): The largest queue length seen during the latest run.
+        blocked (int): The number of readings whose device found its queue full and waited in the latest run.
+    """
+
+    def __init__(self, wifi=0, embedded=0, environmental=0, rng=None, jitter=0.1, queue_size=1024, partitions=1):
+        """
+        Initializes the DeviceFleet and creates its devices.
+
+        Args:
+            wifi (int): The number of WiFi devices.
+            embedded (int): The number of embedded system devices.
+            environmental (int): The number of environmental sensors.
+            rng: The random source: a seed, a random.Random, a numpy.random.Generator or a RandomStream.
+                 Defaults to fresh OS entropy.
+            jitter (float): The largest relative deviation of each device interval, e.g. 0.1 for +/-10%.
+            queue_size (int): The capacity of each queue.
+            partitions (int): The number of queues; devices are assigned to them round-robin.
+        """
+        if partitions < 1:
+            raise ValueError("partitions must be at least 1")
+        self.rng = make_stream(rng)
+        self.jitter = jitter
+        self.queue_size = queue_size
+        self.partitions = partitions
+        counts = {'wifi': wifi, 'embedded': embedded, 'environmental': environmental}
+        streams = iter(self.rng.spawn(sum(counts.values())))
+        self.devices = [(kind, DEVICE_KINDS[kind][0](next(streams), NullSink()))
+                        for kind, count in counts.items() for _ in range(count)]
+        self.produced = 0
+        self.consumed = 0
+        self.errors = 0
+        self.max_queue_depth = 0
+        self.blocked = 0
+
+    async def arun(self, consumer, duration, clock=None):
+        """
+        Runs every device on the running event loop for a simulated duration, then waits until every queued
+        reading has been consumed.
+
+        Args:
+            consumer (callable): Called as consumer(device_id, event, fields) for every reading; may be a
+                                 coroutine function. Exceptions it raises are counted, not propagated.
+            duration (float): The simulated number of seconds each device runs for.
+            clock (Clock, optional): The clock shared by all devices. Defaults to real time.
+
+        Returns:
+            dict: The number of devices, produced and consumed readings, consumer errors, the largest queue
+                  depth and the number of readings that waited on a full queue.
+        """
+        clock = clock or RealTimeClock()
+        self.produced = self.consumed = self.errors = self.max_queue_depth = self.blocked = 0
+        queues = [asyncio.Queue(self.queue_size) for _ in range(self.partitions)]
+        end = clock.now() + duration
+        consumers = [asyncio.create_task(self._consume(queue, consumer)) for queue in queues]
+        try:
+            await asyncio.gather(*(self._device(device_id, kind, simulator, queues[device_id % self.partitions],
+                                                clock, end)
+                                   for device_id, (kind, simulator) in enumerate(self.devices)))
+            for queue in queues:
+                await queue.join()
+        finally:
+            for task in consumers:
+                task.cancel()
+            await asyncio.gather(*consumers, return_exceptions=True)
+        return {'devices': len(self.devices), 'produced': self.produced, 'consumed': self.consumed,
+                'errors': self.errors, 'max_queue_depth': self.max_queue_depth, 'blocked': self.blocked}
+
+    def run(self, consumer, duration, clock=None):
+        """
+        Runs the fleet on a new event loop; see arun.
+
+        Args:
+            consumer (callable): Called as consumer(device_id, event, fields) for every reading.
+            duration (float): The simulated number of seconds each device runs for.
+            clock (Clock, optional): The clock shared by all devices. Defaults to real time.
+
+        Returns:
+            dict: The run statistics returned by arun.
+        """
+        return asyncio.run(self.arun(consumer, duration, clock))
+
+    async def _device(self, device_id, kind, simulator, queue, clock, end):
+        async def emit(event, fields):
+            if queue.full():
+                self.blocked += 1
+            await queue.put((device_id, event, fields))
+            self.produced += 1
+            self.max_queue_depth = max(self.max_queue_depth, queue.qsize())
+
+        # Spread the first readings over one period so the fleet does not start in lockstep
+        await clock.asleep(simulator.rng.random.uniform(0, DEVICE_KINDS[kind][1]))
+        remaining = end - clock.now()
+        if remaining > 0:
+            await simulator.arun(clock, remaining, emit, self.jitter)
+
+    async def _consume(self, queue, consumer):
+        is_async = inspect.iscoroutinefunction(consumer)
+        while True:
+            device_id, event, fields = await queue.get()
+            try:
+                result = consumer(device_id, event, fields)
+                if is_async:
+                    await result
+                self.consumed += 1
+            except Exception:
+                self.errors += 1
+            finally:
+                queue.task_done()
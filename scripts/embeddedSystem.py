@@ -6,34 +6,76 @@ Date: 2024-08-04
 
 This module simulates an embedded system that sends and receives data. The simulator continuously sends data and
 receives responses, mimicking the behavior of a real embedded system.
+Responses are drawn independently unless a MarkovChain from scripts.stateModels is set as the response model,
+e.g. to make errors come in bursts, or a GilbertElliott channel from scripts.faultModel is set as the fault
+model of the device's own link.
+Besides the readable events, the simulator can produce its traffic as framed binary messages with sequence
+numbers and CRCs, as real devices send them, one frame at a time or as whole batches for gateway benchmarks,
+and can exchange its frames with a gateway over a Channel from scripts.transport.
 
 Usage:
     Run this script directly to start the simulation.
 
 Modules:
-    - random: Provides functions for generating random data.
-    - time: Provides time-related functions, used here for delays between send/receive actions.
+    - copy: Provides deep copies used when spawning simulators.
+    - numpy: Provides the sequence numbers of frame batches.
+    - scripts.clock: Provides the clocks that pace the run loop.
+    - scripts.frameCodec: Encodes the binary frames.
+    - scripts.outputSinks: Provides the sinks that simulated readings are emitted to.
+    - scripts.sampling: Provides the NumPy helpers used by the batch sampling methods.
 
 Classes:
     - EmbeddedSystemSimulator: A class that simulates sending and receiving data in an embedded system.
 """
 
-import random
-import time
+import copy
+import numpy as np
+from scripts.clock import RealTimeClock
+from scripts.frameCodec import FRAME_DATA, FRAME_RESPONSE, encode_batch, encode_frame
+from scripts.outputSinks import ConsoleSink
+from scripts.sampling import choose, code_dtype, draw_codes, jittered, make_stream
 
 class EmbeddedSystemSimulator:
     """
     A simulator for an embedded system that sends and receives data.
 
     Attributes:
+        data_values (list): A list of possible data values sent by the embedded system.
         responses (list): A list of possible responses from the embedded system.
+        response_weights (list): Relative weights of the responses, or None for uniform.
+        response_model (MarkovChain): The temporal model of the response codes, or None to draw every response
+                                      independently.
+        fault_model (GilbertElliott): The bursty fault model of the device's link, or None. Takes precedence over
+                                      the response model for the device's own responses.
+        rng (RandomStream): The simulator's own random stream.
+        sink (OutputSink): Where simulated readings are emitted.
+        latest_data (str): The data sent by the latest scheduled send event.
+        latest_response (str): The response received by the latest scheduled receive event.
+        sequence (int): The sequence number of the next binary frame.
     """
 
-    def __init__(self):
+    def __init__(self, rng=None, sink=None):
         """
         Initializes the EmbeddedSystemSimulator with predefined responses.
+
+        Args:
+            rng: The random source: a seed, a random.Random, a numpy.random.Generator or a RandomStream.
+                 Defaults to fresh OS entropy.
+            sink (OutputSink, optional): Where simulated readings are emitted. Defaults to the console.
         """
+        self.data_values = ['Data1', 'Data2', 'Data3']
         self.responses = ['Acknowledge', 'Error', 'Timeout']
+        self.response_weights = None
+        self.response_model = None
+        self.fault_model = None
+        self.rng = make_stream(rng)
+        self.sink = sink or ConsoleSink()
+        self.latest_data = None
+        self.latest_response = None
+        self._sending = True
+        self._response_state = None
+        self._fault_phase = None
+        self.sequence = 0
 
     def send_data(self):
         """
@@ -42,8 +84,8 @@ class EmbeddedSystemSimulator:
         Returns:
             str: The data sent.
         """
-        data = random.choice(['Data1', 'Data2', 'Data3'])
-        print(f"Sending data: {data}")
+        data = self._draw_data()
+        self.sink.emit('send', {'data': data})
         return data
 
     def receive_data(self):
@@ -53,19 +95,221 @@ class EmbeddedSystemSimulator:
         Returns:
             str: The response received.
         """
-        response = random.choice(self.responses)
-        print(f"Received response: {response}")
+        response = self._draw_response()
+        self.sink.emit('receive', {'response': response})
         return response
 
-    def run(self):
+    def receive_data_batch(self, n, previous=None):
+        """
+        Simulates receiving n responses at once without printing them.
+
+        Args:
+            n (int): The number of responses.
+            previous (numpy.ndarray, optional): The previous codes of n independent chains to advance by one step
+                                                when a response model is set. Ignored otherwise.
+
+        Returns:
+            tuple: A code array and the label table the codes index into.
+        """
+        labels = tuple(self.responses)
+        if self.response_model is None:
+            return draw_codes(n, len(labels), self.response_weights, self.rng), labels
+        return self.response_model.advance_batch(n, previous, self.rng), labels
+
+    def receive_data_sequence(self, n):
+        """
+        Simulates receiving the next n responses of this device at once without printing them, following the
+        fault model's phases from the latest response when one is set.
+
+        Args:
+            n (int): The number of responses.
+
+        Returns:
+            tuple: A code array and the label table the codes index into.
+        """
+        labels = tuple(self.responses)
+        if self.fault_model is None:
+            if self.response_model is None:
+                return draw_codes(n, len(labels), self.response_weights, self.rng), labels
+            # A chain's responses depend on each other, so they are stepped one at a time
+            codes = [self.responses.index(self._draw_response()) for _ in range(n)]
+            return np.array(codes, dtype=code_dtype(len(labels))), labels
+        codes, self._fault_phase = self.fault_model.outcomes(n, self._fault_phase, self.rng)
+        return codes, labels
+
+    def send_frame(self):
+        """
+        Simulates sending data as a binary data frame whose code indexes data_values and whose payload is the
+        data.
+
+        Returns:
+            bytes: The frame.
+        """
+        data = self.send_data()
+        return encode_frame(FRAME_DATA, self.data_values.index(data), self._next_sequences(1), data.encode())
+
+    def receive_frame(self):
+        """
+        Simulates receiving a response as a binary response frame whose code indexes responses.
+
+        Returns:
+            bytes: The frame.
+        """
+        response = self.receive_data()
+        return encode_frame(FRAME_RESPONSE, self.responses.index(response), self._next_sequences(1))
+
+    def send_frames_batch(self, n, out=None):
+        """
+        Simulates sending n data frames at once without printing them.
+
+        Args:
+            n (int): The number of frames.
+            out (bytearray, optional): A buffer with room for the frames to encode into.
+
+        Returns:
+            memoryview: The frames back to back.
+        """
+        codes = draw_codes(n, len(self.data_values), rng=self.rng)
+        payloads = [value.encode() for value in self.data_values]
+        sequences = self._next_sequences(n) + np.arange(n, dtype=np.int64)
+        return encode_batch(FRAME_DATA, codes, sequences, [payloads[code] for code in codes.tolist()], out)
+
+    def receive_frames_batch(self, n, out=None):
+        """
+        Simulates receiving n response frames at once without printing them.
+
+        Args:
+            n (int): The number of frames.
+            out (bytearray, optional): A buffer with room for the frames to encode into.
+
+        Returns:
+            memoryview: The frames back to back.
+        """
+        codes, _ = self.receive_data_batch(n)
+        sequences = self._next_sequences(n) + np.arange(n, dtype=np.int64)
+        return encode_batch(FRAME_RESPONSE, codes, sequences, out=out)
+
+    async def aexchange(self, channel):
+        """
+        Sends a data frame over a channel and waits for the gateway's response frame.
+
+        Args:
+            channel (Channel): The channel to the gateway.
+
+        Returns:
+            str: The response received.
+        """
+        sequence = self.sequence
+        code = await channel.request(self.send_frame(), sequence)
+        self.latest_response = self.responses[code]
+        self.sink.emit('receive', {'response': self.latest_response})
+        return self.latest_response
+
+    def spawn(self, n):
+        """
+        Creates copies of this simulator that draw from independent child streams of its random stream.
+
+        Args:
+            n (int): The number of copies.
+
+        Returns:
+            list: The EmbeddedSystemSimulator copies.
+        """
+        children = []
+        for stream in self.rng.spawn(n):
+            child = copy.deepcopy(self, {id(self.sink): self.sink})
+            child.rng = stream
+            children.append(child)
+        return children
+
+    def schedule(self, scheduler, interval=5):
+        """
+        Registers alternating send and receive events on a discrete-event scheduler, as in the run loop.
+
+        A response is drawn immediately so that latest_response is available from the start, and the first send
+        happens immediately. Events update the latest_* attributes without printing.
+
+        Args:
+            scheduler (EventScheduler): The scheduler to register on.
+            interval (float or callable): The period in seconds, or a callable drawing each delay for
+                                          stochastic events.
+
+        Returns:
+            list: The event handle.
+        """
+        self.latest_response = self._draw_response()
+        self._sending = True
+        if callable(interval):
+            self._exchange(scheduler)
+            return scheduler.schedule_stochastic(interval, self._exchange)
+        return scheduler.schedule_periodic(interval, self._exchange)
+
+    def _exchange(self, scheduler):
+        if self._sending:
+            self.latest_data = self._draw_data()
+        else:
+            self.latest_response = self._draw_response()
+        self._sending = not self._sending
+
+    def run(self, clock=None, duration=None):
         """
         Continuously sends and receives data with a delay between each action.
+
+        Args:
+            clock (Clock, optional): The clock that paces the loop. Defaults to real time; pass a ScaledClock
+                                     or VirtualClock to run accelerated.
+            duration (float, optional): The simulated number of seconds to run for. Defaults to forever.
         """
-        while True:
+        clock = clock or RealTimeClock()
+        end = None if duration is None else clock.now() + duration
+        while end is None or clock.now() < end:
             self.send_data()
-            time.sleep(5)
+            clock.sleep(5)
             self.receive_data()
-            time.sleep(5)
+            clock.sleep(5)
+
+    async def arun(self, clock=None, duration=None, emit=None, jitter=0.0):
+        """
+        Asynchronous counterpart of run that sleeps without blocking the event loop, so that thousands of
+        simulators can run concurrently in one thread.
+
+        Args:
+            clock (Clock, optional): The clock that paces the loop. Defaults to real time; pass a ScaledClock
+                                     to run accelerated.
+            duration (float, optional): The simulated number of seconds to run for. Defaults to forever.
+            emit (callable, optional): An async callable awaited as emit(event, fields) for every reading, e.g. to
+                                       put it on a bounded queue. Defaults to emitting to the sink.
+            jitter (float): The largest relative deviation of each sleep from its nominal interval, e.g. 0.1.
+        """
+        clock = clock or RealTimeClock()
+        emit = emit or self._emit
+        end = None if duration is None else clock.now() + duration
+        while end is None or clock.now() < end:
+            await emit('send', {'data': self._draw_data()})
+            await clock.asleep(jittered(5, jitter, self.rng))
+            await emit('receive', {'response': self._draw_response()})
+            await clock.asleep(jittered(5, jitter, self.rng))
+
+    async def _emit(self, event, fields):
+        self.sink.emit(event, fields)
+
+    def _draw_data(self):
+        return choose(self.data_values, rng=self.rng)
+
+    def _next_sequences(self, n):
+        # Reserves n consecutive sequence numbers, wrapping at 2**32, and returns the first
+        first = self.sequence
+        self.sequence = (first + n) & 0xFFFFFFFF
+        return first
+
+    def _draw_response(self):
+        if self.fault_model is not None:
+            self._fault_phase, code = self.fault_model.advance(self._fault_phase, self.rng)
+            return self.responses[code]
+        if self.response_model is None:
+            return choose(self.responses, self.response_weights, self.rng)
+        self._response_state = self.response_model.advance(self._response_state, self.rng)
+        return self.responses[self._response_state]
 
 if __name__ == "__main__":
     # Instantiate and run the embedded system simulator
@@ -5,18 +5,27 @@ Author: Louis H
 Date: 2024-08-04
 
 This module simulates environmental data such as temperature and humidity.
-The simulator generates random values for these parameters and prints them to the console.
+The simulator generates random values for these parameters and emits them to an output sink, the console by default.
+Readings are drawn independently unless a BoundedRandomWalk from scripts.stateModels is set for them, which
+moves each reading by a small step from the previous one. When a ClimateModel from scripts.climateModel is set,
+readings are instead continuous values following its diurnal and seasonal cycles at the simulated time.
 
 Modules:
-    - random: Provides functions for generating random data.
-    - time: Provides time-related functions, used here for delays between simulations.
+    - copy: Provides deep copies used when spawning simulators.
+    - numpy: Provides the site index of every climate model sample.
+    - scripts.clock: Provides the clocks that pace the run loop.
+    - scripts.outputSinks: Provides the sinks that simulated readings are emitted to.
+    - scripts.sampling: Provides the NumPy helpers used by the batch sampling methods.
 
 Classes:
     - EnvironmentalSimulator: A class that simulates temperature and humidity.
 """
 
-import random
-import time
+import copy
+import numpy as np
+from scripts.clock import RealTimeClock
+from scripts.outputSinks import ConsoleSink
+from scripts.sampling import choose, draw_codes, jittered, make_stream, value_table
 
 class EnvironmentalSimulator:
     """
@@ -25,42 +34,219 @@ class EnvironmentalSimulator:
     Attributes:
         temperatures (list): A list of possible temperature values.
         humidities (list): A list of possible humidity values.
+        temperature_weights (list): Relative weights of the temperature values, or None for uniform.
+        humidity_weights (list): Relative weights of the humidity values, or None for uniform.
+        temperature_model (BoundedRandomWalk): The temporal model of the temperature, or None to draw every
+                                               temperature independently.
+        humidity_model (BoundedRandomWalk): The temporal model of the humidity, or None for independent draws.
+        climate_model (ClimateModel): The continuous model of both readings, or None. Takes precedence over the
+                                      value lists, weights and temporal models.
+        site (int): The site of the climate model the simulator reads.
+        climate_time (float): The simulated time in seconds at which the climate model is read; the run loops
+                              and scheduled events set it from their clock, which reads Unix time when it
+                              runs in real time.
+        rng (RandomStream): The simulator's own random stream.
+        sink (OutputSink): Where simulated readings are emitted.
+        latest_temperature (int): The temperature drawn by the latest scheduled event.
+        latest_humidity (int): The humidity drawn by the latest scheduled event.
     """
 
-    def __init__(self):
+    def __init__(self, rng=None, sink=None):
         """
         Initializes the EnvironmentalSimulator with predefined temperatures and humidities.
+
+        Args:
+            rng: The random source: a seed, a random.Random, a numpy.random.Generator or a RandomStream.
+                 Defaults to fresh OS entropy.
+            sink (OutputSink, optional): Where simulated readings are emitted. Defaults to the console.
         """
         self.temperatures = list(range(-10, 41))  # Temperatures from -10 to 40 degrees Celsius
         self.humidities = list(range(0, 101))  # Humidities from 0% to 100%
+        self.temperature_weights = None
+        self.humidity_weights = None
+        self.temperature_model = None
+        self.humidity_model = None
+        self.climate_model = None
+        self.site = 0
+        self.climate_time = 0.0
+        self.rng = make_stream(rng)
+        self.sink = sink or ConsoleSink()
+        self.latest_temperature = None
+        self.latest_humidity = None
+        self._states = {}
+        self._climate_reading = None
 
     def simulate_temperature(self):
         """
         Simulates temperature.
 
         Returns:
-            int: The simulated temperature.
+            int: The simulated temperature, or a float when a climate model is set.
         """
-        return random.choice(self.temperatures)
+        if self.climate_model is not None:
+            return float(self._climate(0, None, None)[0])
+        if self.temperature_model is None:
+            return choose(self.temperatures, self.temperature_weights, self.rng)
+        return self._advance('temperature', self.temperature_model)
 
     def simulate_humidity(self):
         """
         Simulates humidity.
 
         Returns:
-            int: The simulated humidity.
+            int: The simulated humidity, or a float when a climate model is set.
+        """
+        if self.climate_model is not None:
+            return float(self._climate(1, None, None)[0])
+        if self.humidity_model is None:
+            return choose(self.humidities, self.humidity_weights, self.rng)
+        return self._advance('humidity', self.humidity_model)
+
+    def simulate_temperature_batch(self, n, previous=None, time=None):
+        """
+        Simulates n temperatures at once.
+
+        Args:
+            n (int): The number of samples.
+            previous (numpy.ndarray, optional): The previous temperatures of n independent walks to move by one
+                                                step when a temperature model is set. Ignored otherwise.
+            time (float, optional): The simulated time of the samples when a climate model is set, sample i
+                                    reading site i modulo the number of sites. Defaults to climate_time.
+
+        Returns:
+            numpy.ndarray: The simulated temperatures, float32 when a climate model is set.
+        """
+        if self.climate_model is not None:
+            return self._climate(0, n, time)
+        if self.temperature_model is not None:
+            return self.temperature_model.advance_batch(n, previous, self.rng)
+        codes = draw_codes(n, len(self.temperatures), self.temperature_weights, self.rng)
+        return value_table(self.temperatures)[codes]
+
+    def simulate_humidity_batch(self, n, previous=None, time=None):
+        """
+        Simulates n humidities at once.
+
+        Args:
+            n (int): The number of samples.
+            previous (numpy.ndarray, optional): The previous humidities of n independent walks to move by one
+                                                step when a humidity model is set. Ignored otherwise.
+            time (float, optional): The simulated time of the samples when a climate model is set, sample i
+                                    reading site i modulo the number of sites. Defaults to climate_time.
+
+        Returns:
+            numpy.ndarray: The simulated humidities, float32 when a climate model is set.
         """
-        return random.choice(self.humidities)
+        if self.climate_model is not None:
+            return self._climate(1, n, time)
+        if self.humidity_model is not None:
+            return self.humidity_model.advance_batch(n, previous, self.rng)
+        codes = draw_codes(n, len(self.humidities), self.humidity_weights, self.rng)
+        return value_table(self.humidities)[codes]
 
-    def run(self):
+    def spawn(self, n):
+        """
+        Creates copies of this simulator that draw from independent child streams of its random stream.
+
+        Args:
+            n (int): The number of copies.
+
+        Returns:
+            list: The EnvironmentalSimulator copies.
+        """
+        children = []
+        for stream in self.rng.spawn(n):
+            child = copy.deepcopy(self, {id(self.sink): self.sink})
+            child.rng = stream
+            child._climate_reading = None
+            children.append(child)
+        return children
+
+    def schedule(self, scheduler, interval=2):
+        """
+        Registers environmental sampling events on a discrete-event scheduler.
+
+        The first sample is drawn immediately. Each event draws a new temperature and humidity into the latest_*
+        attributes without printing.
+
+        Args:
+            scheduler (EventScheduler): The scheduler to register on.
+            interval (float or callable): The period in seconds, or a callable drawing each delay for
+                                          stochastic events.
+
+        Returns:
+            list: The event handle.
+        """
+        self._sample(scheduler)
+        if callable(interval):
+            return scheduler.schedule_stochastic(interval, self._sample)
+        return scheduler.schedule_periodic(interval, self._sample, start=scheduler.now() + interval)
+
+    def _advance(self, field, model):
+        # Steps the field's walk from its previous value, or draws a first value
+        self._states[field] = model.advance(self._states.get(field), self.rng)
+        return self._states[field]
+
+    def _climate(self, quantity, n, time):
+        # Temperature and humidity come from one evaluation of the model: the first of them read at a time
+        # evaluates both, the other is served from it, and reading either again draws a new evaluation.
+        # n is None for the simulator's own site.
+        time = self.climate_time if time is None else time
+        key = (self.climate_model, time, n, self.site)
+        reading = self._climate_reading
+        if reading is None or reading[0] != key or quantity in reading[2]:
+            sites = [self.site] if n is None else np.arange(n) % self.climate_model.sites
+            reading = self._climate_reading = (key, self.climate_model.sample(time, sites), set())
+        reading[2].add(quantity)
+        return reading[1][quantity]
+
+    def _sample(self, scheduler):
+        self.climate_time = scheduler.now()
+        self.latest_temperature = self.simulate_temperature()
+        self.latest_humidity = self.simulate_humidity()
+
+    def run(self, clock=None, duration=None):
         """
         Continuously simulates temperature and humidity with a delay between each simulation.
+
+        Args:
+            clock (Clock, optional): The clock that paces the loop. Defaults to real time; pass a ScaledClock
+                                     or VirtualClock to run accelerated.
+            duration (float, optional): The simulated number of seconds to run for. Defaults to forever.
         """
-        while True:
+        clock = clock or RealTimeClock()
+        end = None if duration is None else clock.now() + duration
+        while end is None or clock.now() < end:
+            self.climate_time = clock.now()
             temperature = self.simulate_temperature()
             humidity = self.simulate_humidity()
-            print(f"Simulated temperature: {temperature}°C, Humidity: {humidity}%")
-            time.sleep(2)
+            self.sink.emit('environment_reading', {'temperature': temperature, 'humidity': humidity})
+            clock.sleep(2)
+
+    async def arun(self, clock=None, duration=None, emit=None, jitter=0.0):
+        """
+        Asynchronous counterpart of run that sleeps without blocking the event loop, so that thousands of
+        simulators can run concurrently in one thread.
+
+        Args:
+            clock (Clock, optional): The clock that paces the loop. Defaults to real time; pass a ScaledClock
+                                     to run accelerated.
+            duration (float, optional): The simulated number of seconds to run for. Defaults to forever.
+            emit (callable, optional): An async callable awaited as emit(event, fields) for every reading, e.g. to
+                                       put it on a bounded queue. Defaults to emitting to the sink.
+            jitter (float): The largest relative deviation of each sleep from its nominal interval, e.g. 0.1.
+        """
+        clock = clock or RealTimeClock()
+        emit = emit or self._emit
+        end = None if duration is None else clock.now() + duration
+        while end is None or clock.now() < end:
+            self.climate_time = clock.now()
+            fields = {'temperature': self.simulate_temperature(), 'humidity': self.simulate_humidity()}
+            await emit('environment_reading', fields)
+            await clock.asleep(jittered(2, jitter, self.rng))
+
+    async def _emit(self, event, fields):
+        self.sink.emit(event, fields)
 
 if __name__ == "__main__":
     # Instantiate and run the environmental simulator
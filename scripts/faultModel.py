@@ -0,0 +1,368 @@
+"""
+Fault Model
+
+Author: Louis H
+Date: 2026-10-18
+
+This module models bursty link faults of embedded devices and the cost of retrying through them. A
+Gilbert-Elliott channel is a two-state Markov chain over a good and a bad phase, advanced once per packet, where
+each phase draws the packet's outcome, 'Acknowledge', 'Error' or 'Timeout', from its own distribution. Failures
+therefore come in bursts whose mean length and share of time are set directly.
+
+The phases of millions of packets are generated without a Python loop: the time spent in a phase is geometric,
+so the phase sequence is a run of alternating phases with geometric lengths, expanded with numpy.repeat.
+
+A RetryPolicy retries a failed message after an exponentially growing backoff, up to a number of attempts, and
+waits a timeout for every attempt that times out or whose response arrives later than the timeout. Round trips
+may be spread lognormally, so a short timeout abandons slow responses and a long one waits out lost ones.
+RetrySimulation plays a policy against one outcome stream in closed form: after every acknowledgment a new
+message starts, so a failure run of length L between two acknowledgments holds L // attempts abandoned messages
+followed by one delivered message. From this it reports goodput, retry amplification and tail latency, and
+compares policies on the same outcomes.
+
+Usage:
+    Run this script directly to compare retry budgets on a bursty link.
+
+Modules:
+    - numpy: Provides the vectorized phase, outcome and latency computations.
+    - scripts.sampling: Provides weight normalization, code dtypes and the module-wide random stream.
+    - scripts.stateModels: Provides the alias tables drawing the outcomes of each phase.
+
+Classes:
+    - GilbertElliott: A two-phase bursty fault model of the outcomes of a device's packets.
+    - RetryPolicy: A retry, exponential backoff and timeout policy.
+    - RetrySimulation: Measures the goodput and latency of retry policies on a faulty link.
+"""
+
+import numpy as np
+from scripts.sampling import code_dtype, default_stream, probabilities
+from scripts.stateModels import AliasTable
+
+# Outcome codes, indexing EmbeddedSystemSimulator.responses
+ACKNOWLEDGE, ERROR, TIMEOUT = 0, 1, 2
+GOOD, BAD = 0, 1
+
+class GilbertElliott:
+    """
+    A Gilbert-Elliott channel: a good and a bad phase, advanced once per packet, each drawing packet outcomes
+    from its own distribution.
+
+    Attributes:
+        to_bad (float): The probability of entering the bad phase after a packet in the good phase.
+        to_good (float): The probability of leaving the bad phase after a packet in the bad phase.
+        good (numpy.ndarray): The outcome probabilities in the good phase.
+        bad (numpy.ndarray): The outcome probabilities in the bad phase.
+        size (int): The number of outcomes.
+    """
+
+    def __init__(self, to_bad=0.01, to_good=0.2, good=(0.99, 0.005, 0.005), bad=(0.2, 0.3, 0.5)):
+        """
+        Initializes the GilbertElliott model.
+
+        Args:
+            to_bad (float): The probability of entering the bad phase after a good packet, in (0, 1].
+            to_good (float): The probability of leaving the bad phase after a bad packet, in (0, 1].
+            good (list): Relative weights of 'Acknowledge', 'Error' and 'Timeout' in the good phase.
+            bad (list): Relative weights of 'Acknowledge', 'Error' and 'Timeout' in the bad phase.
+        """
+        if not (0 < to_bad <= 1 and 0 < to_good <= 1):
+            raise ValueError("Phase transition probabilities must be in (0, 1]")
+        if len(good) != len(bad):
+            raise ValueError("Both phases must weight the same outcomes")
+        self.to_bad = to_bad
+        self.to_good = to_good
+        self.good = probabilities(len(good), good)
+        self.bad = probabilities(len(bad), bad)
+        self.size = len(good)
+        self._leave = np.array([to_bad, to_good])
+        self._tables = (AliasTable(self.good), AliasTable(self.bad))
+        self._probability = np.stack([table.probability for table in self._tables])
+        self._alias = np.stack([table.alias for table in self._tables]).astype(code_dtype(self.size))
+
+    @classmethod
+    def from_bursts(cls, mean_burst=5.0, bad_fraction=0.05, good=(0.99, 0.005, 0.005), bad=(0.2, 0.3, 0.5)):
+        """
+        Builds a model from the mean length of its bad phases and the share of packets sent in them.
+
+        Args:
+            mean_burst (float): The mean number of consecutive packets in the bad phase, at least 1.
+            bad_fraction (float): The long-run fraction of packets in the bad phase, in (0, 1).
+            good (list): Relative weights of 'Acknowledge', 'Error' and 'Timeout' in the good phase.
+            bad (list): Relative weights of 'Acknowledge', 'Error' and 'Timeout' in the bad phase.
+
+        Returns:
+            GilbertElliott: The model.
+        """
+        if mean_burst < 1 or not 0 < bad_fraction < 1:
+            raise ValueError("mean_burst must be at least 1 and bad_fraction in (0, 1)")
+        to_good = 1.0 / mean_burst
+        return cls(min(1.0, bad_fraction * to_good / (1 - bad_fraction)), to_good, good, bad)
+
+    def stationary(self):
+        """
+        Returns the long-run fraction of packets in each phase.
+
+        Returns:
+            numpy.ndarray: The fractions of the good and the bad phase.
+        """
+        bad = self.to_bad / (self.to_bad + self.to_good)
+        return np.array([1 - bad, bad])
+
+    def outcome_rates(self):
+        """
+        Returns the long-run probability of every outcome.
+
+        Returns:
+            numpy.ndarray: The probabilities of 'Acknowledge', 'Error' and 'Timeout'.
+        """
+        return self.stationary() @ np.stack([self.good, self.bad])
+
+    def mean_burst(self):
+        """
+        Returns the mean number of consecutive packets in the bad phase.
+
+        Returns:
+            float: The mean bad phase length.
+        """
+        return 1.0 / self.to_good
+
+    def advance(self, phase, rng=None):
+        """
+        Draws the phase and outcome of the next packet: a phase from the stationary distribution when phase is
+        None and the phase following it otherwise.
+
+        Args:
+            phase (int or None): The phase of the previous packet.
+            rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+        Returns:
+            tuple: The packet's phase and outcome code.
+        """
+        generator = (rng or default_stream()).random
+        if phase is None:
+            phase = BAD if generator.random() < self.stationary()[BAD] else GOOD
+        elif generator.random() < self._leave[phase]:
+            phase = 1 - phase
+        return phase, self._tables[phase].draw(rng)
+
+    def phases(self, n, phase=None, rng=None):
+        """
+        Draws the phases of n consecutive packets.
+
+        Args:
+            n (int): The number of packets.
+            phase (int, optional): The phase of the packet before the first. Defaults to a stationary start.
+            rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+        Returns:
+            numpy.ndarray: The phase of every packet, GOOD or BAD.
+        """
+        generator = (rng or default_stream()).generator
+        if phase is None:
+            first = int(generator.random() < self.stationary()[BAD])
+        else:
+            first = 1 - phase if generator.random() < self._leave[phase] else phase
+        # Phase lengths are geometric, so the sequence is a run of alternating phases of geometric lengths; the
+        # first length is geometric too because the chain is memoryless
+        mean_cycle = 1 / self.to_bad + 1 / self.to_good
+        lengths, total, current = [], 0, first
+        while total < n:
+            runs = 2 * (int((n - total) / mean_cycle * 1.25) + 8)
+            leave = self._leave[(current + np.arange(runs)) % 2]
+            chunk = generator.geometric(leave)
+            lengths.append(chunk)
+            total += int(chunk.sum())
+        lengths = np.concatenate(lengths)
+        values = ((first + np.arange(len(lengths))) % 2).astype(np.uint8)
+        return np.repeat(values, lengths)[:n]
+
+    def outcomes(self, n, phase=None, rng=None):
+        """
+        Draws the outcomes of n consecutive packets.
+
+        Args:
+            n (int): The number of packets.
+            phase (int, optional): The phase of the packet before the first. Defaults to a stationary start.
+            rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+        Returns:
+            tuple: The outcome code array and the phase of the last packet, to continue the stream from.
+        """
+        phases = self.phases(n, phase, rng)
+        generator = (rng or default_stream()).generator
+        columns = generator.integers(0, self.size, size=n)
+        keep = generator.random(n) < self._probability[phases, columns]
+        codes = np.where(keep, columns, self._alias[phases, columns]).astype(code_dtype(self.size))
+        return codes, (int(phases[-1]) if n else phase)
+
+class RetryPolicy:
+    """
+    Retries a failed message after an exponentially growing backoff, up to a number of attempts.
+
+    Attributes:
+        max_attempts (int): The number of attempts per message, including the first.
+        timeout (float): The seconds waited for a response before an attempt times out.
+        base_delay (float): The backoff in seconds after the first failed attempt.
+        multiplier (float): The growth factor of the backoff after every further failure.
+        max_delay (float): The largest backoff in seconds.
+        jitter (float): The largest relative deviation of each backoff, e.g. 0.5 for +/-50%.
+    """
+
+    def __init__(self, max_attempts=4, timeout=0.25, base_delay=0.01, multiplier=2.0, max_delay=1.0, jitter=0.0):
+        """
+        Initializes the RetryPolicy.
+
+        Args:
+            max_attempts (int): The number of attempts per message, at least 1.
+            timeout (float): The seconds waited for a response before an attempt times out.
+            base_delay (float): The backoff in seconds after the first failed attempt.
+            multiplier (float): The growth factor of the backoff, at least 1.
+            max_delay (float): The largest backoff in seconds.
+            jitter (float): The largest relative deviation of each backoff, in [0, 1].
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if timeout <= 0 or base_delay < 0 or multiplier < 1 or max_delay < base_delay:
+            raise ValueError("Invalid timeout or backoff parameters")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be in [0, 1]")
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.base_delay = base_delay
+        self.multiplier = multiplier
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def delays(self):
+        """
+        Returns the nominal backoff after every failed attempt; the last attempt is not retried.
+
+        Returns:
+            numpy.ndarray: The backoff in seconds after attempts 1 to max_attempts.
+        """
+        delays = np.minimum(self.base_delay * self.multiplier ** np.arange(self.max_attempts), self.max_delay)
+        delays[-1] = 0.0
+        return delays
+
+    def __repr__(self):
+        return (f"RetryPolicy(max_attempts={self.max_attempts}, timeout={self.timeout}, "
+                f"base_delay={self.base_delay}, multiplier={self.multiplier}, max_delay={self.max_delay}, "
+                f"jitter={self.jitter})")
+
+class RetrySimulation:
+    """
+    Plays retry policies against the packet outcomes of a faulty link, one message in flight at a time.
+
+    Attributes:
+        fault_model (GilbertElliott): The link's fault model.
+        round_trip (float): The median seconds until an attempt is acknowledged or rejected.
+        spread (float): The standard deviation of the logarithm of the round trip; 0 makes it constant.
+        rng (RandomStream): The stream drawing the outcomes, round trips and backoff jitter.
+    """
+
+    def __init__(self, fault_model, round_trip=0.02, spread=0.0, rng=None):
+        """
+        Initializes the RetrySimulation.
+
+        Args:
+            fault_model (GilbertElliott): The link's fault model.
+            round_trip (float): The median seconds until an attempt is acknowledged or rejected.
+            spread (float): The standard deviation of the logarithm of the round trip, e.g. 0.5.
+            rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+        """
+        if round_trip <= 0 or spread < 0:
+            raise ValueError("round_trip must be positive and spread non-negative")
+        self.fault_model = fault_model
+        self.round_trip = round_trip
+        self.spread = spread
+        self.rng = rng or default_stream()
+
+    def draw(self, packets):
+        """
+        Draws the outcomes and round trips of consecutive packets.
+
+        Args:
+            packets (int): The number of packets.
+
+        Returns:
+            tuple: The outcome code array and the round trip of every packet in seconds.
+        """
+        outcomes, _ = self.fault_model.outcomes(packets, rng=self.rng)
+        if not self.spread:
+            return outcomes, np.full(packets, float(self.round_trip))
+        return outcomes, self.round_trip * np.exp(self.spread * self.rng.generator.standard_normal(packets))
+
+    def run(self, policy, packets=1_000_000, draws=None):
+        """
+        Sends messages under a policy until a number of packets have been sent.
+
+        Args:
+            policy (RetryPolicy): The retry policy.
+            packets (int): The number of packets, i.e. attempts, to draw outcomes for.
+            draws (tuple, optional): Outcomes and round trips returned by draw, to replay instead of drawing new
+                                     ones.
+
+        Returns:
+            dict: The report: packets sent, messages, delivered and abandoned messages, the delivery ratio,
+                  retry amplification (packets per message), goodput (delivered messages per second and per
+                  packet), and the mean, p50, p99 and p99.9 latency of delivered messages in seconds.
+        """
+        outcomes, round_trips = draws or self.draw(packets)
+        # Responses arriving after the timeout are never seen, so those attempts time out as well
+        timed_out = (outcomes == TIMEOUT) | (round_trips > policy.timeout)
+        attempts = policy.max_attempts
+        index = np.arange(len(outcomes))
+        acknowledged = (outcomes == ACKNOWLEDGE) & ~timed_out
+        # A message starts after every acknowledgment, so an attempt's number within its message is its distance
+        # from the previous acknowledgment modulo the number of attempts
+        previous = np.maximum.accumulate(np.where(acknowledged, index, -1))
+        previous = np.concatenate(([-1], previous[:-1]))
+        attempt = (index - previous - 1) % attempts
+        final = acknowledged | (attempt == attempts - 1)
+        # Drop the trailing message that is still retrying when the packets run out
+        complete = int(np.flatnonzero(final)[-1]) + 1 if final.any() else 0
+        attempt, final, acknowledged = attempt[:complete], final[:complete], acknowledged[:complete]
+        backoff = policy.delays()[attempt]
+        if policy.jitter:
+            backoff = backoff * (1 + policy.jitter * self.rng.generator.uniform(-1, 1, complete))
+        cost = np.where(timed_out[:complete], policy.timeout, round_trips[:complete])
+        cost += np.where(final, 0.0, backoff)
+        message = np.cumsum(attempt == 0) - 1
+        latency = np.bincount(message, cost)
+        delivered = acknowledged[final]
+        messages = len(latency)
+        seconds = float(latency.sum())
+        quantiles = (np.quantile(latency[delivered], (0.5, 0.99, 0.999)) if delivered.any()
+                     else np.full(3, np.nan))
+        return {'packets': complete, 'messages': messages, 'delivered': int(delivered.sum()),
+                'abandoned': int(messages - delivered.sum()),
+                'delivery_ratio': float(delivered.mean()) if messages else float('nan'),
+                'retry_amplification': complete / messages if messages else float('nan'),
+                'goodput': float(delivered.sum()) / seconds if seconds else float('nan'),
+                'goodput_per_packet': float(delivered.sum()) / complete if complete else float('nan'),
+                'mean_latency': float(latency[delivered].mean()) if delivered.any() else float('nan'),
+                'p50': float(quantiles[0]), 'p99': float(quantiles[1]), 'p999': float(quantiles[2])}
+
+    def compare(self, policies, packets=1_000_000):
+        """
+        Runs several policies on the same packet outcomes, so their differences are not sampling noise.
+
+        Args:
+            policies (list): The RetryPolicy objects.
+            packets (int): The number of packets to draw outcomes for.
+
+        Returns:
+            list: The report of every policy.
+        """
+        draws = self.draw(packets)
+        return [self.run(policy, draws=draws) for policy in policies]
+
+if __name__ == "__main__":
+    # Compare retry budgets and timeouts on a link failing in bursts of 10 packets 5% of the time
+    simulation = RetrySimulation(GilbertElliott.from_bursts(mean_burst=10, bad_fraction=0.05), spread=0.5)
+    policies = [RetryPolicy(max_attempts=attempts, timeout=timeout)
+                for attempts in (1, 3, 6) for timeout in (0.04, 0.1, 0.5)]
+    for policy, report in zip(policies, simulation.compare(policies)):
+        print(f"{policy}: delivered {report['delivery_ratio']:.2%}, "
+              f"amplification {report['retry_amplification']:.3f}, goodput {report['goodput']:.1f}/s, "
+              f"p99 {report['p99'] * 1e3:.0f} ms")
@@ -0,0 +1,211 @@
+"""
+Fleet State
+
+Author: Louis H
+Date: 2026-10-18
+
+This module models a large deployment of combined devices as one struct-of-arrays state. Instead of one
+CombinedSimulator with three sub-simulator objects per device, a Fleet keeps a single simulator as the shared
+configuration (value lists, weights, compiled performance table) and holds each device's latest readings as one
+element of a few contiguous NumPy arrays, about eight bytes per device.
+
+A tick advances every device by one 2 s step with vectorized draws: WiFi and environmental readings change on
+every tick, embedded responses every response_period ticks, staggered across devices by their index, and every
+device's performance is then re-evaluated with one table lookup. When the shared simulators have temporal state
+models, each device's readings follow their own chain from its previous readings. When the shared WiFi simulator
+has a propagation model, every device is placed in its floor plan and its signal strength follows from its
+position. When the shared environmental simulator has a climate model, device i reads site i modulo its number of
+sites at the fleet's simulated time.
+
+Modules:
+    - numpy: Provides the state arrays.
+    - scripts.combinedSimulation: Provides the shared simulator and performance labels.
+    - scripts.outputSinks: Provides the sink that silences the shared simulator.
+
+Classes:
+    - Fleet: The struct-of-arrays state of many combined devices.
+"""
+
+import numpy as np
+from scripts.combinedSimulation import CombinedSimulator, PERFORMANCE_LABELS
+from scripts.outputSinks import NullSink
+
+class Fleet:
+    """
+    The struct-of-arrays state of many combined devices, advanced one tick at a time.
+
+    Categorical arrays hold codes that index the label tables of the shared simulator. The arrays are updated
+    in place, so views taken from them stay current.
+
+    Attributes:
+        simulator (CombinedSimulator): The shared configuration and random streams of all devices.
+        size (int): The number of devices.
+        ticks (int): The number of ticks advanced so far.
+        tick_seconds (float): The simulated seconds per tick.
+        response_period (int): The number of ticks between embedded responses of one device.
+        temperature (numpy.ndarray): Each device's temperature in degrees Celsius.
+        humidity (numpy.ndarray): Each device's humidity in percent.
+        response (numpy.ndarray): Each device's embedded response code.
+        signal (numpy.ndarray): Each device's WiFi signal code.
+        movement (numpy.ndarray): Each device's movement code.
+        breathing (numpy.ndarray): Each device's breathing pattern code.
+        performance (numpy.ndarray): Each device's performance code indexing PERFORMANCE_LABELS.
+        position (numpy.ndarray): Each device's (x, y) position in metres when the WiFi simulator has a
+                                  propagation model, or None. May be updated in place to move devices.
+    """
+
+    fields = ('temperature', 'humidity', 'response', 'signal', 'movement', 'breathing', 'performance')
+
+    def __init__(self, size, simulator=None, rng=None, tick_seconds=2, response_period=5):
+        """
+        Initializes the Fleet with a first reading for every device.
+
+        Args:
+            size (int): The number of devices.
+            simulator (CombinedSimulator, optional): The shared configuration. Defaults to a new, silent
+                                                     CombinedSimulator drawing from rng.
+            rng: The random source of the default simulator: a seed, a random.Random, a numpy.random.Generator
+                 or a RandomStream. Defaults to fresh OS entropy.
+            tick_seconds (float): The simulated seconds per tick.
+            response_period (int): The number of ticks between embedded responses of one device.
+        """
+        self.simulator = simulator or CombinedSimulator(rng, sink=NullSink())
+        self.size = size
+        self.ticks = 0
+        self.tick_seconds = tick_seconds
+        self.response_period = response_period
+        wifi = self.simulator.wifi_simulator
+        self.position = None
+        if wifi.propagation is not None:
+            self.position = wifi.propagation.floor_plan.random_positions(size, wifi.rng)
+        self.temperature = self.simulator.environmental_simulator.simulate_temperature_batch(size, time=0.0)
+        self.humidity = self.simulator.environmental_simulator.simulate_humidity_batch(size, time=0.0)
+        self.response, _ = self.simulator.embedded_simulator.receive_data_batch(size)
+        self.signal, _ = wifi.simulate_signal_batch(size, positions=self.position)
+        self.movement, _ = wifi.simulate_movement_batch(size)
+        self.breathing, _ = wifi.simulate_breathing_batch(size)
+        self.performance = np.empty(size, dtype=np.uint8)
+        self._evaluate()
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def time(self):
+        """
+        float: The simulated seconds since the fleet was created.
+        """
+        return self.ticks * self.tick_seconds
+
+    @property
+    def nbytes(self):
+        """
+        int: The number of bytes held by the state arrays.
+        """
+        return sum(getattr(self, field).nbytes for field in self.fields)
+
+    def tick(self, n=1):
+        """
+        Advances every device by n ticks.
+
+        Args:
+            n (int): The number of ticks.
+
+        Returns:
+            dict: The number of devices per performance level after the last tick.
+        """
+        simulator = self.simulator
+        wifi = simulator.wifi_simulator
+        environment = simulator.environmental_simulator
+        for _ in range(n):
+            self.ticks += 1
+            self.temperature[:] = environment.simulate_temperature_batch(self.size, self.temperature, self.time)
+            self.humidity[:] = environment.simulate_humidity_batch(self.size, self.humidity, self.time)
+            self.signal[:] = wifi.simulate_signal_batch(self.size, self.signal, self.position)[0]
+            self.movement[:] = wifi.simulate_movement_batch(self.size, self.movement)[0]
+            self.breathing[:] = wifi.simulate_breathing_batch(self.size, self.breathing)[0]
+            # Device i receives a response on the ticks congruent to i, so each tick refreshes a strided slice
+            due = self.response[self.ticks % self.response_period::self.response_period]
+            due[:] = simulator.embedded_simulator.receive_data_batch(len(due), due)[0]
+            counts = self._evaluate()
+        return counts
+
+    def device(self, i):
+        """
+        Returns the latest readings of one device as labels.
+
+        Args:
+            i (int): The device index.
+
+        Returns:
+            dict: The device's value or label per field.
+        """
+        state = {}
+        for field in self.fields:
+            codes, labels = self._field(field)
+            state[field] = codes[i].item() if labels is None else labels[codes[i]]
+        return state
+
+    def decode(self, field, devices=None):
+        """
+        Converts the codes of one categorical field back into labels.
+
+        Args:
+            field (str): One of 'response', 'signal', 'movement', 'breathing' or 'performance'.
+            devices (optional): An index, slice or mask selecting devices. Defaults to all devices.
+
+        Returns:
+            numpy.ndarray: An object array of labels.
+        """
+        codes, labels = self._categorical(field)
+        return np.asarray(labels, dtype=object)[codes if devices is None else codes[devices]]
+
+    def counts(self, field='performance'):
+        """
+        Counts how many devices currently have each label of one categorical field.
+
+        Args:
+            field (str): One of 'response', 'signal', 'movement', 'breathing' or 'performance'.
+
+        Returns:
+            dict: A mapping from label to number of devices.
+        """
+        codes, labels = self._categorical(field)
+        return dict(zip(labels, np.bincount(codes, minlength=len(labels)).tolist()))
+
+    def devices_with(self, field, label):
+        """
+        Returns the indices of the devices whose field currently has a label.
+
+        Args:
+            field (str): One of 'response', 'signal', 'movement', 'breathing' or 'performance'.
+            label (str): The label to select.
+
+        Returns:
+            numpy.ndarray: The device indices.
+        """
+        codes, labels = self._categorical(field)
+        if label not in labels:
+            raise ValueError(f"Unknown {field} label: {label}")
+        return np.flatnonzero(codes == labels.index(label))
+
+    def _evaluate(self):
+        codes, counts = self.simulator.evaluate_arrays(self.temperature, self.humidity, self.response,
+                                                       self.signal, self.movement)
+        self.performance[:] = codes
+        return counts
+
+    def _field(self, field):
+        if field not in self.fields:
+            raise ValueError(f"Unknown field: {field}")
+        wifi = self.simulator.wifi_simulator
+        labels = {'response': self.simulator.embedded_simulator.responses, 'signal': wifi.signals,
+                  'movement': wifi.movements, 'breathing': wifi.breathing_patterns,
+                  'performance': PERFORMANCE_LABELS}.get(field)
+        return getattr(self, field), None if labels is None else tuple(labels)
+
+    def _categorical(self, field):
+        codes, labels = self._field(field)
+        if labels is None:
+            raise ValueError(f"{field} is not a categorical field")
+        return codes, labels
@@ -0,0 +1,276 @@
+"""
+Frame Codec
+
+Author: Louis H
+Date: 2026-10-18
+
+This module defines the framed binary protocol of the simulated embedded devices and its encoders and decoders.
+Every frame is a fixed little-endian header, a payload and a CRC-32 trailer:
+
+    magic (uint16) | kind (uint8) | code (uint8) | sequence (uint32) | payload length (uint16) | payload | crc (uint32)
+
+The kind tells data frames from response frames, the code is the index of the data value or response in the
+simulator's value list, and the CRC covers the header and the payload.
+
+Encoders pack frames straight into a preallocated bytearray and decoders unpack them in place with precompiled
+struct objects, so payloads come back as memoryview slices of the input buffer and nothing is copied. The batch
+decoder parses a whole receive buffer, reports how many bytes it consumed so an incomplete trailing frame can be
+completed by the next read, and either raises on the first corrupt frame or skips it and resynchronizes on the
+next magic number.
+
+Modules:
+    - struct: Packs and unpacks headers and trailers.
+    - zlib: Computes the CRC-32 of every frame.
+    - numpy: Holds the decoded header fields of a batch.
+
+Classes:
+    - FrameBatch: The decoded frames of a buffer as parallel arrays with zero-copy payload views.
+
+Functions:
+    - frame_size: Returns the encoded size of a frame.
+    - encode_frame: Encodes one frame into new bytes.
+    - encode_into: Encodes one frame into a buffer at an offset.
+    - decode_frame: Decodes one frame from a buffer at an offset.
+    - encode_batch: Encodes many frames into one bytearray.
+    - decode_batch: Decodes every complete frame of a buffer.
+"""
+
+import struct
+import zlib
+import numpy as np
+
+MAGIC = 0xA55A
+FRAME_DATA = 0
+FRAME_RESPONSE = 1
+HEADER = struct.Struct('<HBBIH')
+TRAILER = struct.Struct('<I')
+OVERHEAD = HEADER.size + TRAILER.size
+MAX_PAYLOAD = 0xFFFF
+_MAGIC_BYTES = MAGIC.to_bytes(2, 'little')
+
+def frame_size(payload_length):
+    """
+    Returns the encoded size of a frame.
+
+    Args:
+        payload_length (int): The number of payload bytes.
+
+    Returns:
+        int: The frame size in bytes.
+    """
+    return OVERHEAD + payload_length
+
+def encode_into(buffer, offset, kind, code, sequence, payload=b''):
+    """
+    Encodes one frame into a buffer at an offset.
+
+    Args:
+        buffer (bytearray or memoryview): A writable buffer with room for the frame.
+        offset (int): The position of the frame in the buffer.
+        kind (int): FRAME_DATA or FRAME_RESPONSE.
+        code (int): The data value or response code.
+        sequence (int): The sequence number; it wraps at 2**32.
+        payload (bytes-like): The payload.
+
+    Returns:
+        int: The offset just past the frame.
+    """
+    length = len(payload)
+    if length > MAX_PAYLOAD:
+        raise ValueError(f"Payload of {length} bytes exceeds {MAX_PAYLOAD} bytes")
+    view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+    HEADER.pack_into(view, offset, MAGIC, kind, code, sequence & 0xFFFFFFFF, length)
+    start = offset + HEADER.size
+    end = start + length
+    view[start:end] = payload
+    TRAILER.pack_into(view, end, zlib.crc32(view[offset:end]))
+    return end + TRAILER.size
+
+def encode_frame(kind, code, sequence, payload=b''):
+    """
+    Encodes one frame into new bytes.
+
+    Args:
+        kind (int): FRAME_DATA or FRAME_RESPONSE.
+        code (int): The data value or response code.
+        sequence (int): The sequence number; it wraps at 2**32.
+        payload (bytes-like): The payload.
+
+    Returns:
+        bytes: The frame.
+    """
+    buffer = bytearray(frame_size(len(payload)))
+    encode_into(buffer, 0, kind, code, sequence, payload)
+    return bytes(buffer)
+
+def decode_frame(buffer, offset=0):
+    """
+    Decodes one frame from a buffer at an offset.
+
+    Args:
+        buffer (bytes-like): The buffer holding the frame.
+        offset (int): The position of the frame in the buffer.
+
+    Returns:
+        tuple: The frame's kind, code, sequence number and payload, a memoryview slice of the buffer, followed
+               by the offset just past the frame.
+
+    Raises:
+        ValueError: If the frame is truncated, does not start with the magic number or fails its CRC.
+    """
+    view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+    if len(view) - offset < OVERHEAD:
+        raise ValueError("Truncated frame")
+    magic, kind, code, sequence, length = HEADER.unpack_from(view, offset)
+    if magic != MAGIC:
+        raise ValueError(f"Bad magic number at offset {offset}")
+    end = offset + HEADER.size + length
+    if len(view) < end + TRAILER.size:
+        raise ValueError("Truncated frame")
+    if zlib.crc32(view[offset:end]) != TRAILER.unpack_from(view, end)[0]:
+        raise ValueError(f"CRC mismatch in frame at offset {offset}")
+    return kind, code, sequence, view[offset + HEADER.size:end], end + TRAILER.size
+
+def encode_batch(kinds, codes, sequences, payloads=None, out=None):
+    """
+    Encodes many frames back to back into one bytearray.
+
+    Args:
+        kinds (list or int): The kind of every frame, or one kind for all.
+        codes (list or numpy.ndarray): The code of every frame.
+        sequences (list or numpy.ndarray): The sequence number of every frame.
+        payloads (list, optional): The payload of every frame. Defaults to empty payloads.
+        out (bytearray, optional): A buffer to encode into, with room for every frame. Defaults to a new one.
+
+    Returns:
+        memoryview: The encoded frames, a view of out or of a new bytearray.
+    """
+    n = len(codes)
+    codes = codes.tolist() if isinstance(codes, np.ndarray) else codes
+    sequences = sequences.tolist() if isinstance(sequences, np.ndarray) else sequences
+    kinds = [kinds] * n if isinstance(kinds, int) else kinds
+    payloads = [b''] * n if payloads is None else payloads
+    size = sum(map(len, payloads)) + n * OVERHEAD
+    if out is None:
+        out = bytearray(size)
+    elif len(out) < size:
+        raise ValueError(f"out holds {len(out)} bytes but the frames need {size}")
+    view = memoryview(out)
+    pack_header, pack_trailer, crc32 = HEADER.pack_into, TRAILER.pack_into, zlib.crc32
+    header_size = HEADER.size
+    offset = 0
+    for kind, code, sequence, payload in zip(kinds, codes, sequences, payloads):
+        length = len(payload)
+        pack_header(view, offset, MAGIC, kind, code, sequence & 0xFFFFFFFF, length)
+        end = offset + header_size + length
+        if length:
+            view[offset + header_size:end] = payload
+        pack_trailer(view, end, crc32(view[offset:end]))
+        offset = end + 4
+    return view[:size]
+
+class FrameBatch:
+    """
+    The frames decoded from one buffer, as parallel arrays of header fields with zero-copy payload views.
+
+    Attributes:
+        kind (numpy.ndarray): The kind of every frame.
+        code (numpy.ndarray): The code of every frame.
+        sequence (numpy.ndarray): The sequence number of every frame.
+        offsets (numpy.ndarray): The position of every frame's payload in the buffer.
+        lengths (numpy.ndarray): The payload length of every frame.
+        buffer (memoryview): The decoded buffer, which the payload views refer to.
+        consumed (int): The number of bytes decoded; the rest is an incomplete frame to complete and decode later.
+        errors (int): The number of corrupt frames skipped.
+    """
+
+    def __init__(self, kind, code, sequence, offsets, lengths, buffer, consumed, errors):
+        """
+        Initializes the batch from decoded header fields.
+        """
+        self.kind = np.array(kind, dtype=np.uint8)
+        self.code = np.array(code, dtype=np.uint8)
+        self.sequence = np.array(sequence, dtype=np.uint32)
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.lengths = np.array(lengths, dtype=np.int64)
+        self.buffer = buffer
+        self.consumed = consumed
+        self.errors = errors
+
+    def __len__(self):
+        return len(self.kind)
+
+    def payload(self, i):
+        """
+        Returns one frame's payload.
+
+        Args:
+            i (int): The frame index.
+
+        Returns:
+            memoryview: The payload as a slice of the buffer.
+        """
+        start = int(self.offsets[i])
+        return self.buffer[start:start + int(self.lengths[i])]
+
+    def labels(self, values, kind=None):
+        """
+        Converts frame codes into labels, e.g. into the responses of an EmbeddedSystemSimulator.
+
+        Args:
+            values (list): The value list the codes index.
+            kind (int, optional): Only convert frames of this kind.
+
+        Returns:
+            numpy.ndarray: An object array of labels.
+        """
+        codes = self.code if kind is None else self.code[self.kind == kind]
+        return np.asarray(values, dtype=object)[codes]
+
+def decode_batch(buffer, strict=True):
+    """
+    Decodes every complete frame of a buffer, e.g. one read from a gateway socket.
+
+    Args:
+        buffer (bytes-like): The buffer.
+        strict (bool): Whether to raise on a corrupt frame instead of skipping it and resynchronizing on the next
+                       magic number.
+
+    Returns:
+        FrameBatch: The decoded frames.
+
+    Raises:
+        ValueError: If strict and a frame does not start with the magic number or fails its CRC.
+    """
+    view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+    if view.format != 'B' or view.ndim != 1:
+        view = view.cast('B')
+    kinds, codes, sequences, offsets, lengths = [], [], [], [], []
+    unpack_header, unpack_trailer, crc32 = HEADER.unpack_from, TRAILER.unpack_from, zlib.crc32
+    header_size = HEADER.size
+    size = len(view)
+    offset = 0
+    errors = 0
+    while size - offset >= OVERHEAD:
+        magic, kind, code, sequence, length = unpack_header(view, offset)
+        end = offset + header_size + length
+        if magic == MAGIC:
+            if end + 4 > size:
+                break
+            if crc32(view[offset:end]) == unpack_trailer(view, end)[0]:
+                kinds.append(kind)
+                codes.append(code)
+                sequences.append(sequence)
+                offsets.append(offset + header_size)
+                lengths.append(length)
+                offset = end + 4
+                continue
+        if strict:
+            problem = 'CRC mismatch' if magic == MAGIC else 'Bad magic number'
+            raise ValueError(f"{problem} in frame at offset {offset}")
+        # Skip the corrupt frame by resuming at the next magic number after its first byte, keeping a last
+        # byte that may start the magic number of a frame still being received
+        errors += 1
+        following = bytes(view[offset + 1:]).find(_MAGIC_BYTES)
+        offset = size - 1 if following < 0 else offset + 1 + following
+    return FrameBatch(kinds, codes, sequences, offsets, lengths, view, offset, errors)
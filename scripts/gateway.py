@@ -0,0 +1,234 @@
+"""
+Gateway
+
+Author: Louis H
+Date: 2026-10-18
+
+This module provides a local stand-in for the gateway that embedded devices report to, and a harness measuring
+how it scales with the number of devices. The gateway answers every data frame it receives with a response frame
+echoing its sequence number, so devices can match responses to requests. All frames decoded from one read are
+answered with a single write.
+
+The harness drives simulated EmbeddedSystemSimulator devices through any transport of scripts.transport. Devices
+share a pool of channels opened once and reused for every message, and each device sends its next frame as soon
+as the previous one is acknowledged. It reports the message throughput and round-trip latency percentiles.
+
+Usage:
+    Run this script directly to benchmark every transport for growing device counts.
+
+Modules:
+    - asyncio: Provides the event loop.
+    - time: Provides the round-trip time measurements.
+    - numpy: Provides the response codes and latency arrays.
+    - scripts.embeddedSystem: Provides the devices.
+    - scripts.frameCodec: Decodes data frames and encodes response frames.
+    - scripts.latencyHistogram: Provides the latency histogram.
+    - scripts.outputSinks: Provides the sink that silences the devices' own output.
+    - scripts.sampling: Provides the random streams of the devices.
+    - scripts.transport: Provides the transports and channels.
+
+Classes:
+    - Gateway: Acknowledges the data frames of every connection.
+    - GatewayBenchmark: Measures gateway throughput and latency for a number of devices.
+"""
+
+import asyncio
+import time
+import numpy as np
+from scripts.embeddedSystem import EmbeddedSystemSimulator
+from scripts.frameCodec import FRAME_DATA, FRAME_RESPONSE, decode_batch, encode_batch
+from scripts.latencyHistogram import LatencyHistogram
+from scripts.outputSinks import NullSink
+from scripts.sampling import make_stream
+from scripts.transport import Channel, QueueTransport, TcpTransport, UnixTransport
+
+class Gateway:
+    """
+    A stand-in gateway that answers every data frame with a response frame echoing its sequence number.
+
+    Attributes:
+        transport (Transport): The transport served on.
+        simulator (EmbeddedSystemSimulator): Draws the response codes, or None to acknowledge every frame.
+        frames (int): The number of data frames answered.
+        errors (int): The number of corrupt frames skipped.
+        connections (int): The number of connections accepted.
+    """
+
+    def __init__(self, transport, simulator=None):
+        """
+        Initializes the Gateway.
+
+        Args:
+            transport (Transport): The transport to serve on.
+            simulator (EmbeddedSystemSimulator, optional): Draws the response codes, e.g. to inject errors.
+                                                           Defaults to acknowledging every frame.
+        """
+        self.transport = transport
+        self.simulator = simulator
+        self.frames = 0
+        self.errors = 0
+        self.connections = 0
+
+    async def start(self):
+        """
+        Starts accepting connections on the running event loop.
+        """
+        await self.transport.serve(self._handle)
+
+    async def stop(self):
+        """
+        Stops accepting connections and closes the open ones.
+        """
+        await self.transport.close()
+
+    async def _handle(self, connection):
+        self.connections += 1
+        buffer = bytearray()
+        while True:
+            chunk = await connection.recv()
+            if not chunk:
+                break
+            buffer += chunk
+            with memoryview(buffer) as view:
+                batch = decode_batch(view, strict=False)
+                data = batch.kind == FRAME_DATA
+                sequences = batch.sequence[data]
+                consumed = batch.consumed
+                self.errors += batch.errors
+                del batch
+            del buffer[:consumed]
+            n = len(sequences)
+            if not n:
+                continue
+            if self.simulator is None:
+                codes = np.zeros(n, dtype=np.uint8)
+            else:
+                codes, _ = self.simulator.receive_data_batch(n)
+            await connection.send(encode_batch(FRAME_RESPONSE, codes, sequences))
+            self.frames += n
+
+class GatewayBenchmark:
+    """
+    Measures the message throughput and round-trip latency of a Gateway serving many devices over pooled
+    connections.
+
+    Attributes:
+        transport (Transport): The transport the gateway serves on.
+        devices (list): The simulated devices.
+        connections (int): The number of channels the devices share.
+        rng (RandomStream): The benchmark's random stream; each device draws from a child of it.
+    """
+
+    def __init__(self, transport, devices=100, connections=8, rng=None):
+        """
+        Initializes the GatewayBenchmark and creates its devices.
+
+        Args:
+            transport (Transport): The transport to serve and connect through.
+            devices (int): The largest number of devices to drive.
+            connections (int): The number of channels; devices are assigned to them round-robin.
+            rng: The random source: a seed, a random.Random, a numpy.random.Generator or a RandomStream.
+                 Defaults to fresh OS entropy.
+        """
+        if connections < 1:
+            raise ValueError("connections must be at least 1")
+        self.transport = transport
+        self.connections = connections
+        self.rng = make_stream(rng)
+        self.devices = [EmbeddedSystemSimulator(stream, NullSink()) for stream in self.rng.spawn(devices)]
+
+    async def arun(self, messages_per_device, devices=None):
+        """
+        Starts a gateway on the running event loop, drives the devices against it and stops it.
+
+        Args:
+            messages_per_device (int): The number of frames each device sends.
+            devices (int, optional): The number of devices to drive. Defaults to all of them.
+
+        Returns:
+            dict: The number of devices, connections and messages, the elapsed seconds, the messages per second,
+                  the p50 and p99 round-trip latencies in seconds and the number of failed exchanges.
+        """
+        gateway = Gateway(self.transport)
+        await gateway.start()
+        try:
+            return await self._drive(messages_per_device, devices)
+        finally:
+            await gateway.stop()
+
+    def run(self, messages_per_device, devices=None):
+        """
+        Runs the benchmark on a new event loop; see arun.
+
+        Args:
+            messages_per_device (int): The number of frames each device sends.
+            devices (int, optional): The number of devices to drive. Defaults to all of them.
+
+        Returns:
+            dict: The report returned by arun.
+        """
+        return asyncio.run(self.arun(messages_per_device, devices))
+
+    def sweep(self, device_counts, messages_per_device):
+        """
+        Runs the benchmark for growing numbers of devices against one gateway.
+
+        Args:
+            device_counts (list): The numbers of devices to drive.
+            messages_per_device (int): The number of frames each device sends.
+
+        Returns:
+            list: The report of every device count.
+        """
+        async def sweep():
+            gateway = Gateway(self.transport)
+            await gateway.start()
+            try:
+                return [await self._drive(messages_per_device, count) for count in device_counts]
+            finally:
+                await gateway.stop()
+
+        return asyncio.run(sweep())
+
+    async def _drive(self, messages_per_device, devices):
+        devices = len(self.devices) if devices is None else devices
+        if devices > len(self.devices):
+            raise ValueError(f"The benchmark has {len(self.devices)} devices, not {devices}")
+        channels = [await Channel.open(self.transport) for _ in range(self.connections)]
+        latencies = np.empty((devices, messages_per_device))
+        failures = [0]
+
+        async def device(index, simulator, channel):
+            for message in range(messages_per_device):
+                start = time.perf_counter()
+                try:
+                    await simulator.aexchange(channel)
+                except (ConnectionError, ValueError):
+                    failures[0] += 1
+                    latencies[index, message] = np.nan
+                    continue
+                latencies[index, message] = time.perf_counter() - start
+
+        try:
+            start = time.perf_counter()
+            await asyncio.gather(*(device(index, simulator, channels[index % self.connections])
+                                   for index, simulator in enumerate(self.devices[:devices])))
+            seconds = time.perf_counter() - start
+        finally:
+            for channel in channels:
+                await channel.close()
+        histogram = LatencyHistogram(min_seconds=1e-6)
+        histogram.record(latencies[~np.isnan(latencies)])
+        messages = devices * messages_per_device - failures[0]
+        return {'devices': devices, 'connections': self.connections, 'messages': messages, 'seconds': seconds,
+                'messages_per_second': messages / seconds if seconds > 0 else float('inf'),
+                'p50': histogram.quantile(0.5), 'p99': histogram.quantile(0.99), 'errors': failures[0]}
+
+if __name__ == "__main__":
+    # Benchmark every transport for growing device counts
+    for transport in (QueueTransport(), UnixTransport(), TcpTransport()):
+        benchmark = GatewayBenchmark(transport, devices=1000, connections=8)
+        for report in benchmark.sweep([10, 100, 1000], messages_per_device=20):
+            print(f"{type(transport).__name__}: {report['devices']} devices, "
+                  f"{report['messages_per_second']:.0f} messages/s, p50 {report['p50'] * 1e3:.2f} ms, "
+                  f"p99 {report['p99'] * 1e3:.2f} ms")
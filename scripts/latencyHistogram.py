@@ -0,0 +1,107 @@
+"""
+Latency Histograms
+
+Author: Louis H
+Date: 2026-10-18
+
+This module provides the log-bucketed latency histogram shared by the components that measure latencies, such as
+the motion detector's detection latency and the gateway benchmark's round trips. Buckets are spaced evenly on a
+logarithmic scale, so percentiles carry the same bounded relative error from microseconds to minutes, and
+recording a batch of latencies is one vectorized update.
+
+Modules:
+    - numpy: Provides the bucket edges and counts.
+
+Classes:
+    - LatencyHistogram: A log-bucketed latency histogram.
+"""
+
+import numpy as np
+
+class LatencyHistogram:
+    """
+    A histogram of latencies in logarithmically spaced buckets, with bounded relative error at every scale.
+
+    Attributes:
+        edges (numpy.ndarray): The upper bound of every bucket in seconds; the last bucket is unbounded.
+        counts (numpy.ndarray): The number of latencies per bucket.
+        total (float): The sum of all recorded latencies.
+        maximum (float): The largest recorded latency.
+    """
+
+    def __init__(self, min_seconds=1e-4, max_seconds=100.0, buckets_per_decade=20):
+        """
+        Initializes the LatencyHistogram.
+
+        Args:
+            min_seconds (float): The upper bound of the first bucket.
+            max_seconds (float): The upper bound of the last bounded bucket.
+            buckets_per_decade (int): The number of buckets per factor of ten.
+        """
+        decades = np.log10(max_seconds / min_seconds)
+        self.edges = min_seconds * 10 ** (np.arange(int(round(decades * buckets_per_decade)) + 1)
+                                          / buckets_per_decade)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def __len__(self):
+        return int(self.counts.sum())
+
+    def record(self, latencies):
+        """
+        Records one or more latencies.
+
+        Args:
+            latencies (float or numpy.ndarray): Latencies in seconds.
+        """
+        latencies = np.atleast_1d(np.asarray(latencies, dtype=np.float64))
+        if not latencies.size:
+            return
+        np.add.at(self.counts, np.searchsorted(self.edges, latencies), 1)
+        self.total += float(latencies.sum())
+        self.maximum = max(self.maximum, float(latencies.max()))
+
+    def quantile(self, q):
+        """
+        Returns an upper bound of a latency quantile: the upper edge of the bucket holding it.
+
+        Args:
+            q (float): The quantile, e.g. 0.99.
+
+        Returns:
+            float: The latency bound in seconds, or NaN if nothing has been recorded.
+        """
+        n = len(self)
+        if not n:
+            return float('nan')
+        bucket = int(np.searchsorted(np.cumsum(self.counts), q * n))
+        return float(self.edges[bucket]) if bucket < len(self.edges) else self.maximum
+
+    def fraction_within(self, budget):
+        """
+        Returns the fraction of latencies guaranteed to be within a budget, counting only whole buckets.
+
+        Args:
+            budget (float): The latency budget in seconds.
+
+        Returns:
+            float: The fraction, or NaN if nothing has been recorded.
+        """
+        n = len(self)
+        if not n:
+            return float('nan')
+        return float(self.counts[:np.searchsorted(self.edges, budget, side='right')].sum() / n)
+
+    def merge(self, other):
+        """
+        Adds the latencies of another histogram with the same buckets.
+
+        Args:
+            other (LatencyHistogram): The histogram to add.
+        """
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Histograms have different buckets")
+        self.counts += other.counts
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
@@ -0,0 +1,271 @@
+"""
+Monte Carlo Runner
+
+Author: Louis H
+Date: 2026-10-18
+
+This module shards large numbers of CombinedSimulator evaluations across a process pool. Each shard runs a
+spawned copy of the simulator with its own child random stream, evaluates its samples with the batch API, and
+sends back a compact summary of label and sensor statistics. The runner merges summaries as they arrive, reports
+progress, and can be cancelled between shards.
+
+Because shard k always uses the k-th child stream of the simulator, a run is reproducible from the simulator's
+seed regardless of the number of workers or the order in which shards finish.
+
+Modules:
+    - os: Provides the CPU count used as the default pool size.
+    - threading: Provides the event used to cancel a run.
+    - concurrent.futures: Provides the process pool.
+    - numpy: Provides the histograms and sums.
+    - scripts.combinedSimulation: Provides the simulator and performance labels.
+    - scripts.outputSinks: Provides the sink that silences the shards' simulators.
+
+Classes:
+    - MonteCarloSummary: Mergeable label histograms and sensor statistics.
+    - MonteCarloRunner: Runs sharded evaluations and merges their summaries.
+"""
+
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
+from scripts.combinedSimulation import PERFORMANCE_LABELS
+from scripts.outputSinks import NullSink
+
+class MonteCarloSummary:
+    """
+    Mergeable label histograms and sensor statistics of a set of combined evaluations.
+
+    Attributes:
+        samples (int): The number of evaluated samples.
+        label_counts (numpy.ndarray): Occurrences of each performance level, in PERFORMANCE_LABELS order.
+        signal_counts (numpy.ndarray): Occurrences of each signal code.
+        movement_counts (numpy.ndarray): Occurrences of each movement code.
+        response_counts (numpy.ndarray): Occurrences of each embedded response code.
+        temperature_sum (float): Sum of the temperatures.
+        temperature_sum_squares (float): Sum of the squared temperatures.
+        humidity_sum (float): Sum of the humidities.
+        humidity_sum_squares (float): Sum of the squared humidities.
+        cancelled (bool): Whether the run was cancelled before all shards finished.
+    """
+
+    def __init__(self, signals=0, movements=0, responses=0):
+        """
+        Initializes an empty summary.
+
+        Args:
+            signals (int): The number of signal codes.
+            movements (int): The number of movement codes.
+            responses (int): The number of embedded response codes.
+        """
+        self.samples = 0
+        self.label_counts = np.zeros(len(PERFORMANCE_LABELS), dtype=np.int64)
+        self.signal_counts = np.zeros(signals, dtype=np.int64)
+        self.movement_counts = np.zeros(movements, dtype=np.int64)
+        self.response_counts = np.zeros(responses, dtype=np.int64)
+        self.temperature_sum = 0.0
+        self.temperature_sum_squares = 0.0
+        self.humidity_sum = 0.0
+        self.humidity_sum_squares = 0.0
+        self.cancelled = False
+
+    @classmethod
+    def from_samples(cls, labels, temperature, humidity, response, signal, movement, shape):
+        """
+        Summarizes arrays of evaluated samples.
+
+        Args:
+            labels (numpy.ndarray): Performance label codes.
+            temperature (numpy.ndarray): Temperatures.
+            humidity (numpy.ndarray): Humidities.
+            response (numpy.ndarray): Embedded response codes.
+            signal (numpy.ndarray): Signal codes.
+            movement (numpy.ndarray): Movement codes.
+            shape (tuple): The number of signal, movement and response codes.
+
+        Returns:
+            MonteCarloSummary: The summary.
+        """
+        summary = cls(*shape)
+        summary.samples = len(labels)
+        summary.label_counts += np.bincount(labels, minlength=len(PERFORMANCE_LABELS))
+        summary.signal_counts += np.bincount(signal, minlength=shape[0])
+        summary.movement_counts += np.bincount(movement, minlength=shape[1])
+        summary.response_counts += np.bincount(response, minlength=shape[2])
+        temperature = temperature.astype(np.float64)
+        humidity = humidity.astype(np.float64)
+        summary.temperature_sum = float(temperature.sum())
+        summary.temperature_sum_squares = float(np.dot(temperature, temperature))
+        summary.humidity_sum = float(humidity.sum())
+        summary.humidity_sum_squares = float(np.dot(humidity, humidity))
+        return summary
+
+    def merge(self, other):
+        """
+        Adds another summary's statistics to this one.
+
+        Args:
+            other (MonteCarloSummary): The summary to merge.
+
+        Returns:
+            MonteCarloSummary: This summary.
+        """
+        self.samples += other.samples
+        self.label_counts += other.label_counts
+        if not self.signal_counts.size:
+            self.signal_counts = np.zeros_like(other.signal_counts)
+            self.movement_counts = np.zeros_like(other.movement_counts)
+            self.response_counts = np.zeros_like(other.response_counts)
+        self.signal_counts += other.signal_counts
+        self.movement_counts += other.movement_counts
+        self.response_counts += other.response_counts
+        self.temperature_sum += other.temperature_sum
+        self.temperature_sum_squares += other.temperature_sum_squares
+        self.humidity_sum += other.humidity_sum
+        self.humidity_sum_squares += other.humidity_sum_squares
+        return self
+
+    def label_fractions(self):
+        """
+        Returns the fraction of samples at each performance level.
+
+        Returns:
+            dict: A mapping from performance level to fraction of samples.
+        """
+        total = max(self.samples, 1)
+        return {label: count / total for label, count in zip(PERFORMANCE_LABELS, self.label_counts.tolist())}
+
+    def temperature_stats(self):
+        """
+        Returns the mean and standard deviation of the temperatures.
+
+        Returns:
+            tuple: The mean and standard deviation.
+        """
+        return self._stats(self.temperature_sum, self.temperature_sum_squares)
+
+    def humidity_stats(self):
+        """
+        Returns the mean and standard deviation of the humidities.
+
+        Returns:
+            tuple: The mean and standard deviation.
+        """
+        return self._stats(self.humidity_sum, self.humidity_sum_squares)
+
+    def _stats(self, total, total_squares):
+        if not self.samples:
+            return 0.0, 0.0
+        mean = total / self.samples
+        return mean, max(total_squares / self.samples - mean * mean, 0.0) ** 0.5
+
+def _evaluate_shard(simulator, n):
+    """
+    Evaluates one shard of samples in a worker and summarizes it.
+
+    Args:
+        simulator (CombinedSimulator): The spawned simulator copy owning the shard's random stream.
+        n (int): The number of samples.
+
+    Returns:
+        MonteCarloSummary: The shard's summary.
+    """
+    environment = simulator.environmental_simulator
+    temperature = environment.simulate_temperature_batch(n)
+    humidity = environment.simulate_humidity_batch(n)
+    response, responses = simulator.embedded_simulator.receive_data_batch(n)
+    signal, signals = simulator.wifi_simulator.simulate_signal_batch(n)
+    movement, movements = simulator.wifi_simulator.simulate_movement_batch(n)
+    labels, _ = simulator.evaluate_arrays(temperature, humidity, response, signal, movement)
+    return MonteCarloSummary.from_samples(labels, temperature, humidity, response, signal, movement,
+                                          (len(signals), len(movements), len(responses)))
+
+class MonteCarloRunner:
+    """
+    Shards CombinedSimulator evaluations across a process pool and merges their summaries.
+
+    Attributes:
+        simulator (CombinedSimulator): The simulator whose configuration and random stream the shards derive from.
+        workers (int): The number of worker processes; 0 evaluates the shards in the calling process.
+        shard_size (int): The number of samples per shard.
+    """
+
+    def __init__(self, simulator, workers=None, shard_size=1_000_000):
+        """
+        Initializes the MonteCarloRunner.
+
+        Args:
+            simulator (CombinedSimulator): The simulator to shard.
+            workers (int, optional): The number of worker processes. Defaults to the CPU count.
+            shard_size (int): The number of samples per shard.
+        """
+        self.simulator = simulator
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.shard_size = shard_size
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """
+        Requests cancellation of the current or next run; shards already in flight finish, pending ones are never
+        spawned. The request is consumed when that run returns, so a cancel issued before run() is not lost.
+        """
+        self._cancel.set()
+
+    def run(self, n, progress=None):
+        """
+        Evaluates n samples and returns their merged summary.
+
+        Args:
+            n (int): The total number of samples.
+            progress (callable, optional): Called as progress(done, total) after each shard is merged.
+
+        Returns:
+            MonteCarloSummary: The merged summary; its cancelled flag is set if the run was cancelled.
+        """
+        shards = self._shards(n)
+        summary = MonteCarloSummary()
+
+        try:
+            if self.workers == 0:
+                while not self._cancel.is_set():
+                    shard = next(shards, None)
+                    if shard is None:
+                        break
+                    self._merge(summary, _evaluate_shard(*shard), n, progress)
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    pending = set()
+                    # Keep a bounded number of shards in flight so cancellation is prompt and memory stays flat
+                    while True:
+                        while not self._cancel.is_set() and len(pending) < 2 * self.workers:
+                            shard = next(shards, None)
+                            if shard is None:
+                                break
+                            pending.add(executor.submit(_evaluate_shard, *shard))
+                        if not pending:
+                            break
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._merge(summary, future.result(), n, progress)
+        finally:
+            self._cancel.clear()
+
+        summary.cancelled = summary.samples < n
+        return summary
+
+    def _shards(self, n):
+        # Spawn each shard's simulator copy only when the shard is submitted; the k-th copy still draws from the
+        # k-th child stream, as successive spawns continue the parent's sequence of children
+        for start in range(0, n, self.shard_size):
+            shard = self.simulator.spawn(1)[0]
+            # Shards emit nothing, and the parent's sink may hold an open file that cannot reach a worker
+            shard.sink = NullSink()
+            for simulator in (shard.wifi_simulator, shard.embedded_simulator, shard.environmental_simulator):
+                simulator.sink = shard.sink
+            yield shard, min(self.shard_size, n - start)
+
+    @staticmethod
+    def _merge(summary, shard_summary, total, progress):
+        summary.merge(shard_summary)
+        if progress is not None:
+            progress(summary.samples, total)
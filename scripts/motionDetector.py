@@ -0,0 +1,261 @@
+"""
+Motion Detector
+
+Author: Louis H
+Date: 2026-10-18
+
+This module detects movement, including falls, from streaming CSI frames and measures how long detections take.
+A moving body adds a Doppler component to every antenna and subcarrier, so each CSI amplitude stream oscillates
+at the Doppler frequency of the body's speed. For every link the detector keeps windowed sums of the amplitude
+and its lag-1 and lag-2 products for every stream. These are updated in O(1) per stream and frame and
+give the autocovariances at lags 1 and 2. For a sinusoid in white noise, the lag-1 and lag-2 autocovariances
+determine both the sinusoid's power and its frequency without bias from the noise. The power relative to the
+mean amplitude separates motion from stillness, and the frequency, converted to a speed, selects the nearest
+movement state.
+
+Detection latency, from the frame on which a movement starts to the frame on which it is first reported plus
+the processing time of that frame, is recorded per movement label in log-bucketed histograms, so latency budgets
+can be checked at any percentile.
+
+Modules:
+    - time: Provides the processing-time measurements.
+    - numpy: Provides the ring buffers and vectorized statistics.
+    - scripts.csiGenerator: Provides the speed of each movement state and the speed of light.
+    - scripts.latencyHistogram: Provides the latency histograms.
+
+Classes:
+    - DetectionLatency: Measures detection latency per movement label against ground truth.
+    - MotionDetector: Classifies the movement of many links from streaming CSI.
+"""
+
+import time
+import numpy as np
+from scripts.csiGenerator import MOVEMENT_SPEEDS, SPEED_OF_LIGHT
+from scripts.latencyHistogram import LatencyHistogram
+
+# Movement labels in WiFiSimulator order; detector codes index into this tuple
+MOVEMENT_LABELS = tuple(MOVEMENT_SPEEDS)
+
+class DetectionLatency:
+    """
+    Measures the end-to-end latency of movement detections against the true movement of every link.
+
+    A movement event starts on the frame where a link's true movement changes. It is detected on the first later
+    frame where the detector reports the same label, and missed if the true movement changes again first.
+
+    Attributes:
+        histograms (dict): A LatencyHistogram per movement label.
+        missed (dict): The number of missed events per movement label.
+        budget (float): The latency budget in seconds reported against, or None.
+    """
+
+    def __init__(self, n_links, budget=None):
+        """
+        Initializes the DetectionLatency.
+
+        Args:
+            n_links (int): The number of links observed.
+            budget (float, optional): The latency budget in seconds, e.g. for falls.
+        """
+        self.histograms = {label: LatencyHistogram() for label in MOVEMENT_LABELS}
+        self.missed = dict.fromkeys(MOVEMENT_LABELS, 0)
+        self.budget = budget
+        self._truth = None
+        self._onset = np.zeros(n_links)
+        self._pending = np.zeros(n_links, dtype=bool)
+
+    def observe(self, truth, detected, frame_time, processing_seconds=0.0):
+        """
+        Observes one frame of every link.
+
+        Args:
+            truth (numpy.ndarray): The true movement code of every link.
+            detected (numpy.ndarray): The detected movement code of every link.
+            frame_time (float): The stream time of the frame in seconds.
+            processing_seconds (float): The time spent processing the frame.
+        """
+        truth = np.asarray(truth)
+        if self._truth is None:
+            self._truth = truth.copy()
+        changed = truth != self._truth
+        lost = changed & self._pending
+        if lost.any():
+            codes, counts = np.unique(self._truth[lost], return_counts=True)
+            for code, count in zip(codes.tolist(), counts.tolist()):
+                self.missed[MOVEMENT_LABELS[code]] += count
+        self._truth[changed] = truth[changed]
+        self._onset[changed] = frame_time
+        self._pending |= changed
+        hits = self._pending & (detected == truth)
+        if hits.any():
+            latencies = frame_time - self._onset[hits] + processing_seconds
+            codes = truth[hits]
+            for code in np.unique(codes).tolist():
+                self.histograms[MOVEMENT_LABELS[code]].record(latencies[codes == code])
+            self._pending[hits] = False
+
+    def report(self, quantiles=(0.5, 0.99)):
+        """
+        Summarizes the detection latency of every movement label with at least one event.
+
+        Args:
+            quantiles (tuple): The latency quantiles to report.
+
+        Returns:
+            dict: Per label, the number of detected and missed events, the quantile bounds, the maximum and,
+                  with a budget, the fraction of detections within it.
+        """
+        report = {}
+        for label, histogram in self.histograms.items():
+            if not len(histogram) and not self.missed[label]:
+                continue
+            entry = {'detected': len(histogram), 'missed': self.missed[label], 'max': histogram.maximum}
+            entry.update({f"p{round(q * 100):g}": histogram.quantile(q) for q in quantiles})
+            if self.budget is not None:
+                entry['within_budget'] = histogram.fraction_within(self.budget)
+            report[label] = entry
+        return report
+
+class MotionDetector:
+    """
+    Classifies the movement of many links from streaming CSI frames.
+
+    Sampling must be fast enough for the fastest movement's Doppler frequency to stay distinct after aliasing;
+    the expected frequency of every label is folded at the sample rate before matching.
+
+    Attributes:
+        n_links (int): The number of links processed together.
+        sample_rate (float): The frames per second of every link.
+        window (int): The window length in frames; detections lag movement onsets by about this much.
+        motion_threshold (float): The Doppler power, relative to the mean amplitude power, above which a link
+                                  is moving.
+        samples (int): The number of frames received so far.
+    """
+
+    def __init__(self, n_links=1, sample_rate=100, window_seconds=0.25, carrier_frequency=5.32e9,
+                 motion_threshold=1e-3):
+        """
+        Initializes the MotionDetector.
+
+        Args:
+            n_links (int): The number of links processed together.
+            sample_rate (float): The frames per second of every link.
+            window_seconds (float): The window over which motion statistics are computed.
+            carrier_frequency (float): The carrier frequency in Hz, which converts Doppler to speed.
+            motion_threshold (float): The relative Doppler power above which a link is moving.
+        """
+        self.n_links = n_links
+        self.sample_rate = sample_rate
+        self.window = max(int(round(window_seconds * sample_rate)), 3)
+        self.motion_threshold = motion_threshold
+        self.samples = 0
+        self._wavelength = SPEED_OF_LIGHT / carrier_frequency
+        # Doppler frequency of every moving label as observed after aliasing at the sample rate
+        doppler = np.array([MOVEMENT_SPEEDS[label] / self._wavelength for label in MOVEMENT_LABELS[1:]])
+        self._expected = sample_rate / 2 - np.abs(np.mod(doppler, sample_rate) - sample_rate / 2)
+        self._ring = None
+        self._sums = None
+        self._codes = np.zeros(n_links, dtype=np.uint8)
+
+    @property
+    def ready(self):
+        """
+        bool: Whether a full window has been received, so that detections are available.
+        """
+        return self.samples >= self.window
+
+    def update(self, frame):
+        """
+        Adds one frame of every link and classifies every link's movement.
+
+        Args:
+            frame (numpy.ndarray): The CSI of every link, of shape (n_links, antennas, subcarriers), or its
+                                   amplitudes of shape (n_links, streams).
+
+        Returns:
+            numpy.ndarray: The movement code of every link, indexing MOVEMENT_LABELS; 'None' until ready.
+        """
+        x = np.abs(frame).reshape(self.n_links, -1)
+        if self._ring is None:
+            self._ring = np.zeros((self.window + 1,) + x.shape)
+            self._sums = np.zeros((3,) + x.shape)
+        ring = self._ring
+        size = len(ring)
+        t = self.samples % size
+        previous = ring[(t - 1) % size]
+        before = ring[(t - 2) % size]
+        # The sample leaving the window, and the two after it, which it formed lag-1 and lag-2 pairs with
+        leaving = ring[(t - self.window) % size]
+        after = ring[(t - self.window + 1) % size]
+        after_next = ring[(t - self.window + 2) % size]
+        sums = self._sums
+        sums[0] += x - leaving
+        sums[1] += x * previous - after * leaving
+        sums[2] += x * before - after_next * leaving
+        ring[t] = x
+        self.samples += 1
+        if self.samples % self.window == 0:
+            self._refresh()
+        if self.ready:
+            self._classify()
+        return self._codes
+
+    def speeds(self):
+        """
+        Estimates every link's Doppler speed from the current window, folded at the sample rate.
+
+        Returns:
+            numpy.ndarray: The speeds in m/s.
+        """
+        frequency, _ = self._doppler()
+        return frequency * self._wavelength
+
+    def process(self, frames, truth=None, monitor=None):
+        """
+        Runs consecutive frames through update, timing each one and reporting it to a latency monitor.
+
+        Args:
+            frames (numpy.ndarray): Frames of shape (n_frames, n_links, ...), or an iterable of frames.
+            truth (numpy.ndarray, optional): The true movement codes of shape (n_frames, n_links).
+            monitor (DetectionLatency, optional): The monitor receiving truth, detections and timings.
+
+        Returns:
+            numpy.ndarray: The detected movement codes of shape (n_frames, n_links).
+        """
+        detections = []
+        for i, frame in enumerate(frames):
+            started = time.perf_counter()
+            codes = self.update(frame)
+            elapsed = time.perf_counter() - started
+            if monitor is not None:
+                monitor.observe(truth[i], codes, self.samples / self.sample_rate, elapsed)
+            detections.append(codes.copy())
+        return np.array(detections).reshape(-1, self.n_links)
+
+    def _doppler(self):
+        # Autocovariances at lags 1 and 2 summed over streams; for a sinusoid of power A in white noise,
+        # R1 = A cos(w) and R2 = A cos(2w), which gives A and w without the noise power
+        n = self.window
+        sums = self._sums
+        mean = sums[0] / n
+        square = mean * mean
+        r1 = (sums[1] / (n - 1) - square).sum(axis=1)
+        r2 = (sums[2] / (n - 2) - square).sum(axis=1)
+        power = (np.sqrt(r2 * r2 + 8 * r1 * r1) - r2) / 2
+        cosine = np.clip(np.divide(r1, power, out=np.ones_like(r1), where=power > 0), -1, 1)
+        frequency = np.arccos(cosine) * self.sample_rate / (2 * np.pi)
+        return frequency, power / np.maximum(square.sum(axis=1), np.finfo(float).tiny)
+
+    def _classify(self):
+        frequency, relative_power = self._doppler()
+        nearest = np.argmin(np.abs(frequency[:, None] - self._expected[None, :]), axis=1) + 1
+        self._codes[:] = np.where(relative_power > self.motion_threshold, nearest, 0)
+
+    def _refresh(self):
+        # Recompute the sums exactly from the window so that rounding errors cannot accumulate
+        size = len(self._ring)
+        t = self.samples % size
+        window = self._ring[(t - self.window + np.arange(self.window)) % size]
+        self._sums[0] = window.sum(axis=0)
+        self._sums[1] = (window[1:] * window[:-1]).sum(axis=0)
+        self._sums[2] = (window[2:] * window[:-2]).sum(axis=0)
@@ -0,0 +1,204 @@
+"""
+Output Sinks
+
+Author: Louis H
+Date: 2026-10-18
+
+This module provides the sinks that all simulator output is routed through. Simulators emit structured events
+(an event name and a dict of fields) instead of printing, and the sink decides what to do with them: print them
+to the console as before, drop them, buffer them into a text or JSON-lines file, or keep the most recent ones in
+memory. Formatting happens inside the sink, so a NullSink or RingBufferSink never pays for building strings.
+
+Modules:
+    - abc: Provides the abstract base class of the sinks.
+    - collections: Provides the bounded deque behind the ring buffer.
+    - json: Provides JSON-lines serialization.
+
+Classes:
+    - OutputSink: The interface shared by all sinks.
+    - ConsoleSink: Prints every event, matching the simulators' original console output.
+    - NullSink: Discards every event.
+    - BufferedFileSink: Writes formatted events to a text file in batches.
+    - JsonLinesSink: Writes events to a JSON-lines file in batches.
+    - RingBufferSink: Keeps the most recent events in memory.
+
+Functions:
+    - format_event: Formats an event as the console line the simulators used to print.
+"""
+
+import abc
+import collections
+import json
+
+# Console formats of the events emitted by the simulators
+EVENT_FORMATS = {
+    'wifi_reading': "Detected signal: {signal}, Movement: {movement}, Breathing: {breathing}",
+    'environment_reading': "Simulated temperature: {temperature}°C, Humidity: {humidity}%",
+    'send': "Sending data: {data}",
+    'receive': "Received response: {response}",
+    'combined_reading': ("Temperature: {temperature}°C, Humidity: {humidity}%, Embedded Response: "
+                         "{embedded_response}, WiFi Signal: {signal}, Movement: {movement}"),
+    'performance': "WiFi Performance: {performance}",
+}
+
+def format_event(event, fields):
+    """
+    Formats an event as the console line the simulators used to print.
+
+    Args:
+        event (str): The event name.
+        fields (dict): The event fields.
+
+    Returns:
+        str: The formatted line.
+    """
+    template = EVENT_FORMATS.get(event)
+    if template is None:
+        return f"{event}: " + ", ".join(f"{key}={value}" for key, value in fields.items())
+    return template.format(**fields)
+
+class OutputSink(abc.ABC):
+    """
+    The interface shared by all sinks. Sinks are context managers that close themselves on exit.
+    """
+
+    @abc.abstractmethod
+    def emit(self, event, fields):
+        """
+        Receives one event.
+
+        Args:
+            event (str): The event name, e.g. 'send' or 'performance'.
+            fields (dict): The event fields.
+        """
+
+    def flush(self):
+        """
+        Writes out any buffered events.
+        """
+
+    def close(self):
+        """
+        Flushes and releases any resources held by the sink.
+        """
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class ConsoleSink(OutputSink):
+    """
+    A sink that prints every event, matching the simulators' original console output.
+    """
+
+    def emit(self, event, fields):
+        print(format_event(event, fields))
+
+class NullSink(OutputSink):
+    """
+    A sink that discards every event.
+    """
+
+    def emit(self, event, fields):
+        pass
+
+class BufferedFileSink(OutputSink):
+    """
+    A sink that writes formatted events to a text file, one line per event, in batches.
+
+    Attributes:
+        path (str): The output file path.
+        buffer_size (int): The number of events buffered before they are written.
+    """
+
+    def __init__(self, path, buffer_size=10000, mode='w'):
+        """
+        Initializes the BufferedFileSink and opens its file.
+
+        Args:
+            path (str): The output file path.
+            buffer_size (int): The number of events buffered before they are written.
+            mode (str): The file mode, 'w' to truncate or 'a' to append.
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self._file = open(path, mode, encoding='utf-8')
+        self._buffer = []
+
+    def emit(self, event, fields):
+        self._buffer.append(self._format(event, fields))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._buffer.append('')
+            self._file.write('\n'.join(self._buffer))
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __reduce__(self):
+        # An open file cannot follow a simulator into a worker process; the sender must give the copy its own sink
+        raise TypeError(f"{type(self).__name__} cannot be pickled; give worker copies their own sink")
+
+    def _format(self, event, fields):
+        return format_event(event, fields)
+
+class JsonLinesSink(BufferedFileSink):
+    """
+    A sink that writes events to a JSON-lines file in batches. Each line is an object holding the event name
+    under 'event' and the event fields.
+    """
+
+    def _format(self, event, fields):
+        return json.dumps({'event': event, **fields})
+
+class RingBufferSink(OutputSink):
+    """
+    A sink that keeps the most recent events in memory, discarding the oldest once full.
+
+    Attributes:
+        capacity (int): The maximum number of events kept.
+        total (int): The number of events received so far.
+    """
+
+    def __init__(self, capacity=10000):
+        """
+        Initializes the RingBufferSink.
+
+        Args:
+            capacity (int): The maximum number of events kept.
+        """
+        self.capacity = capacity
+        self.total = 0
+        self._events = collections.deque(maxlen=capacity)
+
+    def emit(self, event, fields):
+        self._events.append((event, fields))
+        self.total += 1
+
+    def events(self):
+        """
+        Returns the kept events, oldest first.
+
+        Returns:
+            list: (event, fields) tuples.
+        """
+        return list(self._events)
+
+    def messages(self):
+        """
+        Returns the kept events formatted as console lines, oldest first.
+
+        Returns:
+            list: The formatted lines.
+        """
+        return [format_event(event, fields) for event, fields in self._events]
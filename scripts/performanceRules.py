@@ -0,0 +1,382 @@
+"""
+Performance Rules
+
+Author: Louis H
+Date: 2026-10-18
+
+This module lets the CombinedSimulator's performance rules be configured per site instead of hard-coded. A rule
+set is an ordered list of rules, each naming a performance level and the conditions a sample must meet to get
+it: an inclusive [low, high] range for temperature and humidity and a set of allowed labels for signal,
+movement and embedded response. A condition left out matches anything. The first matching rule wins, and
+samples matching no rule get the default level.
+
+Rule sets are loaded from JSON, TOML or YAML files with the same structure, e.g. in JSON:
+
+    {"default": "Poor",
+     "rules": [{"label": "Excellent", "signal": ["Strong"], "temperature": [20, 30], ...}, ...]}
+
+Every rule set is compiled once when it is created. Scalar classification runs a generated function whose
+body is the if/elif chain the rules describe, so it costs the same as hand-written code, and array evaluation
+turns every label set into a boolean table indexed by categorical codes. The simulator's PerformanceTable
+recompiles its lookup table whenever the simulator's rule set is replaced, which a RuleReloader does when the
+rule file changes on disk, so a site's rules can be updated without a restart.
+
+Modules:
+    - json, tomllib, yaml: Parse rule files; yaml (PyYAML) is optional and only needed for YAML files.
+    - math: Checks that range bounds are finite.
+    - os: Provides file modification times for hot reloading.
+    - numpy: Provides the array evaluation of the rules.
+
+Classes:
+    - PerformanceRules: An ordered, compiled set of performance rules.
+    - RuleReloader: Reloads a simulator's rules when their file changes.
+
+Functions:
+    - membership: Marks the categorical codes whose label is in a label set.
+"""
+
+import json
+import math
+import os
+import numpy as np
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# Performance levels in default rule order; label codes index into this tuple
+PERFORMANCE_LABELS = ('Excellent', 'Ideal', 'Optimized', 'Poor')
+# Conditions a rule may set, with their kind
+RANGE_CONDITIONS = ('temperature', 'humidity')
+LABEL_CONDITIONS = ('signal', 'movement', 'response')
+
+# The rules the CombinedSimulator has always applied
+DEFAULT_RULES = {
+    'default': 'Poor',
+    'rules': [
+        {'label': 'Excellent', 'signal': ['Strong'], 'temperature': [20, 30], 'humidity': [30, 60],
+         'response': ['Acknowledge'], 'movement': ['None']},
+        {'label': 'Ideal', 'signal': ['Strong', 'Weak'], 'temperature': [10, 35], 'humidity': [20, 70],
+         'response': ['Acknowledge', 'Timeout'], 'movement': ['None', 'Walking']},
+        {'label': 'Optimized', 'signal': ['Strong', 'Weak'], 'temperature': [-10, 40], 'humidity': [0, 100],
+         'movement': ['None', 'Walking', 'Running']},
+    ],
+}
+
+def membership(codes, labels, wanted):
+    """
+    Returns a boolean mask marking the categorical codes whose label is in a label set.
+
+    Args:
+        codes (numpy.ndarray): Codes indexing labels.
+        labels (tuple): The label table the codes index into.
+        wanted (frozenset): The labels to mark.
+
+    Returns:
+        numpy.ndarray: The boolean mask, with the shape of codes.
+    """
+    table = np.fromiter((label in wanted for label in labels), dtype=bool, count=len(labels))
+    return table[codes]
+
+class PerformanceRules:
+    """
+    An ordered set of performance rules, compiled into a scalar classifier and an array evaluator.
+
+    Rule sets are immutable; to change a simulator's rules, replace its rule set.
+
+    Attributes:
+        rules (tuple): The rules in order, each a dict with a 'label' and its conditions; label conditions are
+                       frozensets and range conditions (low, high) tuples.
+        default (str): The level of samples matching no rule.
+        classify (callable): The compiled classifier, called as classify(temperature, humidity,
+                             embedded_response, signal, movement) and returning the performance level of the first
+                             matching rule, or the default level.
+    """
+
+    def __init__(self, rules, default='Poor'):
+        """
+        Initializes and compiles the PerformanceRules.
+
+        Args:
+            rules (list): The rules in order. Each is a dict with a 'label' from PERFORMANCE_LABELS and any of the
+                          conditions 'temperature' and 'humidity' as [low, high] inclusive ranges, and 'signal',
+                          'movement' and 'response' as lists of allowed labels.
+            default (str): The level of samples matching no rule.
+
+        Raises:
+            ValueError: If a rule is malformed.
+        """
+        if default not in PERFORMANCE_LABELS:
+            raise ValueError(f"Unknown performance level: {default}")
+        self.default = default
+        self.rules = tuple(self._parse(i, rule) for i, rule in enumerate(rules))
+        self.classify = self._compile()
+
+    def __getstate__(self):
+        # The generated classifier cannot be pickled; it is recompiled from the rules on unpickling
+        state = self.__dict__.copy()
+        del state['classify']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.classify = self._compile()
+
+    @classmethod
+    def from_dict(cls, config):
+        """
+        Builds a rule set from a parsed configuration.
+
+        Args:
+            config (dict): A dict with a 'rules' list and an optional 'default' level.
+
+        Returns:
+            PerformanceRules: The compiled rule set.
+        """
+        if not isinstance(config, dict):
+            raise ValueError("The configuration must be a mapping")
+        unknown = set(config) - {'rules', 'default'}
+        if unknown:
+            raise ValueError(f"Unknown configuration keys: {sorted(unknown)}")
+        if not isinstance(config.get('rules'), list):
+            raise ValueError("The configuration must have a list of rules")
+        return cls(config['rules'], config.get('default', 'Poor'))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a rule set from a JSON, TOML or YAML file, chosen by the file extension.
+
+        Args:
+            path (str): The rule file.
+
+        Returns:
+            PerformanceRules: The compiled rule set.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.json':
+            with open(path, encoding='utf-8') as file:
+                return cls.from_dict(json.load(file))
+        if extension == '.toml':
+            if tomllib is None:
+                raise ImportError("Loading TOML rule files requires Python 3.11 or later")
+            with open(path, 'rb') as file:
+                return cls.from_dict(tomllib.load(file))
+        if extension in ('.yaml', '.yml'):
+            if yaml is None:
+                raise ImportError("Loading YAML rule files requires PyYAML")
+            with open(path, encoding='utf-8') as file:
+                try:
+                    config = yaml.safe_load(file)
+                except yaml.YAMLError as error:
+                    raise ValueError(f"Invalid YAML rule file: {error}") from error
+            return cls.from_dict(config)
+        raise ValueError(f"Unsupported rule file type: {extension}")
+
+    @classmethod
+    def default_rules(cls):
+        """
+        Builds the rule set the CombinedSimulator applies unless configured otherwise.
+
+        Returns:
+            PerformanceRules: The compiled default rule set.
+        """
+        return cls.from_dict(DEFAULT_RULES)
+
+    def to_dict(self):
+        """
+        Returns the rule set as a configuration that from_dict accepts, e.g. to save it as JSON.
+
+        Returns:
+            dict: The configuration.
+        """
+        rules = []
+        for rule in self.rules:
+            config = {'label': rule['label']}
+            for condition in RANGE_CONDITIONS + LABEL_CONDITIONS:
+                if condition in rule:
+                    value = rule[condition]
+                    config[condition] = list(value) if condition in RANGE_CONDITIONS else sorted(value)
+            rules.append(config)
+        return {'default': self.default, 'rules': rules}
+
+    def check_labels(self, signals, movements, responses):
+        """
+        Checks that every label the rules allow is one the simulators can produce, which catches typos that
+        would otherwise make a rule silently never match.
+
+        Args:
+            signals (list): The WiFi simulator's signal strengths.
+            movements (list): The WiFi simulator's movements.
+            responses (list): The embedded simulator's responses.
+
+        Raises:
+            ValueError: If a rule allows an unknown label.
+        """
+        known = {'signal': set(signals), 'movement': set(movements), 'response': set(responses)}
+        for i, rule in enumerate(self.rules):
+            for condition in LABEL_CONDITIONS:
+                unknown = rule.get(condition, frozenset()) - known[condition]
+                if unknown:
+                    raise ValueError(f"Rule {i} allows unknown {condition} labels: {sorted(unknown)}")
+
+    def evaluate(self, temperature, humidity, response, signal, movement, responses, signals, movements):
+        """
+        Classifies arrays of inputs with boolean masks. Inputs broadcast against each other.
+
+        Args:
+            temperature (numpy.ndarray): Temperatures in degrees Celsius.
+            humidity (numpy.ndarray): Humidities in percent.
+            response (numpy.ndarray): Embedded response codes indexing responses.
+            signal (numpy.ndarray): Signal codes indexing signals.
+            movement (numpy.ndarray): Movement codes indexing movements.
+            responses (list): The label table of the response codes.
+            signals (list): The label table of the signal codes.
+            movements (list): The label table of the movement codes.
+
+        Returns:
+            numpy.ndarray: An array of label codes indexing PERFORMANCE_LABELS.
+        """
+        temperature = np.asarray(temperature)
+        humidity = np.asarray(humidity)
+        values = {'temperature': temperature, 'humidity': humidity}
+        codes = {'signal': (signal, signals), 'movement': (movement, movements), 'response': (response, responses)}
+        shape = np.broadcast(temperature, humidity, response, signal, movement).shape
+        result = np.full(shape, PERFORMANCE_LABELS.index(self.default), dtype=np.uint8)
+        # Assign in reverse rule order so earlier rules take precedence, as in an if/elif chain
+        for rule in reversed(self.rules):
+            matches = np.ones(shape, dtype=bool)
+            for condition in RANGE_CONDITIONS:
+                if condition in rule:
+                    low, high = rule[condition]
+                    matches &= (low <= values[condition]) & (values[condition] <= high)
+            for condition in LABEL_CONDITIONS:
+                if condition in rule:
+                    matches &= membership(*codes[condition], rule[condition])
+            result[matches] = PERFORMANCE_LABELS.index(rule['label'])
+        return result
+
+    @staticmethod
+    def _parse(i, rule):
+        if not isinstance(rule, dict) or rule.get('label') not in PERFORMANCE_LABELS:
+            raise ValueError(f"Rule {i} must have a label from {PERFORMANCE_LABELS}")
+        unknown = set(rule) - {'label'} - set(RANGE_CONDITIONS) - set(LABEL_CONDITIONS)
+        if unknown:
+            raise ValueError(f"Rule {i} has unknown conditions: {sorted(unknown)}")
+        parsed = {'label': rule['label']}
+        for condition in RANGE_CONDITIONS:
+            if condition in rule:
+                bounds = rule[condition]
+                # bool is an int and json accepts NaN and Infinity, so check for finite non-bool numbers
+                if (not isinstance(bounds, (list, tuple)) or len(bounds) != 2
+                        or not all(isinstance(bound, (int, float)) and not isinstance(bound, bool)
+                                   and math.isfinite(bound) for bound in bounds)
+                        or bounds[0] > bounds[1]):
+                    raise ValueError(f"Rule {i} {condition} must be an inclusive [low, high] range")
+                parsed[condition] = tuple(bounds)
+        for condition in LABEL_CONDITIONS:
+            if condition in rule:
+                labels = rule[condition]
+                if not isinstance(labels, (list, tuple)) or not all(isinstance(label, str) for label in labels):
+                    raise ValueError(f"Rule {i} {condition} must be a list of labels")
+                parsed[condition] = frozenset(labels)
+        return parsed
+
+    def _compile(self):
+        # Generate the if/elif chain as source. Only names are interpolated; the bounds, label sets and levels
+        # are bound as constants of the namespace, so file contents never become code
+        arguments = {'temperature': 'temperature', 'humidity': 'humidity', 'response': 'embedded_response',
+                     'signal': 'signal', 'movement': 'movement'}
+        namespace = {}
+        lines = ['def classify(temperature, humidity, embedded_response, signal, movement):']
+        for i, rule in enumerate(self.rules):
+            tests = []
+            for condition in ('signal', 'temperature', 'humidity', 'response', 'movement'):
+                if condition not in rule:
+                    continue
+                if condition in RANGE_CONDITIONS:
+                    namespace[f'low_{i}_{condition}'], namespace[f'high_{i}_{condition}'] = rule[condition]
+                    tests.append(f'low_{i}_{condition} <= {arguments[condition]} <= high_{i}_{condition}')
+                else:
+                    namespace[f'allowed_{i}_{condition}'] = rule[condition]
+                    tests.append(f'{arguments[condition]} in allowed_{i}_{condition}')
+            namespace[f'label_{i}'] = rule['label']
+            lines.append(f"    if {' and '.join(tests) or 'True'}:")
+            lines.append(f'        return label_{i}')
+        namespace['default'] = self.default
+        lines.append('    return default')
+        exec('\n'.join(lines), namespace)
+        return namespace['classify']
+
+class RuleReloader:
+    """
+    Reloads a simulator's performance rules whenever their file changes, so that a running site picks up new
+    rules without a restart.
+
+    A file that fails to load leaves the current rules in place and is retried once it changes again.
+
+    Attributes:
+        simulator (CombinedSimulator): The simulator whose rules are replaced.
+        path (str): The rule file.
+        reloads (int): The number of successful reloads.
+        error (Exception): The error of the latest failed load, or None if the latest load succeeded.
+    """
+
+    def __init__(self, simulator, path):
+        """
+        Initializes the RuleReloader and loads the rule file once.
+
+        Args:
+            simulator (CombinedSimulator): The simulator whose rules are replaced.
+            path (str): The rule file.
+        """
+        self.simulator = simulator
+        self.path = path
+        self.reloads = 0
+        self.error = None
+        self._modified = None
+        self.poll()
+
+    def poll(self):
+        """
+        Reloads the rules if the file changed since the latest check.
+
+        Returns:
+            bool: True if new rules were installed.
+        """
+        try:
+            modified = os.stat(self.path).st_mtime_ns
+        except OSError as error:
+            self.error = error
+            return False
+        if modified == self._modified:
+            return False
+        self._modified = modified
+        try:
+            self.simulator.load_rules(self.path)
+        except (OSError, ValueError, ImportError) as error:
+            self.error = error
+            return False
+        self.error = None
+        self.reloads += 1
+        return True
+
+    def schedule(self, scheduler, interval=5):
+        """
+        Registers periodic checks of the rule file on a discrete-event scheduler.
+
+        Args:
+            scheduler (EventScheduler): The scheduler to register on.
+            interval (float): The period in seconds between checks.
+
+        Returns:
+            list: The event handle.
+        """
+        return scheduler.schedule_periodic(interval, lambda scheduler: self.poll(),
+                                           start=scheduler.now() + interval)
@@ -0,0 +1,278 @@
+"""
+Performance Lookup Table
+
+Author: Louis H
+Date: 2026-10-18
+
+This module compiles the CombinedSimulator's performance rules into a dense lookup table. The simulator inputs
+form a small finite domain (signals x movements x responses x temperatures x humidities), so the rule chain is
+evaluated once over the whole domain and every later classification becomes a single indexed lookup.
+
+The table keeps a snapshot of the value lists and the rule set it was compiled from and rebuilds itself
+automatically when any of the simulators' lists change or the simulator's rules are replaced.
+
+Modules:
+    - numpy: Provides the dense table and vectorized gathers.
+    - scripts.sampling: Provides the weighted draws used to sample table cells.
+
+Classes:
+    - PerformanceTable: A compiled lookup table of performance label codes.
+"""
+
+import numpy as np
+from scripts.sampling import code_dtype, draw_weighted, value_table
+
+# Table entry for temperature or humidity values that lie between the listed values
+INVALID = 255
+
+class PerformanceTable:
+    """
+    A dense uint8 lookup table of performance label codes over the combined simulator's input domain.
+
+    The categorical axes are indexed by position in the simulators' value lists. The temperature and humidity
+    axes cover every integer from the smallest to the largest listed value, offset by the smallest one; integers
+    missing from the lists hold INVALID.
+
+    Attributes:
+        simulator (CombinedSimulator): The simulator whose rules and value lists are compiled.
+        table (numpy.ndarray): Label codes indexed by [signal, movement, response, temperature - temperature_min,
+                               humidity - humidity_min].
+        temperature_min (int): The temperature at offset 0 of the temperature axis.
+        humidity_min (int): The humidity at offset 0 of the humidity axis.
+    """
+
+    def __init__(self, simulator):
+        """
+        Initializes the PerformanceTable for a CombinedSimulator. The table is compiled lazily on first use.
+
+        Args:
+            simulator (CombinedSimulator): The simulator whose rules and value lists are compiled.
+        """
+        self.simulator = simulator
+        self.table = None
+        self.temperature_min = None
+        self.humidity_min = None
+        self._snapshot = None
+
+    def __getstate__(self):
+        # Ship the table uncompiled; it is rebuilt lazily, which keeps pickles for worker processes small
+        state = self.__dict__.copy()
+        state.update(table=None, _snapshot=None, _flat=None)
+        return state
+
+    def domain(self):
+        """
+        Returns the value lists spanning the table's axes, in axis order.
+
+        Returns:
+            tuple: The signals, movements, responses, temperatures and humidities lists.
+        """
+        wifi = self.simulator.wifi_simulator
+        environment = self.simulator.environmental_simulator
+        return (wifi.signals, wifi.movements, self.simulator.embedded_simulator.responses,
+                environment.temperatures, environment.humidities)
+
+    def is_current(self):
+        """
+        Checks whether the table was compiled from the simulators' current value lists and rules.
+
+        Returns:
+            bool: True if the table is up to date.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return False
+        signals, movements, responses, temperatures, humidities = self.domain()
+        return (self.simulator.rules is snapshot[5] and signals == snapshot[0] and movements == snapshot[1]
+                and responses == snapshot[2] and temperatures == snapshot[3] and humidities == snapshot[4])
+
+    def refresh(self):
+        """
+        Recompiles the table if any of the simulators' value lists or the rules changed since it was compiled.
+
+        Returns:
+            PerformanceTable: This table.
+        """
+        if not self.is_current():
+            self.compile()
+        return self
+
+    def compile(self):
+        """
+        Evaluates the simulator's rule chain once over the whole input domain.
+
+        Returns:
+            PerformanceTable: This table.
+        """
+        signals, movements, responses, temperatures, humidities = domain = self.domain()
+        self._signal_index = {label: i for i, label in enumerate(signals)}
+        self._movement_index = {label: i for i, label in enumerate(movements)}
+        self._response_index = {label: i for i, label in enumerate(responses)}
+        self.temperature_min, temperature_listed = self._value_axis(temperatures, 'temperature')
+        self.humidity_min, humidity_listed = self._value_axis(humidities, 'humidity')
+
+        axes = [np.arange(len(signals)), np.arange(len(movements)), np.arange(len(responses)),
+                np.arange(len(temperature_listed)) + self.temperature_min,
+                np.arange(len(humidity_listed)) + self.humidity_min]
+        signal, movement, response, temperature, humidity = [
+            axis.reshape([-1 if i == j else 1 for j in range(len(axes))]) for i, axis in enumerate(axes)]
+        table = self.simulator.evaluate_rules(temperature, humidity, response, signal, movement)
+        table[..., ~temperature_listed, :] = INVALID
+        table[..., ~humidity_listed] = INVALID
+
+        self.table = table
+        self._flat = table.ravel().tolist()
+        self._strides = [stride // table.itemsize for stride in table.strides]
+        self._snapshot = tuple(values[:] for values in domain) + (self.simulator.rules,)
+        return self
+
+    def lookup(self, temperature, humidity, embedded_response, signal, movement):
+        """
+        Classifies one sample given as labels and values.
+
+        Args:
+            temperature (int): The temperature in degrees Celsius.
+            humidity (int): The humidity in percent.
+            embedded_response (str): The embedded system response.
+            signal (str): The WiFi signal strength.
+            movement (str): The detected movement.
+
+        Returns:
+            int: The label code, or None if the sample lies outside the compiled domain.
+        """
+        self.refresh()
+        shape = self.table.shape
+        t = temperature - self.temperature_min
+        h = humidity - self.humidity_min
+        try:
+            if not (0 <= t < shape[3] and 0 <= h < shape[4]):
+                return None
+            s0, s1, s2, s3, _ = self._strides
+            code = self._flat[self._signal_index[signal] * s0 + self._movement_index[movement] * s1
+                              + self._response_index[embedded_response] * s2 + t * s3 + h]
+        except (KeyError, TypeError):
+            return None
+        return None if code == INVALID else code
+
+    def lookup_arrays(self, temperature, humidity, response, signal, movement):
+        """
+        Classifies arrays of samples with one gather from the table.
+
+        Categorical inputs are codes that index into the simulators' value lists. All inputs must have the
+        same length.
+
+        Args:
+            temperature (numpy.ndarray): Temperatures in degrees Celsius.
+            humidity (numpy.ndarray): Humidities in percent.
+            response (numpy.ndarray): Embedded response codes.
+            signal (numpy.ndarray): Signal codes.
+            movement (numpy.ndarray): Movement codes.
+
+        Returns:
+            numpy.ndarray: The label codes.
+
+        Raises:
+            ValueError: If any sample lies outside the compiled domain.
+        """
+        self.refresh()
+        shape = self.table.shape
+        strides = self._strides
+        columns = [(signal, 0), (movement, 0), (response, 0),
+                   (temperature, self.temperature_min), (humidity, self.humidity_min)]
+        # The table has well under 2**31 cells, so a 32-bit flat index halves the memory traffic
+        index = None
+        scratch = None
+        for axis, (values, offset) in enumerate(columns):
+            values = np.asarray(values)
+            if values.size and (values.min() < offset or values.max() >= offset + shape[axis]):
+                raise ValueError("A sample lies outside the compiled domain")
+            if index is None:
+                index = np.empty(values.shape, dtype=np.int32)
+                scratch = np.empty(values.shape, dtype=np.int32)
+                np.multiply(values, strides[axis], out=index, dtype=np.int32)
+            else:
+                np.multiply(values, strides[axis], out=scratch, dtype=np.int32)
+                index += scratch
+        index -= self.temperature_min * strides[3] + self.humidity_min * strides[4]
+        codes = self.table.ravel().take(index)
+        if codes.size and codes.max() == INVALID:
+            raise ValueError("A sample lies outside the compiled domain")
+        return codes
+
+    def joint_probabilities(self, signal, movement, response, temperature, humidity):
+        """
+        Computes the probability of every table cell from independent per-axis probabilities.
+
+        Args:
+            signal (numpy.ndarray): Probability of each entry of the signals list.
+            movement (numpy.ndarray): Probability of each entry of the movements list.
+            response (numpy.ndarray): Probability of each entry of the responses list.
+            temperature (numpy.ndarray): Probability of each entry of the temperatures list.
+            humidity (numpy.ndarray): Probability of each entry of the humidities list.
+
+        Returns:
+            numpy.ndarray: An array shaped like the table holding the probability of each cell.
+        """
+        self.refresh()
+        _, _, _, temperatures, humidities = self.domain()
+        shape = self.table.shape
+        # Fold list positions onto the dense value axes; repeated values accumulate their probability
+        temperature = np.bincount(np.asarray(temperatures) - self.temperature_min, weights=temperature,
+                                  minlength=shape[3])
+        humidity = np.bincount(np.asarray(humidities) - self.humidity_min, weights=humidity, minlength=shape[4])
+        return np.multiply.outer(np.multiply.outer(np.multiply.outer(np.multiply.outer(
+            signal, movement), response), temperature), humidity)
+
+    def label_probabilities(self, joint, n_labels):
+        """
+        Computes the exact probability of every label code by summing the probabilities of its cells.
+
+        Args:
+            joint (numpy.ndarray): The cell probabilities returned by joint_probabilities.
+            n_labels (int): The number of label codes.
+
+        Returns:
+            numpy.ndarray: The probability of each label code.
+        """
+        return np.bincount(self.table.ravel(), weights=joint.ravel(), minlength=n_labels)[:n_labels]
+
+    def sample_cells(self, code, joint, n, rng=None):
+        """
+        Draws table cells holding one label code in proportion to their probability.
+
+        Args:
+            code (int): The label code to condition on.
+            joint (numpy.ndarray): The cell probabilities returned by joint_probabilities.
+            n (int): The number of cells to draw.
+            rng (RandomStream, optional): The stream to draw from.
+
+        Returns:
+            tuple: Signal, movement and response positions, temperatures and humidities of the drawn cells.
+
+        Raises:
+            ValueError: If the label has probability zero.
+        """
+        cells = np.flatnonzero(self.table.ravel() == code)
+        weights = joint.ravel()[cells]
+        if not weights.sum() > 0:
+            raise ValueError("Cannot sample a label with probability zero")
+        drawn = cells[draw_weighted(n, weights, rng)]
+        signal, movement, response, temperature, humidity = np.unravel_index(drawn, self.table.shape)
+        shape = self.table.shape
+        return (signal.astype(code_dtype(shape[0])), movement.astype(code_dtype(shape[1])),
+                response.astype(code_dtype(shape[2])),
+                value_table(np.arange(shape[3]) + self.temperature_min)[temperature],
+                value_table(np.arange(shape[4]) + self.humidity_min)[humidity])
+
+    @staticmethod
+    def _value_axis(values, name):
+        """
+        Returns the smallest listed value and a mask of which integers in the listed range appear in the list.
+        """
+        values = np.asarray(values)
+        if values.dtype.kind not in 'iu' or not values.size:
+            raise ValueError(f"The {name} list must be a non-empty list of integers")
+        minimum = int(values.min())
+        listed = np.zeros(int(values.max()) - minimum + 1, dtype=bool)
+        listed[values - minimum] = True
+        return minimum, listed
@@ -0,0 +1,306 @@
+"""
+Propagation
+
+Author: Louis H
+Date: 2026-10-18
+
+This module computes WiFi signal strength from geometry. A FloorPlan places access points in a rectangular
+building, and a PropagationModel predicts the RSSI of every access point at every device position with the
+log-distance path loss model:
+
+    RSSI = transmit power - L0 - 10 n log10(d / 1 m) + shadowing + fading
+
+where L0 is the free-space loss at 1 m for the carrier frequency and n the path loss exponent of the building.
+Shadowing by walls and furniture is a static random offset per access point and grid cell, so it is spatially
+correlated over the cell size and the same spot always sees the same obstacles. Fading is a small random offset
+redrawn for every reading of the link to a device's strongest access point. The signal strength labels of the
+WiFiSimulator follow from configurable dBm thresholds.
+
+A device only cares about its strongest access point. Within one grid cell the shadowing of an access point is
+constant, so bounds on its distance to the cell bound its RSSI, and every access point whose best case is below
+another's worst case can never be the strongest in that cell. These candidate lists are computed once per floor
+plan, and every later query only evaluates a device's candidates, with NumPy broadcasting over all devices at
+once.
+
+Modules:
+    - numpy: Provides the broadcast RSSI computations.
+    - scripts.csiGenerator: Provides the speed of light.
+    - scripts.sampling: Provides the module-wide random stream.
+
+Classes:
+    - FloorPlan: The access points of a rectangular building.
+    - PropagationModel: Predicts RSSI and signal strength labels from device positions.
+"""
+
+import numpy as np
+from scripts.csiGenerator import SPEED_OF_LIGHT
+from scripts.sampling import default_stream
+
+# Lowest RSSI in dBm of every signal strength label except the last, in WiFiSimulator.signals order
+DEFAULT_THRESHOLDS = {'Strong': -67.0, 'Weak': -80.0}
+
+class FloorPlan:
+    """
+    The access points of a rectangular building.
+
+    Attributes:
+        width (float): The extent of the building along x in metres.
+        height (float): The extent of the building along y in metres.
+        access_points (numpy.ndarray): The (x, y) position of every access point in metres.
+        tx_power (numpy.ndarray): The transmit power of every access point in dBm.
+    """
+
+    def __init__(self, width, height, access_points, tx_power=20.0):
+        """
+        Initializes the FloorPlan.
+
+        Args:
+            width (float): The extent of the building along x in metres.
+            height (float): The extent of the building along y in metres.
+            access_points (list): The (x, y) position of every access point in metres.
+            tx_power (float or list): The transmit power in dBm, one for all or one per access point.
+        """
+        self.width = float(width)
+        self.height = float(height)
+        self.access_points = np.asarray(access_points, dtype=np.float64).reshape(-1, 2)
+        if not len(self.access_points):
+            raise ValueError("A floor plan needs at least one access point")
+        self.tx_power = np.broadcast_to(np.asarray(tx_power, dtype=np.float64), len(self.access_points)).copy()
+
+    @classmethod
+    def grid(cls, width, height, spacing, tx_power=20.0):
+        """
+        Builds a floor plan with access points on a regular grid, as in a planned deployment.
+
+        Args:
+            width (float): The extent of the building along x in metres.
+            height (float): The extent of the building along y in metres.
+            spacing (float): The distance between neighbouring access points in metres.
+            tx_power (float): The transmit power of every access point in dBm.
+
+        Returns:
+            FloorPlan: The floor plan.
+        """
+        xs = np.arange(spacing / 2, width, spacing)
+        ys = np.arange(spacing / 2, height, spacing)
+        return cls(width, height, np.stack(np.meshgrid(xs, ys), axis=-1).reshape(-1, 2), tx_power)
+
+    def __len__(self):
+        return len(self.access_points)
+
+    def random_positions(self, n, rng=None):
+        """
+        Draws device positions uniformly over the building.
+
+        Args:
+            n (int): The number of positions.
+            rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+        Returns:
+            numpy.ndarray: An (n, 2) array of positions in metres.
+        """
+        generator = (rng or default_stream()).generator
+        return (generator.random((n, 2)) * (self.width, self.height)).astype(np.float32)
+
+class PropagationModel:
+    """
+    Predicts the RSSI of access points at device positions with log-distance path loss, spatially correlated
+    shadowing and per-reading fading, and converts it into signal strength labels.
+
+    Attributes:
+        floor_plan (FloorPlan): The building.
+        exponent (float): The path loss exponent, about 2 in free space and 3 to 4 indoors.
+        reference_loss (float): The path loss at 1 m in dB.
+        cell_size (float): The side of the grid cells sharing one shadowing value per access point, in metres.
+        fading (float): The standard deviation of the per-reading fading in dB.
+        thresholds (dict): The lowest RSSI in dBm of every label but the last.
+        labels (tuple): The signal strength labels, strongest first.
+        shadowing (numpy.ndarray): The shadowing of every access point in every grid cell in dB.
+    """
+
+    def __init__(self, floor_plan, frequency=2.4e9, exponent=3.0, shadowing=6.0, cell_size=10.0, fading=2.0,
+                 thresholds=None, labels=('Strong', 'Weak', 'No Signal'), rng=None):
+        """
+        Initializes the PropagationModel, draws the shadowing map and precomputes the candidate access points of
+        every grid cell.
+
+        Args:
+            floor_plan (FloorPlan): The building.
+            frequency (float): The carrier frequency in Hz, which sets the loss at 1 m.
+            exponent (float): The path loss exponent.
+            shadowing (float): The standard deviation of the shadowing in dB.
+            cell_size (float): The side of the shadowing grid cells in metres, about the correlation distance.
+            fading (float): The standard deviation of the per-reading fading in dB.
+            thresholds (dict, optional): The lowest RSSI in dBm of every label but the last. Defaults to
+                                         DEFAULT_THRESHOLDS.
+            labels (tuple): The signal strength labels, strongest first.
+            rng (RandomStream, optional): The stream drawing the shadowing map. Defaults to a module-wide stream.
+        """
+        thresholds = dict(DEFAULT_THRESHOLDS if thresholds is None else thresholds)
+        if list(thresholds) != list(labels[:-1]):
+            raise ValueError(f"thresholds must give a level for each of {list(labels[:-1])}, in order")
+        levels = np.array(list(thresholds.values()), dtype=np.float32)
+        if (np.diff(levels) >= 0).any():
+            raise ValueError("thresholds must decrease from the strongest label")
+        if exponent <= 0 or shadowing < 0 or fading < 0 or cell_size <= 0:
+            raise ValueError("Invalid propagation parameters")
+        self.floor_plan = floor_plan
+        self.exponent = exponent
+        self.reference_loss = 20 * np.log10(4 * np.pi * frequency / SPEED_OF_LIGHT)
+        self.cell_size = cell_size
+        self.fading = fading
+        self.thresholds = thresholds
+        self.labels = tuple(labels)
+        self._levels = levels
+        self._columns = max(1, int(np.ceil(floor_plan.width / cell_size)))
+        self._rows = max(1, int(np.ceil(floor_plan.height / cell_size)))
+        generator = (rng or default_stream()).generator
+        cells = self._columns * self._rows
+        self.shadowing = (shadowing * generator.standard_normal((len(floor_plan), cells))).astype(np.float32)
+        self._build_candidates()
+
+    def cells(self, positions):
+        """
+        Returns the grid cell of every position; positions outside the building fall into the nearest cell.
+
+        Args:
+            positions (numpy.ndarray): An (n, 2) array of positions in metres.
+
+        Returns:
+            numpy.ndarray: The cell index of every position.
+        """
+        positions = np.asarray(positions)
+        column = np.clip((positions[:, 0] / self.cell_size).astype(np.int64), 0, self._columns - 1)
+        row = np.clip((positions[:, 1] / self.cell_size).astype(np.int64), 0, self._rows - 1)
+        return row * self._columns + column
+
+    def rssi(self, positions):
+        """
+        Computes the RSSI of every access point at every position, without fading. Takes n times the number of
+        access points floats; use strongest for large fleets.
+
+        Args:
+            positions (numpy.ndarray): An (n, 2) array of positions in metres.
+
+        Returns:
+            numpy.ndarray: An (n, access points) float32 array of RSSI in dBm.
+        """
+        positions = np.asarray(positions, dtype=np.float32)
+        offsets = positions[:, None, :] - self.floor_plan.access_points.astype(np.float32)[None, :, :]
+        squared = np.maximum(np.einsum('ijk,ijk->ij', offsets, offsets), 1.0)
+        gain = (self.floor_plan.tx_power - self.reference_loss).astype(np.float32)
+        return gain + self.shadowing[:, self.cells(positions)].T - np.float32(5 * self.exponent) * np.log10(squared)
+
+    def strongest(self, positions, chunk_size=65536):
+        """
+        Finds the strongest access point at every position and its RSSI, without fading, evaluating only the
+        candidate access points of each position's grid cell. The candidates only hold inside their cell, so
+        positions outside the grid evaluate every access point.
+
+        Args:
+            positions (numpy.ndarray): An (n, 2) array of positions in metres.
+            chunk_size (int): The number of positions evaluated together, bounding the temporary arrays.
+
+        Returns:
+            tuple: The float32 RSSI in dBm and the index of the strongest access point of every position.
+        """
+        positions = np.asarray(positions, dtype=np.float32)
+        n = len(positions)
+        rssi = np.empty(n, dtype=np.float32)
+        best = np.empty(n, dtype=np.int64)
+        slope = np.float32(5 * self.exponent)
+        for start in range(0, n, chunk_size):
+            chunk = positions[start:start + chunk_size]
+            cells = self.cells(chunk)
+            dx = chunk[:, 0, None] - self._candidate_x[cells]
+            dy = chunk[:, 1, None] - self._candidate_y[cells]
+            squared = dx * dx
+            squared += dy * dy
+            np.maximum(squared, 1.0, out=squared)
+            np.log10(squared, out=squared)
+            squared *= -slope
+            squared += self._candidate_gain[cells]
+            column = squared.argmax(axis=1)
+            rows = np.arange(len(chunk))
+            rssi[start:start + chunk_size] = squared[rows, column]
+            best[start:start + chunk_size] = self._candidates[cells, column]
+            outside = np.flatnonzero((chunk[:, 0] < 0) | (chunk[:, 0] > self._columns * self.cell_size)
+                                     | (chunk[:, 1] < 0) | (chunk[:, 1] > self._rows * self.cell_size))
+            if len(outside):
+                full = self.rssi(chunk[outside])
+                strongest = full.argmax(axis=1)
+                rssi[start + outside] = full[np.arange(len(outside)), strongest]
+                best[start + outside] = strongest
+        return rssi, best
+
+    def classify(self, rssi):
+        """
+        Converts RSSI into signal strength codes with the thresholds.
+
+        Args:
+            rssi (numpy.ndarray): RSSI in dBm.
+
+        Returns:
+            numpy.ndarray: The uint8 code of every RSSI, indexing labels.
+        """
+        rssi = np.asarray(rssi)
+        codes = np.zeros(rssi.shape, dtype=np.uint8)
+        for level in self._levels:
+            codes += rssi < level
+        return codes
+
+    def signal_codes(self, positions, rng=None):
+        """
+        Draws one reading of the signal strength at every position: the RSSI of the strongest access point plus
+        fading, converted into codes.
+
+        Args:
+            positions (numpy.ndarray): An (n, 2) array of positions in metres.
+            rng (RandomStream, optional): The stream drawing the fading. Defaults to a module-wide stream.
+
+        Returns:
+            numpy.ndarray: The uint8 code of every reading, indexing labels.
+        """
+        rssi, _ = self.strongest(positions)
+        if self.fading:
+            generator = (rng or default_stream()).generator
+            rssi += self.fading * generator.standard_normal(len(rssi), dtype=np.float32)
+        return self.classify(rssi)
+
+    def _build_candidates(self, block=256):
+        # An access point is a candidate for a cell unless its RSSI anywhere in the cell is below the RSSI that
+        # some access point reaches everywhere in the cell. Candidate lists are padded to one width with a
+        # dummy access point of RSSI -inf.
+        plan = self.floor_plan
+        ap_x, ap_y = plan.access_points[:, 0, None], plan.access_points[:, 1, None]
+        gain = plan.tx_power[:, None] - self.reference_loss
+        slope = 5 * self.exponent
+        cells = np.arange(self._columns * self._rows)
+        candidates = []
+        for start in range(0, len(cells), block):
+            chunk = cells[start:start + block]
+            x0 = (chunk % self._columns) * self.cell_size
+            y0 = (chunk // self._columns) * self.cell_size
+            x1, y1 = x0 + self.cell_size, y0 + self.cell_size
+            near_x = np.maximum(np.maximum(x0 - ap_x, ap_x - x1), 0.0)
+            near_y = np.maximum(np.maximum(y0 - ap_y, ap_y - y1), 0.0)
+            far_x = np.maximum(np.abs(ap_x - x0), np.abs(ap_x - x1))
+            far_y = np.maximum(np.abs(ap_y - y0), np.abs(ap_y - y1))
+            offset = gain + self.shadowing[:, chunk]
+            best_case = offset - slope * np.log10(np.maximum(near_x ** 2 + near_y ** 2, 1.0))
+            worst_case = offset - slope * np.log10(np.maximum(far_x ** 2 + far_y ** 2, 1.0))
+            floor = worst_case.max(axis=0)
+            candidates.extend(np.flatnonzero(column) for column in (best_case >= floor).T)
+        width = max(map(len, candidates))
+        dummy = len(plan)
+        self._candidates = np.full((len(cells), width), dummy, dtype=np.int64)
+        for cell, members in enumerate(candidates):
+            self._candidates[cell, :len(members)] = members
+        padded_x = np.append(plan.access_points[:, 0], 0.0).astype(np.float32)
+        padded_y = np.append(plan.access_points[:, 1], 0.0).astype(np.float32)
+        padded_gain = np.append(gain[:, 0], -np.inf)
+        padded_shadowing = np.vstack([self.shadowing, np.zeros((1, len(cells)), dtype=np.float32)])
+        self._candidate_x = padded_x[self._candidates]
+        self._candidate_y = padded_y[self._candidates]
+        self._candidate_gain = (padded_gain[self._candidates]
+                                + padded_shadowing[self._candidates, cells[:, None]]).astype(np.float32)
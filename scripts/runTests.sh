@@ -3,7 +3,7 @@
 echo "======================== Running tests and generating Allure report... ========================"
 
 # Ensure dependencies are installed
-pip install pytest allure-pytest behave
+pip install pytest allure-pytest behave numpy
 
 # Set PYTHONPATH
 export PYTHONPATH=$(pwd)
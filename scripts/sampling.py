@@ -0,0 +1,238 @@
+"""
+Sampling Utilities
+
+Author: Louis H
+Date: 2026-10-18
+
+This module provides the sampling helpers shared by the simulators. Categorical values are drawn as compact
+integer codes that index into a simulator's own value list, so a batch of millions of samples is a small array
+instead of millions of Python strings. Every value list may have an optional list of weights; None means the
+values are drawn uniformly.
+
+Each simulator owns a RandomStream, so runs are reproducible from a seed and threads never contend on a shared
+generator. Streams spawn independent, non-overlapping children through NumPy's SeedSequence, which lets large
+simulations be sharded across workers while every shard stays reproducible.
+
+Modules:
+    - random: Provides scalar random choices.
+    - numpy: Provides vectorized random number generation and seed sequences.
+
+Classes:
+    - RandomStream: A seedable stream pairing a random.Random with a NumPy Generator.
+
+Functions:
+    - make_stream: Builds a RandomStream from a seed, a generator or an existing stream.
+    - default_stream: Returns the module-wide stream used when no stream is given.
+    - code_dtype: Returns the smallest unsigned integer dtype able to index a value list.
+    - value_table: Converts a list of numeric values into a compact NumPy lookup array.
+    - probabilities: Returns the normalized probability of each entry of a value list.
+    - choose: Draws one value from a value list.
+    - draw_codes: Draws categorical codes from a value list.
+    - draw_weighted: Draws indices in proportion to arbitrary non-negative weights.
+    - jittered: Perturbs an interval by a random fraction of itself.
+"""
+
+import random
+import numpy as np
+
+class RandomStream:
+    """
+    A seedable random stream pairing a random.Random for scalar draws with a NumPy Generator for batch draws.
+
+    Attributes:
+        seed_sequence (numpy.random.SeedSequence): The seed sequence the stream and its children derive from.
+        random (random.Random): The generator used for scalar draws.
+        generator (numpy.random.Generator): The generator used for batch draws.
+    """
+
+    def __init__(self, source=None):
+        """
+        Initializes the RandomStream.
+
+        Args:
+            source: None for fresh OS entropy, an int seed, a numpy.random.SeedSequence, a random.Random or a
+                    numpy.random.Generator. An injected generator is used directly for its kind of draws; the
+                    other generator and all children are seeded from it.
+        """
+        if isinstance(source, random.Random):
+            self.seed_sequence = np.random.SeedSequence(source.getrandbits(128))
+        elif isinstance(source, np.random.Generator):
+            self.seed_sequence = np.random.SeedSequence(source.integers(0, 2**32, size=4).tolist())
+        elif isinstance(source, np.random.SeedSequence):
+            self.seed_sequence = source
+        else:
+            self.seed_sequence = np.random.SeedSequence(source)
+
+        # The first two children seed the stream's own generators; spawn() hands out the following ones
+        scalar_seed, batch_seed = self.seed_sequence.spawn(2)
+        if isinstance(source, random.Random):
+            self.random = source
+        else:
+            self.random = random.Random(int.from_bytes(scalar_seed.generate_state(4).tobytes(), 'little'))
+        if isinstance(source, np.random.Generator):
+            self.generator = source
+        else:
+            self.generator = np.random.default_rng(batch_seed)
+
+    def spawn(self, n):
+        """
+        Derives independent child streams, e.g. one per worker thread or process.
+
+        Children are statistically independent of each other and of the parent, and the k-th child of a stream
+        seeded with the same value is always the same stream.
+
+        Args:
+            n (int): The number of children.
+
+        Returns:
+            list: The child RandomStreams.
+        """
+        return [RandomStream(seed) for seed in self.seed_sequence.spawn(n)]
+
+def make_stream(rng=None):
+    """
+    Builds a RandomStream from a seed, a generator or an existing stream.
+
+    Args:
+        rng: A RandomStream, or anything accepted by RandomStream.
+
+    Returns:
+        RandomStream: The stream.
+    """
+    return rng if isinstance(rng, RandomStream) else RandomStream(rng)
+
+_default_stream = RandomStream()
+
+def default_stream():
+    """
+    Returns the module-wide stream that the helpers and models draw from when they are given no stream.
+
+    Returns:
+        RandomStream: The shared stream.
+    """
+    return _default_stream
+
+def code_dtype(size):
+    """
+    Returns the smallest unsigned integer dtype able to hold codes for a value list.
+
+    Args:
+        size (int): The number of values in the list.
+
+    Returns:
+        numpy.dtype: The dtype used for code arrays.
+    """
+    return np.min_scalar_type(max(size - 1, 0))
+
+def value_table(values):
+    """
+    Converts a list of numeric values into a compact NumPy lookup array.
+
+    Integer values are stored in the narrowest integer dtype that holds them, so indexing the table with a
+    code array yields a small value array.
+
+    Args:
+        values (list): The possible values.
+
+    Returns:
+        numpy.ndarray: The values as an array.
+    """
+    table = np.asarray(values)
+    if table.dtype.kind in 'iu' and table.size:
+        dtype = np.promote_types(np.min_scalar_type(table.min()), np.min_scalar_type(table.max()))
+        table = table.astype(dtype)
+    return table
+
+def probabilities(size, weights=None):
+    """
+    Returns the normalized probability of each entry of a value list.
+
+    Args:
+        size (int): The number of values in the list.
+        weights (list, optional): Relative weights of the values. Defaults to uniform.
+
+    Returns:
+        numpy.ndarray: The probabilities, summing to 1.
+    """
+    if size < 1:
+        raise ValueError("Cannot draw from an empty value list")
+    if weights is None:
+        return np.full(size, 1.0 / size)
+    weights = np.asarray(weights, dtype=float)
+    if weights.shape != (size,):
+        raise ValueError(f"Expected {size} weights, got {weights.size}")
+    if (weights < 0).any() or not weights.sum() > 0:
+        raise ValueError("Weights must be non-negative and not all zero")
+    return weights / weights.sum()
+
+def choose(values, weights=None, rng=None):
+    """
+    Draws one value from a value list.
+
+    Args:
+        values (list): The possible values.
+        weights (list, optional): Relative weights of the values. Defaults to uniform.
+        rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+    Returns:
+        object: The drawn value.
+    """
+    generator = (rng or _default_stream).random
+    if weights is None:
+        return generator.choice(values)
+    return generator.choices(values, weights=weights)[0]
+
+def draw_codes(n, size, weights=None, rng=None):
+    """
+    Draws categorical codes from a value list.
+
+    Args:
+        n (int): The number of codes to draw.
+        size (int): The number of values in the list.
+        weights (list, optional): Relative weights of the values. Defaults to uniform.
+        rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+    Returns:
+        numpy.ndarray: An array of n codes in the range [0, size).
+    """
+    if weights is None:
+        if size < 1:
+            raise ValueError("Cannot draw from an empty value list")
+        return (rng or _default_stream).generator.integers(0, size, size=n, dtype=code_dtype(size))
+    return draw_weighted(n, probabilities(size, weights), rng).astype(code_dtype(size))
+
+def draw_weighted(n, weights, rng=None):
+    """
+    Draws indices in proportion to arbitrary non-negative weights by inverting their cumulative sum.
+
+    Args:
+        n (int): The number of indices to draw.
+        weights (numpy.ndarray): Non-negative weights, not all zero.
+        rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+    Returns:
+        numpy.ndarray: An array of n indices into weights.
+    """
+    cumulative = np.cumsum(weights, dtype=float)
+    if not cumulative.size or not cumulative[-1] > 0:
+        raise ValueError("Weights must not all be zero")
+    uniforms = (rng or _default_stream).generator.random(n)
+    indices = np.searchsorted(cumulative, uniforms * cumulative[-1], side='right')
+    return np.minimum(indices, len(cumulative) - 1)
+
+def jittered(interval, jitter=0.0, rng=None):
+    """
+    Perturbs an interval uniformly by up to a fraction of itself, so that many devices drift apart instead of
+    firing in lockstep.
+
+    Args:
+        interval (float): The nominal interval in seconds.
+        jitter (float): The largest relative deviation, e.g. 0.1 for +/-10%.
+        rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+    Returns:
+        float: The perturbed interval.
+    """
+    if not jitter:
+        return interval
+    return interval * (1 + (rng or _default_stream).random.uniform(-jitter, jitter))
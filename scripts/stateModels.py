@@ -0,0 +1,375 @@
+"""
+State Models
+
+Author: Louis H
+Date: 2026-10-18
+
+This module provides temporal state models for the simulators. Without a model, every reading is drawn
+independently, so movement can jump from 'Falling' to 'Running' between two ticks and a temperature can swing
+across its whole range. A MarkovChain instead draws each categorical state from a distribution conditioned on the
+previous one, and a BoundedRandomWalk moves a numeric reading by a small step, reflected at its bounds.
+
+Every draw goes through an alias table (Vose's method), built once per distribution in O(k) for k outcomes. A
+draw then costs one uniform index, one uniform float and one comparison, O(1) whatever the number of states.
+The tables of all rows of a transition matrix are stacked into two arrays, so a batch step advances many
+independent chains, e.g. one per device, with a handful of vectorized operations.
+
+Models share one interface: advance(state, rng) draws an initial state when state is None and steps it
+otherwise, and advance_batch(n, states, rng) does the same for n independent chains.
+
+Modules:
+    - numpy: Provides the stacked alias tables and vectorized steps.
+    - scripts.sampling: Provides weight normalization, code dtypes and the module-wide random stream.
+
+Classes:
+    - AliasTable: Draws from a fixed discrete distribution in O(1).
+    - MarkovChain: A Markov chain over categorical codes with one alias table per state.
+    - BoundedRandomWalk: An integer random walk reflected at its bounds.
+"""
+
+import numpy as np
+from scripts.sampling import code_dtype, default_stream, probabilities, value_table
+
+class AliasTable:
+    """
+    Draws indices from a fixed discrete distribution in O(1) per draw with Vose's alias method.
+
+    Every column i keeps its own outcome with probability probability[i] and yields alias[i] otherwise.
+
+    Attributes:
+        size (int): The number of outcomes.
+        probability (numpy.ndarray): The probability of keeping each column's own outcome.
+        alias (numpy.ndarray): The outcome each column yields otherwise.
+    """
+
+    def __init__(self, weights):
+        """
+        Builds the table in O(size).
+
+        Args:
+            weights (list): Non-negative relative weights of the outcomes, not all zero.
+        """
+        self.size = len(weights)
+        scaled = probabilities(self.size, weights) * self.size
+        self.probability = np.ones(self.size)
+        self.alias = np.arange(self.size)
+        small = [i for i in range(self.size) if scaled[i] < 1.0]
+        large = [i for i in range(self.size) if scaled[i] >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Columns left over are full up to rounding error and keep their own outcome
+        self._scalar = (self.probability.tolist(), self.alias.tolist())
+
+    def draw(self, rng=None):
+        """
+        Draws one index.
+
+        Args:
+            rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+        Returns:
+            int: The drawn index.
+        """
+        generator = (rng or default_stream()).random
+        probability, alias = self._scalar
+        column = generator.randrange(self.size)
+        return column if generator.random() < probability[column] else alias[column]
+
+    def draw_batch(self, n, rng=None):
+        """
+        Draws n indices at once.
+
+        Args:
+            n (int): The number of indices.
+            rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+        Returns:
+            numpy.ndarray: The drawn indices.
+        """
+        generator = (rng or default_stream()).generator
+        columns = generator.integers(0, self.size, size=n)
+        keep = generator.random(n) < self.probability[columns]
+        return np.where(keep, columns, self.alias[columns]).astype(code_dtype(self.size))
+
+class MarkovChain:
+    """
+    A Markov chain over the codes of a value list, e.g. a simulator's movements.
+
+    Attributes:
+        size (int): The number of states.
+        transitions (numpy.ndarray): The row-normalized transition matrix; row i is the distribution of the
+                                     state following state i.
+        initial (AliasTable): The distribution of first states.
+    """
+
+    def __init__(self, transitions, initial=None):
+        """
+        Initializes the MarkovChain and builds one alias table per state.
+
+        Args:
+            transitions (list): A square matrix of non-negative relative weights; row i weights the states that
+                                may follow state i.
+            initial (list, optional): Relative weights of the first state. Defaults to the stationary
+                                      distribution, so that first states look like a chain that has been running.
+        """
+        matrix = np.asarray(transitions, dtype=float)
+        if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+            raise ValueError("transitions must be a square matrix")
+        self.size = len(matrix)
+        self.transitions = np.array([probabilities(self.size, row) for row in matrix])
+        tables = [AliasTable(row) for row in self.transitions]
+        self._probability = np.stack([table.probability for table in tables])
+        self._alias = np.stack([table.alias for table in tables]).astype(code_dtype(self.size))
+        self._tables = tables
+        self.initial = AliasTable(self.stationary() if initial is None else initial)
+
+    @classmethod
+    def sticky(cls, size, stay=0.9, weights=None):
+        """
+        Builds a chain that keeps its state with probability stay and otherwise redraws it from weights, so its
+        stationary distribution is weights.
+
+        Args:
+            size (int): The number of states.
+            stay (float): The probability of keeping the current state on top of redrawing it.
+            weights (list, optional): Relative weights of the redrawn state. Defaults to uniform.
+
+        Returns:
+            MarkovChain: The chain.
+        """
+        if not 0 <= stay < 1:
+            raise ValueError("stay must be in [0, 1)")
+        redraw = probabilities(size, weights)
+        return cls(stay * np.eye(size) + (1 - stay) * redraw[None, :], initial=redraw)
+
+    @classmethod
+    def from_mapping(cls, labels, transitions, initial=None):
+        """
+        Builds a chain from transition weights keyed by label. States without an entry keep their state, and
+        targets missing from an entry have weight zero.
+
+        Args:
+            labels (list): The value list the chain's codes index, e.g. a simulator's movements.
+            transitions (dict): Maps a label to a dict of next labels and their relative weights.
+            initial (dict, optional): Relative weights of the first labels. Defaults to the stationary
+                                      distribution.
+
+        Returns:
+            MarkovChain: The chain.
+        """
+        index = {label: i for i, label in enumerate(labels)}
+        unknown = (set(transitions) | {target for row in transitions.values() for target in row}
+                   | set(initial or ())) - set(index)
+        if unknown:
+            raise ValueError(f"Unknown labels: {sorted(map(str, unknown))}")
+        matrix = np.eye(len(labels))
+        for label, row in transitions.items():
+            matrix[index[label]] = 0.0
+            for target, weight in row.items():
+                matrix[index[label], index[target]] = weight
+        weights = None if initial is None else [initial.get(label, 0.0) for label in labels]
+        return cls(matrix, weights)
+
+    def stationary(self):
+        """
+        Computes the stationary distribution by solving pi P = pi with the entries of pi summing to 1.
+
+        Returns:
+            numpy.ndarray: The long-run probability of each state.
+        """
+        system = np.vstack([self.transitions.T - np.eye(self.size), np.ones(self.size)])
+        target = np.zeros(self.size + 1)
+        target[-1] = 1.0
+        solution = np.linalg.lstsq(system, target, rcond=None)[0]
+        solution = np.clip(solution, 0.0, None)
+        return solution / solution.sum()
+
+    def step(self, state, rng=None):
+        """
+        Draws the state following one state.
+
+        Args:
+            state (int): The current state code.
+            rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+        Returns:
+            int: The next state code.
+        """
+        return self._tables[state].draw(rng)
+
+    def step_batch(self, states, rng=None):
+        """
+        Advances many independent chains by one step.
+
+        Args:
+            states (numpy.ndarray): The current state code of every chain.
+            rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+        Returns:
+            numpy.ndarray: The next state code of every chain.
+        """
+        generator = (rng or default_stream()).generator
+        states = np.asarray(states)
+        columns = generator.integers(0, self.size, size=states.shape)
+        keep = generator.random(states.shape) < self._probability[states, columns]
+        return np.where(keep, columns, self._alias[states, columns]).astype(code_dtype(self.size))
+
+    def advance(self, state, rng=None):
+        """
+        Draws a first state when state is None and the following state otherwise.
+
+        Args:
+            state (int or None): The current state code.
+            rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+        Returns:
+            int: The new state code.
+        """
+        return self.initial.draw(rng) if state is None else self.step(state, rng)
+
+    def advance_batch(self, n, states=None, rng=None):
+        """
+        Draws n first states when states is None, and advances n independent chains by one step otherwise.
+
+        Args:
+            n (int): The number of chains.
+            states (numpy.ndarray, optional): The current state code of every chain.
+            rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+        Returns:
+            numpy.ndarray: The new state codes.
+        """
+        if states is None:
+            return self.initial.draw_batch(n, rng)
+        if len(states) != n:
+            raise ValueError(f"Expected {n} states, got {len(states)}")
+        return self.step_batch(states, rng)
+
+class BoundedRandomWalk:
+    """
+    A random walk over the integers from low to high. Each step adds an offset between -max_step and max_step,
+    and a walk leaving the range is reflected back into it.
+
+    Attributes:
+        low (int): The smallest value.
+        high (int): The largest value.
+        max_step (int): The largest change per step.
+        steps (AliasTable): The distribution of step offsets; index i is the offset i - max_step.
+        initial (AliasTable): The distribution of first values; index i is the value low + i.
+    """
+
+    def __init__(self, low, high, max_step=1, step_weights=None, initial=None):
+        """
+        Initializes the BoundedRandomWalk.
+
+        Args:
+            low (int): The smallest value.
+            high (int): The largest value.
+            max_step (int): The largest change per step.
+            step_weights (list, optional): Relative weights of the 2 * max_step + 1 offsets from -max_step to
+                                           max_step. Defaults to uniform.
+            initial (list, optional): Relative weights of the first values from low to high. Defaults to
+                                      uniform.
+        """
+        if high < low:
+            raise ValueError("high must not be below low")
+        if not 0 <= max_step <= high - low:
+            raise ValueError("max_step must be between 0 and high - low")
+        self.low = low
+        self.high = high
+        self.max_step = max_step
+        self.steps = AliasTable(np.ones(2 * max_step + 1) if step_weights is None else step_weights)
+        if self.steps.size != 2 * max_step + 1:
+            raise ValueError(f"Expected {2 * max_step + 1} step weights, got {self.steps.size}")
+        self.initial = AliasTable(np.ones(high - low + 1) if initial is None else initial)
+        self._dtype = value_table([low, high]).dtype
+
+    @classmethod
+    def over(cls, values, max_step=1, step_weights=None, weights=None):
+        """
+        Builds a walk over the range of a simulator's value list, e.g. its temperatures.
+
+        Args:
+            values (list): Consecutive integer values, e.g. list(range(-10, 41)).
+            max_step (int): The largest change per step.
+            step_weights (list, optional): Relative weights of the offsets from -max_step to max_step.
+            weights (list, optional): Relative weights of the values as first values, e.g. the simulator's own.
+
+        Returns:
+            BoundedRandomWalk: The walk.
+        """
+        low, high = min(values), max(values)
+        if sorted(values) != list(range(low, high + 1)):
+            raise ValueError("values must be consecutive integers")
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float)[np.argsort(values)]
+        return cls(low, high, max_step, step_weights, weights)
+
+    def step(self, value, rng=None):
+        """
+        Moves one value by one step.
+
+        Args:
+            value (int): The current value.
+            rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+        Returns:
+            int: The next value.
+        """
+        value += self.steps.draw(rng) - self.max_step
+        if value > self.high:
+            return 2 * self.high - value
+        if value < self.low:
+            return 2 * self.low - value
+        return value
+
+    def step_batch(self, values, rng=None):
+        """
+        Moves many independent walks by one step.
+
+        Args:
+            values (numpy.ndarray): The current value of every walk.
+            rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+        Returns:
+            numpy.ndarray: The next value of every walk.
+        """
+        values = np.asarray(values, dtype=np.int64) + self.steps.draw_batch(len(values), rng) - self.max_step
+        values = np.where(values > self.high, 2 * self.high - values, values)
+        values = np.where(values < self.low, 2 * self.low - values, values)
+        return values.astype(self._dtype)
+
+    def advance(self, value, rng=None):
+        """
+        Draws a first value when value is None and steps it otherwise.
+
+        Args:
+            value (int or None): The current value.
+            rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+        Returns:
+            int: The new value.
+        """
+        return self.low + self.initial.draw(rng) if value is None else self.step(value, rng)
+
+    def advance_batch(self, n, values=None, rng=None):
+        """
+        Draws n first values when values is None, and moves n independent walks by one step otherwise.
+
+        Args:
+            n (int): The number of walks.
+            values (numpy.ndarray, optional): The current value of every walk.
+            rng (RandomStream, optional): The stream to draw from. Defaults to a module-wide stream.
+
+        Returns:
+            numpy.ndarray: The new values.
+        """
+        if values is None:
+            return (self.low + self.initial.draw_batch(n, rng).astype(np.int64)).astype(self._dtype)
+        if len(values) != n:
+            raise ValueError(f"Expected {n} values, got {len(values)}")
+        return self.step_batch(values, rng)
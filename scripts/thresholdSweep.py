@@ -0,0 +1,288 @@
+"""
+Threshold Sweep
+
+Author: Louis H
+Date: 2026-10-18
+
+This module evaluates how the performance label distribution responds to the temperature and humidity windows
+of the performance rules. A sweep takes a grid of values for any of the window bounds, e.g. the low and high
+temperature of the Excellent rule, and classifies one shared sample set under the rules of every grid point.
+
+Reclassifying every sample at every grid point would cost O(points x samples). Instead, the samples are split
+once into groups by which rules their categorical inputs (signal, movement, response) satisfy, and each group is
+reduced to a summed-area table over its sorted temperature and humidity values. The number of samples of a group
+inside any temperature x humidity window is then four lookups in that table. A rule's label count is the count
+inside its window minus the part already claimed by earlier rules, which inclusion-exclusion turns into counts
+inside intersections of windows, themselves windows. Every grid point therefore costs O(groups x 2^rules)
+lookups whatever the sample count, and all grid points are evaluated at once with broadcasting. Large sweeps are
+split into chunks of grid points across a process pool.
+
+Modules:
+    - os: Provides the CPU count used as the default pool size.
+    - itertools: Enumerates the rule subsets of the inclusion-exclusion sums.
+    - concurrent.futures: Provides the process pool.
+    - numpy: Provides the summed-area tables and broadcast lookups.
+    - scripts.performanceRules: Provides the rule conditions, performance labels and label-set masks.
+    - scripts.combinedSimulation: Provides the sample batch container.
+
+Classes:
+    - SweepResult: The label distribution of every grid point, as a table for plotting.
+    - ThresholdSweep: Evaluates threshold grids on a shared sample set.
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scripts.combinedSimulation import CombinedSampleBatch
+from scripts.performanceRules import LABEL_CONDITIONS, PERFORMANCE_LABELS, RANGE_CONDITIONS, membership
+
+def _count_chunk(tables, axes, terms, default, bounds):
+    """
+    Counts the samples per label for a chunk of grid points.
+
+    Args:
+        tables (numpy.ndarray): The zero-padded summed-area table of every group, of shape (groups, T + 1, H + 1).
+        axes (tuple): The sorted distinct temperatures and humidities of the samples.
+        terms (list): (label code, sign, eligible groups, rule indices) of every inclusion-exclusion term.
+        default (tuple): The default label code and the number of samples in every group.
+        bounds (numpy.ndarray): The window bounds of every rule per grid point, of shape (points, rules, 4) as
+                                (temperature low, temperature high, humidity low, humidity high).
+
+    Returns:
+        numpy.ndarray: The number of samples per label for every grid point, of shape (points, labels).
+    """
+    temperatures, humidities = axes
+    default_code, sizes = default
+    counts = np.zeros((len(bounds), len(PERFORMANCE_LABELS)), dtype=np.int64)
+    for code, sign, eligible, rules in terms:
+        # The intersection of the rules' windows, as index ranges [start, stop) into the sorted axes
+        window = bounds[:, rules]
+        t_start = np.searchsorted(temperatures, window[..., 0].max(axis=1), side='left')
+        t_stop = np.maximum(np.searchsorted(temperatures, window[..., 1].min(axis=1), side='right'), t_start)
+        h_start = np.searchsorted(humidities, window[..., 2].max(axis=1), side='left')
+        h_stop = np.maximum(np.searchsorted(humidities, window[..., 3].min(axis=1), side='right'), h_start)
+        inside = (tables[:, t_stop, h_stop] - tables[:, t_start, h_stop] - tables[:, t_stop, h_start]
+                  + tables[:, t_start, h_start])
+        counts[:, code] += sign * (eligible @ inside)
+    counts[:, default_code] += sizes.sum() - counts.sum(axis=1)
+    return counts
+
+class SweepResult:
+    """
+    The label distribution of every point of a threshold grid.
+
+    Attributes:
+        parameters (tuple): The swept parameter names, e.g. 'Excellent.temperature.low'.
+        shape (tuple): The grid shape, one axis per parameter.
+        values (dict): Each parameter's value at every grid point, flattened in C order.
+        counts (numpy.ndarray): The number of samples per label at every grid point, of shape (points, labels).
+        samples (int): The number of samples in the shared set.
+    """
+
+    def __init__(self, parameters, shape, values, counts, samples):
+        """
+        Initializes the SweepResult.
+        """
+        self.parameters = tuple(parameters)
+        self.shape = tuple(shape)
+        self.values = values
+        self.counts = counts
+        self.samples = samples
+
+    def __len__(self):
+        return len(self.counts)
+
+    @property
+    def fractions(self):
+        """
+        numpy.ndarray: The fraction of samples per label at every grid point.
+        """
+        return self.counts / max(self.samples, 1)
+
+    def grid(self, label):
+        """
+        Returns one label's fraction at every grid point as an array shaped like the grid, e.g. for a heatmap.
+
+        Args:
+            label (str): The performance level.
+
+        Returns:
+            numpy.ndarray: The fractions, one axis per parameter.
+        """
+        return self.fractions[:, PERFORMANCE_LABELS.index(label)].reshape(self.shape)
+
+    def best(self, label, maximize=True):
+        """
+        Finds the grid point with the largest or smallest fraction of one label.
+
+        Args:
+            label (str): The performance level.
+            maximize (bool): Whether to find the largest fraction instead of the smallest.
+
+        Returns:
+            dict: The parameter values of the point and the label's fraction as 'fraction'.
+        """
+        column = self.fractions[:, PERFORMANCE_LABELS.index(label)]
+        i = int(np.argmax(column) if maximize else np.argmin(column))
+        point = {name: self.values[name][i].item() for name in self.parameters}
+        point['fraction'] = column[i].item()
+        return point
+
+    def to_records(self):
+        """
+        Returns the result as one structured array row per grid point, with a column per parameter and one
+        fraction column per label.
+
+        Returns:
+            numpy.ndarray: The table.
+        """
+        dtype = ([(name, self.values[name].dtype) for name in self.parameters]
+                 + [(label, np.float64) for label in PERFORMANCE_LABELS])
+        table = np.empty(len(self), dtype=dtype)
+        for name in self.parameters:
+            table[name] = self.values[name]
+        for code, label in enumerate(PERFORMANCE_LABELS):
+            table[label] = self.fractions[:, code]
+        return table
+
+    def to_csv(self, path):
+        """
+        Writes the table returned by to_records as CSV with a header row.
+
+        Args:
+            path (str): The output file.
+        """
+        table = self.to_records()
+        np.savetxt(path, np.column_stack([table[name] for name in table.dtype.names]), delimiter=',',
+                   header=','.join(table.dtype.names), comments='', fmt='%.10g')
+
+class ThresholdSweep:
+    """
+    Evaluates grids of temperature and humidity window bounds of a simulator's rules on a shared sample set.
+
+    Attributes:
+        simulator (CombinedSimulator): The simulator whose rules and value lists are swept.
+        samples (CombinedSampleBatch): The shared sample set.
+        workers (int): The number of worker processes; 0 evaluates every chunk in the calling process.
+        chunk_size (int): The number of grid points per chunk.
+    """
+
+    def __init__(self, simulator, samples=None, n=100_000, workers=None, chunk_size=5000):
+        """
+        Initializes the ThresholdSweep and summarizes the sample set into summed-area tables.
+
+        Args:
+            simulator (CombinedSimulator): The simulator whose rules are swept.
+            samples (CombinedSampleBatch, optional): The shared sample set, e.g. from a recorded trace. Defaults
+                                                     to n samples simulated by the simulator.
+            n (int): The number of samples to simulate when no sample set is given.
+            workers (int, optional): The number of worker processes. Defaults to the CPU count.
+            chunk_size (int): The number of grid points per chunk.
+        """
+        self.simulator = simulator
+        self.samples = samples if samples is not None else self._simulate(n)
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.chunk_size = chunk_size
+        self._summarize()
+
+    def run(self, grid):
+        """
+        Evaluates the label distribution at every point of a parameter grid.
+
+        Args:
+            grid (dict): Maps parameter names to the values to try. A name is '<rule>.<condition>.<bound>', where
+                         rule is a performance level or a rule index, condition is 'temperature' or 'humidity'
+                         and bound is 'low' or 'high', e.g. {'Excellent.temperature.low': range(15, 25)}. The
+                         grid is the Cartesian product of the value lists; bounds not swept keep their rule value.
+
+        Returns:
+            SweepResult: The label counts of every grid point.
+        """
+        names = list(grid)
+        columns = [np.asarray(list(grid[name])) for name in names]
+        shape = tuple(len(column) for column in columns)
+        mesh = [axis.ravel() for axis in np.meshgrid(*columns, indexing='ij')] if names else []
+        points = int(np.prod(shape))
+        bounds = np.broadcast_to(self._base, (points,) + self._base.shape).copy()
+        for name, values in zip(names, mesh):
+            rule, index = self._parameter(name)
+            bounds[:, rule, index] = values
+
+        chunks = [bounds[start:start + self.chunk_size] for start in range(0, points, self.chunk_size)]
+        arguments = (self._tables, self._axes, self._terms, self._default)
+        if self.workers == 0 or len(chunks) <= 1:
+            counts = [_count_chunk(*arguments, chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                counts = list(executor.map(_count_chunk, *zip(*[arguments + (chunk,) for chunk in chunks])))
+        counts = np.concatenate(counts) if counts else np.zeros((0, len(PERFORMANCE_LABELS)), dtype=np.int64)
+        return SweepResult(names, shape, dict(zip(names, mesh)), counts, len(self.samples))
+
+    def _simulate(self, n):
+        simulator = self.simulator
+        environment = simulator.environmental_simulator
+        temperature = environment.simulate_temperature_batch(n)
+        humidity = environment.simulate_humidity_batch(n)
+        response, responses = simulator.embedded_simulator.receive_data_batch(n)
+        signal, signals = simulator.wifi_simulator.simulate_signal_batch(n)
+        movement, movements = simulator.wifi_simulator.simulate_movement_batch(n)
+        return CombinedSampleBatch(temperature, humidity, response, signal, movement, responses, signals, movements)
+
+    def _summarize(self):
+        rules = self.simulator.rules.rules
+        samples = self.samples
+        codes = {'signal': (samples.signal, samples.signal_labels),
+                 'movement': (samples.movement, samples.movement_labels),
+                 'response': (samples.response, samples.response_labels)}
+
+        # Group samples by the bitmask of rules whose categorical conditions they satisfy
+        signature = np.zeros(len(samples), dtype=np.int64)
+        for i, rule in enumerate(rules):
+            eligible = np.ones(len(samples), dtype=bool)
+            for condition in LABEL_CONDITIONS:
+                if condition in rule:
+                    eligible &= membership(*codes[condition], rule[condition])
+            signature |= eligible.astype(np.int64) << i
+        groups, group = np.unique(signature, return_inverse=True)
+
+        # One zero-padded summed-area table per group over the sorted distinct temperatures and humidities
+        temperatures, t_index = np.unique(samples.temperature, return_inverse=True)
+        humidities, h_index = np.unique(samples.humidity, return_inverse=True)
+        histogram = np.zeros((len(groups), len(temperatures), len(humidities)), dtype=np.int64)
+        np.add.at(histogram, (group, t_index, h_index), 1)
+        self._tables = np.zeros((len(groups), len(temperatures) + 1, len(humidities) + 1), dtype=np.int64)
+        self._tables[:, 1:, 1:] = histogram.cumsum(axis=1).cumsum(axis=2)
+        self._axes = (temperatures, humidities)
+        self._default = (PERFORMANCE_LABELS.index(self.simulator.rules.default), histogram.sum(axis=(1, 2)))
+
+        # Rule i claims its window minus the union of earlier windows; by inclusion-exclusion, one signed
+        # window count per subset of earlier rules, over the groups eligible for all rules involved
+        self._terms = []
+        for i, rule in enumerate(rules):
+            code = PERFORMANCE_LABELS.index(rule['label'])
+            for size in range(i + 1):
+                for earlier in itertools.combinations(range(i), size):
+                    involved = (i,) + earlier
+                    mask = sum(1 << j for j in involved)
+                    eligible = ((groups & mask) == mask).astype(np.int64)
+                    if eligible.any():
+                        self._terms.append((code, (-1) ** size, eligible, list(involved)))
+
+        # Every rule's window as (temperature low, temperature high, humidity low, humidity high)
+        self._base = np.empty((len(rules), 4))
+        for i, rule in enumerate(rules):
+            for j, condition in enumerate(RANGE_CONDITIONS):
+                self._base[i, 2 * j:2 * j + 2] = rule.get(condition, (-np.inf, np.inf))
+        self._rule_index = {}
+        for i, rule in reversed(list(enumerate(rules))):
+            self._rule_index[rule['label']] = i
+            self._rule_index[str(i)] = i
+
+    def _parameter(self, name):
+        parts = name.split('.')
+        if (len(parts) != 3 or parts[0] not in self._rule_index or parts[1] not in RANGE_CONDITIONS
+                or parts[2] not in ('low', 'high')):
+            raise ValueError(f"Unknown sweep parameter: {name}")
+        return (self._rule_index[parts[0]],
+                2 * RANGE_CONDITIONS.index(parts[1]) + ('low', 'high').index(parts[2]))
@@ -0,0 +1,437 @@
+"""
+Trace Recorder
+
+Author: Louis H
+Date: 2026-10-18
+
+This module records simulation runs into fixed-width columnar binary traces and reads them back through memory
+maps. A trace file starts with a reserved header area holding a magic number and a JSON description of the
+schema (column names, dtypes and byte offsets), the label tables of categorical columns and the number of rows.
+The data area stores every column contiguously, so the reader exposes each column as a zero-copy NumPy view of
+the mapped file: opening a multi-GB trace costs one header read, and only the pages a query touches are loaded.
+
+The writer preallocates room for a number of rows per column and appends chunks straight into each column's
+region. When a chunk does not fit, the columns are moved apart on disk to double the capacity; closing the
+writer compacts the columns and truncates the unused space.
+
+Modules:
+    - json: Serializes the header.
+    - struct: Packs the header length.
+    - numpy: Provides the column arrays and the memory map.
+    - scripts.combinedSimulation: Provides the performance labels.
+    - scripts.sampling: Provides the compact dtypes of codes and values.
+
+Classes:
+    - TraceWriter: Appends chunks of columns to a trace file.
+    - TraceReader: Memory-maps a trace file and exposes its columns as zero-copy views.
+
+Functions:
+    - record_wifi: Records WiFiSimulator samples into a trace.
+    - record_environment: Records EnvironmentalSimulator samples into a trace.
+    - record_embedded: Records EmbeddedSystemSimulator responses into a trace.
+    - record_combined: Records evaluated CombinedSimulator samples into a trace.
+"""
+
+import json
+import struct
+import numpy as np
+from scripts.combinedSimulation import PERFORMANCE_LABELS
+from scripts.sampling import code_dtype, value_table
+
+MAGIC = b'SIMTRACE'
+VERSION = 1
+HEADER_SIZE = 65536  # Bytes reserved for the magic number, the header length and the JSON header
+ALIGNMENT = 64  # Column offsets are aligned so that every view is aligned for its dtype
+_COPY_BLOCK = 1 << 24  # Bytes moved per read/write when columns are relocated
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def _layout(columns, capacity):
+    """
+    Returns the byte offset of every column when each column has room for capacity rows.
+    """
+    offsets = []
+    offset = HEADER_SIZE
+    for _, dtype in columns:
+        offsets.append(offset)
+        offset = _align(offset + capacity * dtype.itemsize)
+    return offsets, offset
+
+class TraceWriter:
+    """
+    Appends chunks of columns to a columnar trace file.
+
+    Attributes:
+        path (str): The trace file path.
+        rows (int): The number of rows written so far.
+        capacity (int): The number of rows each column currently has room for.
+    """
+
+    def __init__(self, path, columns, labels=None, metadata=None, capacity=65536):
+        """
+        Initializes the TraceWriter and creates its file, replacing any existing file.
+
+        Args:
+            path (str): The trace file path.
+            columns (list): (name, dtype) pairs in storage order.
+            labels (dict, optional): The label table of every categorical column, keyed by column name.
+            metadata (dict, optional): JSON-serializable information stored in the header, e.g. the seed.
+            capacity (int): The number of rows preallocated per column.
+
+        Raises:
+            ValueError: If a column name is repeated or a label table belongs to an unknown column.
+        """
+        self.path = path
+        self._columns = [(name, np.dtype(dtype).newbyteorder('<')) for name, dtype in columns]
+        names = [name for name, _ in self._columns]
+        if len(set(names)) != len(names):
+            raise ValueError("column names must be unique")
+        self._labels = {name: list(values) for name, values in (labels or {}).items()}
+        unknown = set(self._labels) - set(names)
+        if unknown:
+            raise ValueError(f"labels given for unknown columns: {sorted(unknown)}")
+        self._metadata = dict(metadata or {})
+        self.rows = 0
+        self.capacity = max(int(capacity), 1)
+        self._offsets, end = _layout(self._columns, self.capacity)
+        self._file = open(path, 'w+b')
+        self._file.truncate(end)
+        self._write_header()
+
+    def append(self, chunk):
+        """
+        Appends a chunk of rows.
+
+        Args:
+            chunk (dict): An array-like per column name, all of the same length.
+
+        Raises:
+            ValueError: If a column is missing or the arrays differ in length.
+        """
+        arrays = []
+        for name, dtype in self._columns:
+            if name not in chunk:
+                raise ValueError(f"missing column '{name}'")
+            arrays.append(np.ascontiguousarray(chunk[name], dtype=dtype).reshape(-1))
+        n = len(arrays[0]) if arrays else 0
+        if any(len(array) != n for array in arrays):
+            raise ValueError("all columns of a chunk must have the same length")
+        if self.rows + n > self.capacity:
+            self._relocate(max(2 * self.capacity, self.rows + n))
+        for (_, dtype), offset, array in zip(self._columns, self._offsets, arrays):
+            self._file.seek(offset + self.rows * dtype.itemsize)
+            self._file.write(memoryview(array).cast('B'))
+        self.rows += n
+
+    def flush(self):
+        """
+        Records the current row count in the header and flushes the file, so readers see every appended row.
+        """
+        self._write_header()
+        self._file.flush()
+
+    def close(self, compact=True):
+        """
+        Finalizes the trace.
+
+        Args:
+            compact (bool): Whether to move the columns together and truncate the unused preallocated space.
+        """
+        if self._file.closed:
+            return
+        if compact and self.capacity != self.rows:
+            self._relocate(self.rows)
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _relocate(self, capacity):
+        # Columns only move towards the end when growing and towards the start when compacting, so moving the
+        # columns in that order, each block-wise from the end or the start, never overwrites unmoved data
+        offsets, end = _layout(self._columns, capacity)
+        growing = capacity > self.capacity
+        if growing:
+            self._file.truncate(end)
+        order = range(len(self._columns) - 1, -1, -1) if growing else range(len(self._columns))
+        for i in order:
+            self._move(self._offsets[i], offsets[i], self.rows * self._columns[i][1].itemsize, growing)
+        if not growing:
+            self._file.truncate(end)
+        self._offsets = offsets
+        self.capacity = capacity
+
+    def _move(self, source, target, size, backwards):
+        if source == target or size == 0:
+            return
+        starts = range(0, size, _COPY_BLOCK)
+        for start in (reversed(starts) if backwards else starts):
+            length = min(_COPY_BLOCK, size - start)
+            self._file.seek(source + start)
+            block = self._file.read(length)
+            self._file.seek(target + start)
+            self._file.write(block)
+
+    def _write_header(self):
+        header = json.dumps({
+            'version': VERSION,
+            'rows': self.rows,
+            'capacity': self.capacity,
+            'columns': [{'name': name, 'dtype': dtype.str, 'offset': offset}
+                        for (name, dtype), offset in zip(self._columns, self._offsets)],
+            'labels': self._labels,
+            'metadata': self._metadata,
+        }).encode('utf-8')
+        if len(MAGIC) + 4 + len(header) > HEADER_SIZE:
+            raise ValueError("trace header exceeds the reserved header area")
+        self._file.seek(0)
+        self._file.write(MAGIC + struct.pack('<I', len(header)) + header)
+
+class TraceReader:
+    """
+    Memory-maps a trace file and exposes its columns as zero-copy, read-only NumPy views.
+
+    Attributes:
+        path (str): The trace file path.
+        rows (int): The number of rows in the trace.
+        names (list): The column names in storage order.
+        labels (dict): The label table of every categorical column.
+        metadata (dict): The information stored by the writer.
+    """
+
+    def __init__(self, path):
+        """
+        Initializes the TraceReader and maps its file.
+
+        Args:
+            path (str): The trace file path.
+
+        Raises:
+            ValueError: If the file is not a trace or has an unsupported version.
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            prefix = file.read(len(MAGIC) + 4)
+            if len(prefix) < len(MAGIC) + 4 or prefix[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a simulation trace")
+            (length,) = struct.unpack('<I', prefix[len(MAGIC):])
+            header = json.loads(file.read(length).decode('utf-8'))
+        if header['version'] != VERSION:
+            raise ValueError(f"unsupported trace version {header['version']}")
+        self.rows = header['rows']
+        self.labels = header['labels']
+        self.metadata = header['metadata']
+        self.names = [column['name'] for column in header['columns']]
+        self._map = np.memmap(path, dtype=np.uint8, mode='r')
+        self._views = {}
+        for column in header['columns']:
+            dtype = np.dtype(column['dtype'])
+            start = column['offset']
+            self._views[column['name']] = self._map[start:start + self.rows * dtype.itemsize].view(dtype)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, name):
+        return self._views[name]
+
+    def column(self, name):
+        """
+        Returns a column as a zero-copy view of the mapped file.
+
+        Args:
+            name (str): The column name.
+
+        Returns:
+            numpy.ndarray: The read-only column view.
+        """
+        return self._views[name]
+
+    def decode(self, name, start=0, stop=None):
+        """
+        Converts a range of a categorical column back into its labels.
+
+        Args:
+            name (str): The column name.
+            start (int): The first row.
+            stop (int, optional): The row after the last one. Defaults to the end of the trace.
+
+        Returns:
+            list: The labels of the rows.
+        """
+        labels = self.labels[name]
+        return [labels[code] for code in self._views[name][start:stop].tolist()]
+
+    def chunks(self, chunk_size=1_000_000, start=0, stop=None):
+        """
+        Iterates over the trace in chunks of rows, each a dict of zero-copy column views.
+
+        Args:
+            chunk_size (int): The number of rows per chunk.
+            start (int): The first row.
+            stop (int, optional): The row after the last one. Defaults to the end of the trace.
+
+        Yields:
+            dict: The column views of one chunk, keyed by column name.
+        """
+        stop = self.rows if stop is None else min(stop, self.rows)
+        for begin in range(start, stop, chunk_size):
+            end = min(begin + chunk_size, stop)
+            yield {name: view[begin:end] for name, view in self._views.items()}
+
+    def close(self):
+        """
+        Releases the memory map. Views handed out earlier keep it alive until they are dropped.
+        """
+        self._views = {}
+        self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def _record(path, columns, labels, metadata, n, chunk_size, interval, draw):
+    """
+    Writes n samples produced chunk by chunk by draw(time), with a time column spaced by interval seconds.
+    """
+    with TraceWriter(path, [('time', '<f8')] + columns, labels, metadata, capacity=n) as writer:
+        for start in range(0, n, chunk_size):
+            time = np.arange(start, min(start + chunk_size, n), dtype=np.float64) * interval
+            chunk = draw(time)
+            chunk['time'] = time
+            writer.append(chunk)
+        return writer.rows
+
+def _climate_columns(environment):
+    """
+    Returns the temperature and humidity columns, float32 when a climate model is set.
+    """
+    if environment.climate_model is not None:
+        return [('temperature', '<f4'), ('humidity', '<f4')]
+    return [('temperature', value_table(environment.temperatures).dtype),
+            ('humidity', value_table(environment.humidities).dtype)]
+
+def _draw_climate(environment, time, interval):
+    """
+    Draws the temperatures and humidities of the rows at the given times. A climate model is read at the
+    simulator's site, each row at climate_time plus its own time.
+    """
+    if environment.climate_model is None:
+        return (environment.simulate_temperature_batch(len(time)),
+                environment.simulate_humidity_batch(len(time)))
+    temperature, humidity = environment.climate_model.series(environment.climate_time + time[0], len(time),
+                                                             interval)
+    return temperature[environment.site], humidity[environment.site]
+
+def record_wifi(simulator, path, n, chunk_size=1_000_000, interval=2, metadata=None):
+    """
+    Records WiFiSimulator samples into a trace with signal, movement and breathing code columns.
+
+    Args:
+        simulator (WiFiSimulator): The simulator to draw from.
+        path (str): The trace file path.
+        n (int): The number of samples.
+        chunk_size (int): The number of samples drawn and written at a time.
+        interval (float): The simulated seconds between samples, stored in the time column.
+        metadata (dict, optional): Information stored in the header.
+
+    Returns:
+        int: The number of rows written.
+    """
+    labels = {'signal': simulator.signals, 'movement': simulator.movements,
+              'breathing': simulator.breathing_patterns}
+    columns = [(name, code_dtype(len(values))) for name, values in labels.items()]
+
+    def draw(time):
+        batch = simulator.simulate_batch(len(time))
+        return {'signal': batch.signal, 'movement': batch.movement, 'breathing': batch.breathing}
+
+    return _record(path, columns, labels, metadata, n, chunk_size, interval, draw)
+
+def record_environment(simulator, path, n, chunk_size=1_000_000, interval=2, metadata=None):
+    """
+    Records EnvironmentalSimulator samples into a trace with temperature and humidity columns. When a climate
+    model is set, the columns are float32 and row i reads the simulator's site at climate_time + i * interval.
+
+    Args:
+        simulator (EnvironmentalSimulator): The simulator to draw from.
+        path (str): The trace file path.
+        n (int): The number of samples.
+        chunk_size (int): The number of samples drawn and written at a time.
+        interval (float): The simulated seconds between samples, stored in the time column.
+        metadata (dict, optional): Information stored in the header.
+
+    Returns:
+        int: The number of rows written.
+    """
+    def draw(time):
+        temperature, humidity = _draw_climate(simulator, time, interval)
+        return {'temperature': temperature, 'humidity': humidity}
+
+    return _record(path, _climate_columns(simulator), {}, metadata, n, chunk_size, interval, draw)
+
+def record_embedded(simulator, path, n, chunk_size=1_000_000, interval=10, metadata=None):
+    """
+    Records EmbeddedSystemSimulator responses into a trace with a response code column.
+
+    Args:
+        simulator (EmbeddedSystemSimulator): The simulator to draw from.
+        path (str): The trace file path.
+        n (int): The number of responses.
+        chunk_size (int): The number of responses drawn and written at a time.
+        interval (float): The simulated seconds between responses, stored in the time column. Defaults to one
+                          send/receive cycle of the run loop.
+        metadata (dict, optional): Information stored in the header.
+
+    Returns:
+        int: The number of rows written.
+    """
+    columns = [('response', code_dtype(len(simulator.responses)))]
+
+    def draw(time):
+        response, _ = simulator.receive_data_batch(len(time))
+        return {'response': response}
+
+    return _record(path, columns, {'response': simulator.responses}, metadata, n, chunk_size, interval, draw)
+
+def record_combined(simulator, path, n, chunk_size=1_000_000, interval=2, metadata=None):
+    """
+    Records evaluated CombinedSimulator samples into a trace with the five inputs and the performance code. When
+    the environmental simulator has a climate model, its columns are read as in record_environment.
+
+    Args:
+        simulator (CombinedSimulator): The simulator to draw from.
+        path (str): The trace file path.
+        n (int): The number of samples.
+        chunk_size (int): The number of samples drawn and written at a time.
+        interval (float): The simulated seconds between samples, stored in the time column.
+        metadata (dict, optional): Information stored in the header.
+
+    Returns:
+        int: The number of rows written.
+    """
+    wifi = simulator.wifi_simulator
+    embedded = simulator.embedded_simulator
+    environment = simulator.environmental_simulator
+    labels = {'response': embedded.responses, 'signal': wifi.signals, 'movement': wifi.movements,
+              'performance': list(PERFORMANCE_LABELS)}
+    columns = _climate_columns(environment) + [(name, code_dtype(len(values))) for name, values in labels.items()]
+
+    def draw(time):
+        k = len(time)
+        temperature, humidity = _draw_climate(environment, time, interval)
+        response, _ = embedded.receive_data_batch(k)
+        signal, _ = wifi.simulate_signal_batch(k)
+        movement, _ = wifi.simulate_movement_batch(k)
+        performance, _ = simulator.evaluate_arrays(temperature, humidity, response, signal, movement)
+        return {'temperature': temperature, 'humidity': humidity, 'response': response, 'signal': signal,
+                'movement': movement, 'performance': performance}
+
+    return _record(path, columns, labels, metadata, n, chunk_size, interval, draw)
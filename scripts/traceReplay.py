@@ -0,0 +1,280 @@
+"""
+Trace Replay
+
+Author: Louis H
+Date: 2026-10-18
+
+This module replays recorded inputs through a CombinedSimulator in place of its three random simulators. The
+inputs come from a trace written by scripts.traceRecorder, a CSV file or a JSON-lines file, such as the output
+of a JsonLinesSink. Every source is read in chunks, so memory use stays constant however long the recording is.
+
+A replay either goes through evaluate_performance one sample at a time, paced by a clock at the recorded
+timing or as fast as possible, or classifies whole chunks at once through evaluate_arrays for benchmarking.
+
+Modules:
+    - abc: Provides the abstract base class of the replay sources.
+    - csv: Reads CSV files.
+    - itertools: Splits text files into chunks of records.
+    - json: Reads JSON-lines files.
+    - numpy: Provides the chunk arrays.
+    - scripts.clock: Provides the clocks that pace a replay.
+    - scripts.combinedSimulation: Provides the batch container and performance labels.
+    - scripts.sampling: Provides the compact dtype of codes.
+    - scripts.traceRecorder: Provides the trace reader.
+
+Classes:
+    - ReplaySource: The interface shared by all replay sources.
+    - TraceReplaySource: Reads inputs from a columnar trace.
+    - CsvReplaySource: Reads inputs from a CSV file.
+    - JsonLinesReplaySource: Reads inputs from a JSON-lines file.
+    - TraceReplayer: Replays a source through a CombinedSimulator.
+"""
+
+import abc
+import csv
+import itertools
+import json
+import numpy as np
+from scripts.clock import RealTimeClock
+from scripts.combinedSimulation import CombinedSampleBatch, PERFORMANCE_LABELS
+from scripts.sampling import code_dtype
+from scripts.traceRecorder import TraceReader
+
+# The input fields of a recorded sample, in the argument order of CombinedSimulator.evaluate_arrays
+INPUT_FIELDS = ('temperature', 'humidity', 'response', 'signal', 'movement')
+# Other names accepted for input fields in text files, e.g. the keys of 'combined_reading' events
+FIELD_ALIASES = {'embedded_response': 'response'}
+
+def _numeric(values):
+    """
+    Converts parsed numbers to an array, keeping integral values as integers so they stay in the table domain.
+    """
+    array = np.asarray(values, dtype=np.float64)
+    if np.all(np.isfinite(array)) and np.all(array == np.round(array)):
+        return array.astype(np.int64)
+    return array
+
+def _encode(values):
+    """
+    Converts a list of labels to a code array and the label table the codes index into.
+    """
+    table = {}
+    codes = [table.setdefault(value, len(table)) for value in values]
+    return np.array(codes, dtype=code_dtype(max(len(table), 1))), tuple(table)
+
+class ReplaySource(abc.ABC):
+    """
+    The interface shared by all replay sources.
+
+    Attributes:
+        path (str): The recording path.
+        chunk_size (int): The number of samples read at a time.
+    """
+
+    def __init__(self, path, chunk_size=65536):
+        """
+        Initializes the ReplaySource.
+
+        Args:
+            path (str): The recording path.
+            chunk_size (int): The number of samples read at a time.
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+
+    @abc.abstractmethod
+    def chunks(self):
+        """
+        Reads the recording chunk by chunk.
+
+        Yields:
+            tuple: An array of recorded times, or None if the recording has none, and a CombinedSampleBatch
+                   whose categorical codes index the label tables found in the recording.
+        """
+
+class TraceReplaySource(ReplaySource):
+    """
+    A replay source reading a columnar trace, such as one written by record_combined. Chunks are zero-copy views
+    of the memory-mapped file.
+    """
+
+    def chunks(self):
+        reader = TraceReader(self.path)
+        missing = [field for field in INPUT_FIELDS if field not in reader.names]
+        if missing:
+            raise ValueError(f"{self.path} has no {', '.join(missing)} columns")
+        labels = reader.labels
+        for chunk in reader.chunks(self.chunk_size):
+            yield chunk.get('time'), CombinedSampleBatch(
+                chunk['temperature'], chunk['humidity'], chunk['response'], chunk['signal'], chunk['movement'],
+                labels['response'], labels['signal'], labels['movement'])
+
+class _RecordSource(ReplaySource):
+    """
+    A replay source reading a text file with one record per sample.
+    """
+
+    def chunks(self):
+        with open(self.path, newline='', encoding='utf-8') as file:
+            records = self._records(file)
+            while True:
+                block = list(itertools.islice(records, self.chunk_size))
+                if not block:
+                    return
+                yield self._batch(block)
+
+    @abc.abstractmethod
+    def _records(self, file):
+        """
+        Parses the records of an open text file.
+
+        Args:
+            file (file): The open recording.
+
+        Returns:
+            iterator: One dict of field values per sample.
+        """
+
+    def _batch(self, records):
+        columns = {field: [] for field in INPUT_FIELDS}
+        times = []
+        for record in records:
+            record = {FIELD_ALIASES.get(key, key): value for key, value in record.items()}
+            for field, values in columns.items():
+                if field not in record:
+                    raise ValueError(f"{self.path}: a record has no '{field}' field")
+                values.append(record[field])
+            times.append(record.get('time'))
+        response, response_labels = _encode(columns['response'])
+        signal, signal_labels = _encode(columns['signal'])
+        movement, movement_labels = _encode(columns['movement'])
+        times = None if None in times or '' in times else np.asarray(times, dtype=np.float64)
+        return times, CombinedSampleBatch(_numeric(columns['temperature']), _numeric(columns['humidity']),
+                                          response, signal, movement,
+                                          response_labels, signal_labels, movement_labels)
+
+class CsvReplaySource(_RecordSource):
+    """
+    A replay source reading a CSV file with a header row naming the temperature, humidity, response (or
+    embedded_response), signal and movement columns, and optionally a time column in seconds.
+    """
+
+    def _records(self, file):
+        return csv.DictReader(file)
+
+class JsonLinesReplaySource(_RecordSource):
+    """
+    A replay source reading a JSON-lines file with one object per sample, keyed like the CSV columns. Lines
+    written by a JsonLinesSink are accepted as they are: only their 'combined_reading' events are replayed.
+    """
+
+    def _records(self, file):
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                if record.pop('event', 'combined_reading') == 'combined_reading':
+                    yield record
+
+class TraceReplayer:
+    """
+    Replays a recording through a CombinedSimulator instead of its random simulators.
+
+    Attributes:
+        simulator (CombinedSimulator): The simulator evaluating the recorded samples.
+        source (ReplaySource): The recording.
+    """
+
+    def __init__(self, simulator, source):
+        """
+        Initializes the TraceReplayer.
+
+        Args:
+            simulator (CombinedSimulator): The simulator evaluating the recorded samples.
+            source (ReplaySource): The recording.
+        """
+        self.simulator = simulator
+        self.source = source
+
+    def run(self, clock=None, paced=False, interval=2):
+        """
+        Replays every recorded sample through evaluate_performance and emits its performance level, like
+        CombinedSimulator.run. Labels are passed through unchanged, so values the simulators never produce are
+        classified exactly as they would be in production.
+
+        Args:
+            clock (Clock, optional): The clock that paces a paced replay. Defaults to real time; pass a
+                                     ScaledClock to replay faster than recorded.
+            paced (bool): Whether to wait between samples as long as the recording did. Samples recorded out of
+                          order are replayed at once, and the next wait counts from the latest time so far.
+                          Defaults to replaying as fast as possible.
+            interval (float): The seconds between samples of recordings without times, used when paced.
+
+        Returns:
+            int: The number of samples replayed.
+        """
+        simulator = self.simulator
+        clock = clock or RealTimeClock()
+        replayed = 0
+        previous = None
+        for times, batch in self.source.chunks():
+            responses = [batch.response_labels[code] for code in batch.response.tolist()]
+            signals = [batch.signal_labels[code] for code in batch.signal.tolist()]
+            movements = [batch.movement_labels[code] for code in batch.movement.tolist()]
+            if times is None:
+                times = np.arange(replayed, replayed + len(batch), dtype=np.float64) * interval
+            for time, *inputs in zip(times.tolist(), batch.temperature.tolist(), batch.humidity.tolist(),
+                                     responses, signals, movements):
+                if paced and previous is not None:
+                    clock.sleep(time - previous)
+                previous = time if previous is None else max(previous, time)
+                performance = simulator.evaluate_performance(inputs)
+                simulator.sink.emit('performance', {'performance': performance})
+            replayed += len(batch)
+        return replayed
+
+    def evaluate(self):
+        """
+        Classifies the recording chunk by chunk through evaluate_arrays, as fast as possible and without
+        emitting anything.
+
+        Yields:
+            tuple: The recorded times of the chunk (or None) and its performance codes indexing
+                   PERFORMANCE_LABELS.
+
+        Raises:
+            ValueError: If the recording holds a label the simulators do not know.
+        """
+        wifi = self.simulator.wifi_simulator
+        responses = self.simulator.embedded_simulator.responses
+        for times, batch in self.source.chunks():
+            codes, _ = self.simulator.evaluate_arrays(
+                batch.temperature, batch.humidity,
+                self._remap(batch.response, batch.response_labels, responses, 'response'),
+                self._remap(batch.signal, batch.signal_labels, wifi.signals, 'signal'),
+                self._remap(batch.movement, batch.movement_labels, wifi.movements, 'movement'))
+            yield times, codes
+
+    def performance_counts(self):
+        """
+        Counts the performance levels of the whole recording.
+
+        Returns:
+            dict: The number of samples per performance level.
+        """
+        counts = np.zeros(len(PERFORMANCE_LABELS), dtype=np.int64)
+        for _, codes in self.evaluate():
+            counts += np.bincount(codes, minlength=len(PERFORMANCE_LABELS))
+        return dict(zip(PERFORMANCE_LABELS, counts.tolist()))
+
+    @staticmethod
+    def _remap(codes, labels, values, field):
+        """
+        Translates codes indexing a recording's label table into codes indexing a simulator's value list.
+        """
+        if list(labels) == list(values):
+            return codes
+        unknown = [label for label in labels if label not in values]
+        if unknown:
+            raise ValueError(f"unknown {field} labels in the recording: {unknown}")
+        table = np.array([values.index(label) for label in labels], dtype=code_dtype(len(values)))
+        return table[codes]
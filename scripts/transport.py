@@ -0,0 +1,413 @@
+"""
+Transports
+
+Author: Louis H
+Date: 2026-10-18
+
+This module moves the binary frames of simulated embedded devices through real byte streams on one asyncio event
+loop. A transport both serves connections, as a gateway does, and opens them, as devices do. Three backends share
+one interface: TCP over localhost, Unix domain sockets, and in-process queues, which carry the same bytes without
+the kernel, to separate protocol costs from socket costs.
+
+A Channel is one client connection shared by many devices. Requests are written one at a time, in the order they
+are queued for their responses, and the gateway answers the frames of a connection in order, so every response is
+matched to the oldest outstanding request and a pool of a few channels can serve thousands of devices.
+
+Modules:
+    - abc: Provides the abstract base classes of the connections and transports.
+    - asyncio: Provides the streams, servers and queues.
+    - collections: Provides the queue of outstanding requests.
+    - os, tempfile: Provide the socket path of Unix domain sockets.
+    - scripts.frameCodec: Decodes the response frames.
+
+Classes:
+    - Connection: The interface of one byte stream.
+    - StreamConnection: A connection over an asyncio stream, for TCP and Unix domain sockets.
+    - QueueConnection: A connection over a pair of in-process queues.
+    - Transport: The interface shared by all transports.
+    - TcpTransport: Serves and opens TCP connections on localhost.
+    - UnixTransport: Serves and opens Unix domain socket connections.
+    - QueueTransport: Serves and opens in-process queue connections.
+    - Channel: A client connection multiplexing the requests of many devices.
+"""
+
+import abc
+import asyncio
+import collections
+import os
+import tempfile
+from scripts.frameCodec import decode_batch
+
+READ_SIZE = 1 << 16  # Bytes requested per read
+
+class Connection(abc.ABC):
+    """
+    The interface of one byte stream.
+    """
+
+    @abc.abstractmethod
+    async def send(self, data):
+        """
+        Writes bytes to the peer.
+
+        Args:
+            data (bytes-like): The bytes.
+        """
+
+    @abc.abstractmethod
+    async def recv(self):
+        """
+        Reads the next available bytes from the peer.
+
+        Returns:
+            bytes: The bytes, or b'' once the peer has closed the connection.
+        """
+
+    @abc.abstractmethod
+    async def close(self):
+        """
+        Closes the connection.
+        """
+
+class StreamConnection(Connection):
+    """
+    A connection over an asyncio stream reader and writer.
+    """
+
+    def __init__(self, reader, writer):
+        """
+        Initializes the StreamConnection.
+
+        Args:
+            reader (asyncio.StreamReader): The reading side.
+            writer (asyncio.StreamWriter): The writing side.
+        """
+        self._reader = reader
+        self._writer = writer
+
+    async def send(self, data):
+        self._writer.write(data)
+        await self._writer.drain()
+
+    async def recv(self):
+        return await self._reader.read(READ_SIZE)
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+class QueueConnection(Connection):
+    """
+    A connection over a pair of bounded in-process queues of byte chunks.
+    """
+
+    def __init__(self, incoming, outgoing):
+        """
+        Initializes the QueueConnection.
+
+        Args:
+            incoming (asyncio.Queue): The chunks written by the peer.
+            outgoing (asyncio.Queue): The chunks written to the peer.
+        """
+        self._incoming = incoming
+        self._outgoing = outgoing
+        self._closed = False
+
+    async def send(self, data):
+        if self._closed:
+            raise ConnectionError("Connection is closed")
+        # Copy, as a socket would, so that the sender may reuse its buffer
+        await self._outgoing.put(bytes(data))
+
+    async def recv(self):
+        if self._closed:
+            return b''
+        chunk = await self._incoming.get()
+        if not chunk or self._incoming.empty():
+            return chunk
+        # Coalesce every chunk already queued into one read, as a socket buffer would, stopping at end of stream
+        chunks = [chunk]
+        while not self._incoming.empty():
+            chunk = self._incoming.get_nowait()
+            if not chunk:
+                self._closed = True
+                break
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    async def close(self):
+        if not self._closed:
+            self._closed = True
+            await self._outgoing.put(b'')
+
+class Transport(abc.ABC):
+    """
+    The interface shared by all transports.
+    """
+
+    @abc.abstractmethod
+    async def serve(self, handler):
+        """
+        Starts accepting connections.
+
+        Args:
+            handler (callable): A coroutine function awaited as handler(connection) for every connection.
+        """
+
+    @abc.abstractmethod
+    async def connect(self):
+        """
+        Opens a connection to the server.
+
+        Returns:
+            Connection: The connection.
+        """
+
+    @abc.abstractmethod
+    async def close(self):
+        """
+        Stops accepting connections and releases the transport's resources.
+        """
+
+class _StreamTransport(Transport):
+    """
+    The server bookkeeping shared by the stream transports.
+    """
+
+    def __init__(self):
+        self._server = None
+        self._handlers = set()
+
+    def _accept(self, handler):
+        async def accept(reader, writer):
+            task = asyncio.current_task()
+            self._handlers.add(task)
+            connection = StreamConnection(reader, writer)
+            try:
+                await handler(connection)
+            finally:
+                self._handlers.discard(task)
+                await connection.close()
+        return accept
+
+    async def close(self):
+        if self._server is None:
+            return
+        self._server.close()
+        # Close the open connections first: from Python 3.12 on, wait_closed also waits for them
+        for task in list(self._handlers):
+            task.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+
+class TcpTransport(_StreamTransport):
+    """
+    Serves and opens TCP connections; asyncio disables Nagle's algorithm on them.
+
+    Attributes:
+        host (str): The address served on.
+        port (int): The port served on; 0 picks a free port when serving starts.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0):
+        """
+        Initializes the TcpTransport.
+
+        Args:
+            host (str): The address to serve on.
+            port (int): The port to serve on; 0 picks a free port.
+        """
+        super().__init__()
+        self.host = host
+        self.port = port
+        self._requested_port = port
+
+    async def serve(self, handler):
+        self._server = await asyncio.start_server(self._accept(handler), self.host, self._requested_port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def connect(self):
+        return StreamConnection(*await asyncio.open_connection(self.host, self.port))
+
+class UnixTransport(_StreamTransport):
+    """
+    Serves and opens Unix domain socket connections.
+
+    Attributes:
+        path (str): The socket path, or None until serving starts when it is temporary.
+    """
+
+    def __init__(self, path=None):
+        """
+        Initializes the UnixTransport.
+
+        Args:
+            path (str, optional): The socket path. Defaults to a path in a temporary directory created when
+                                  serving starts and removed on close.
+        """
+        if not hasattr(asyncio, 'start_unix_server'):
+            raise OSError("Unix domain sockets are not supported on this platform")
+        super().__init__()
+        self.path = path
+        self._temporary = path is None
+        self._directory = None
+
+    async def serve(self, handler):
+        if self._temporary:
+            self._directory = tempfile.mkdtemp(prefix='gateway-')
+            self.path = os.path.join(self._directory, 'gateway.sock')
+        self._server = await asyncio.start_unix_server(self._accept(handler), self.path)
+
+    async def connect(self):
+        return StreamConnection(*await asyncio.open_unix_connection(self.path))
+
+    async def close(self):
+        await super().close()
+        if self.path is not None and os.path.exists(self.path):
+            os.unlink(self.path)
+        if self._directory is not None:
+            os.rmdir(self._directory)
+            self._directory = None
+
+class QueueTransport(Transport):
+    """
+    Serves and opens connections over in-process queues, carrying the same bytes as a socket without the kernel.
+
+    Attributes:
+        queue_size (int): The number of chunks each direction of a connection buffers before a sender waits.
+    """
+
+    def __init__(self, queue_size=64):
+        """
+        Initializes the QueueTransport.
+
+        Args:
+            queue_size (int): The number of chunks each direction of a connection buffers.
+        """
+        self.queue_size = queue_size
+        self._handler = None
+        self._handlers = set()
+
+    async def serve(self, handler):
+        self._handler = handler
+
+    async def connect(self):
+        if self._handler is None:
+            raise ConnectionRefusedError("The transport is not serving")
+        upstream = asyncio.Queue(self.queue_size)
+        downstream = asyncio.Queue(self.queue_size)
+        server_side = QueueConnection(upstream, downstream)
+        task = asyncio.create_task(self._handler(server_side))
+        self._handlers.add(task)
+        task.add_done_callback(self._handlers.discard)
+        return QueueConnection(downstream, upstream)
+
+    async def close(self):
+        self._handler = None
+        for task in list(self._handlers):
+            task.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+
+class Channel:
+    """
+    A client connection shared by many devices. Every request waits for the response frame answering it, matched
+    in order, and the sequence number of the response must echo that of the request.
+
+    Attributes:
+        connection (Connection): The underlying connection.
+        requests (int): The number of requests sent.
+    """
+
+    def __init__(self, connection):
+        """
+        Initializes the Channel and starts reading responses. Must be called on a running event loop.
+
+        Args:
+            connection (Connection): The connection to multiplex.
+        """
+        self.connection = connection
+        self.requests = 0
+        self._pending = collections.deque()
+        self._send_lock = asyncio.Lock()
+        self._reader = asyncio.create_task(self._read())
+
+    @classmethod
+    async def open(cls, transport):
+        """
+        Opens a new channel on a transport.
+
+        Args:
+            transport (Transport): The transport to connect through.
+
+        Returns:
+            Channel: The channel.
+        """
+        return cls(await transport.connect())
+
+    async def request(self, frame, sequence):
+        """
+        Sends one frame and waits for its response.
+
+        Args:
+            frame (bytes-like): The encoded frame.
+            sequence (int): The frame's sequence number, which the response must echo.
+
+        Returns:
+            int: The code of the response frame.
+
+        Raises:
+            ConnectionError: If the connection closes before the response arrives.
+            ValueError: If the response echoes a different sequence number.
+        """
+        future = asyncio.get_running_loop().create_future()
+        # Senders blocked on a full connection do not resume in order, so queue and write under one lock
+        async with self._send_lock:
+            self._pending.append((future, sequence))
+            self.requests += 1
+            await self.connection.send(frame)
+        return await future
+
+    async def close(self):
+        """
+        Closes the connection and fails any outstanding requests.
+        """
+        await self.connection.close()
+        self._reader.cancel()
+        await asyncio.gather(self._reader, return_exceptions=True)
+        self._fail(ConnectionError("Channel closed"))
+
+    async def _read(self):
+        buffer = bytearray()
+        try:
+            while True:
+                chunk = await self.connection.recv()
+                if not chunk:
+                    break
+                buffer += chunk
+                with memoryview(buffer) as view:
+                    batch = decode_batch(view)
+                    for code, sequence in zip(batch.code.tolist(), batch.sequence.tolist()):
+                        future, expected = self._pending.popleft()
+                        if future.done():
+                            continue
+                        if sequence == expected:
+                            future.set_result(code)
+                        else:
+                            future.set_exception(ValueError(f"Response {sequence} answers request {expected}"))
+                    consumed = batch.consumed
+                    del batch
+                del buffer[:consumed]
+        except (ConnectionError, ValueError, IndexError) as error:
+            self._fail(error if isinstance(error, ConnectionError) else ConnectionError(str(error)))
+            return
+        self._fail(ConnectionError("Connection closed by the gateway"))
+
+    def _fail(self, error):
+        while self._pending:
+            future, _ = self._pending.popleft()
+            if not future.done():
+                future.set_exception(error)
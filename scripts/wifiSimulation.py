@@ -5,22 +5,103 @@ Author: Louis H
 Date: 2024-08-04
 
 This module simulates various aspects of WiFi sensing technology, including signal strength, movement, and breathing patterns.
-The simulator continuously generates random values for these parameters and prints them to the console.
+The simulator continuously generates random values for these parameters and emits them to an output sink, the console by default.
+Each parameter is drawn independently unless a temporal model from scripts.stateModels is set for it, e.g. a
+MarkovChain that makes a fall more likely to be followed by lying still than by running. When a
+PropagationModel from scripts.propagation is set, the signal strength instead follows from the device's position
+in a floor plan of access points.
 
 Usage:
     Run this script directly to start the simulation.
 
 
 Modules:
-    - random: Provides functions for generating random data.
-    - time: Provides time-related functions, used here for delays between simulations.
+    - copy: Provides deep copies used when spawning simulators.
+    - scripts.clock: Provides the clocks that pace the run loop.
+    - scripts.outputSinks: Provides the sinks that simulated readings are emitted to.
+    - scripts.sampling: Provides the NumPy helpers used by the batch sampling methods.
 
 Classes:
+    - WiFiSampleBatch: A struct-of-arrays container for batches of WiFi samples.
     - WiFiSimulator: A class that simulates WiFi signal strength, movement, and breathing patterns.
 """
 
-import random
-import time
+import copy
+import numpy as np
+from scripts.clock import RealTimeClock
+from scripts.outputSinks import ConsoleSink
+from scripts.sampling import choose, draw_codes, jittered, make_stream
+
+class WiFiSampleBatch:
+    """
+    A struct-of-arrays batch of WiFi samples.
+
+    Each field is an array of categorical codes indexing into the matching label table, so a batch of
+    millions of samples takes a few megabytes instead of millions of Python strings.
+
+    Attributes:
+        signal (numpy.ndarray): Signal strength codes.
+        movement (numpy.ndarray): Movement codes.
+        breathing (numpy.ndarray): Breathing pattern codes.
+        signal_labels (tuple): The label table for signal codes.
+        movement_labels (tuple): The label table for movement codes.
+        breathing_labels (tuple): The label table for breathing pattern codes.
+    """
+
+    fields = ('signal', 'movement', 'breathing')
+
+    def __init__(self, signal, movement, breathing, signal_labels, movement_labels, breathing_labels):
+        """
+        Initializes the batch from code arrays and their label tables.
+        """
+        self.signal = signal
+        self.movement = movement
+        self.breathing = breathing
+        self.signal_labels = tuple(signal_labels)
+        self.movement_labels = tuple(movement_labels)
+        self.breathing_labels = tuple(breathing_labels)
+
+    def __len__(self):
+        return len(self.signal)
+
+    @property
+    def nbytes(self):
+        """
+        int: The number of bytes held by the code arrays.
+        """
+        return self.signal.nbytes + self.movement.nbytes + self.breathing.nbytes
+
+    def decode(self, field):
+        """
+        Converts the codes of one field back into labels.
+
+        Args:
+            field (str): One of 'signal', 'movement' or 'breathing'.
+
+        Returns:
+            numpy.ndarray: An object array of labels.
+        """
+        codes, labels = self._field(field)
+        return np.asarray(labels, dtype=object)[codes]
+
+    def counts(self, field):
+        """
+        Counts how often each label of one field occurs in the batch.
+
+        Args:
+            field (str): One of 'signal', 'movement' or 'breathing'.
+
+        Returns:
+            dict: A mapping from label to number of occurrences.
+        """
+        codes, labels = self._field(field)
+        counts = np.bincount(codes, minlength=len(labels))
+        return dict(zip(labels, counts.tolist()))
+
+    def _field(self, field):
+        if field not in self.fields:
+            raise ValueError(f"Unknown field: {field}")
+        return getattr(self, field), getattr(self, f"{field}_labels")
 
 class WiFiSimulator:
     """
@@ -30,15 +111,51 @@ class WiFiSimulator:
         signals (list): A list of possible WiFi signal strengths.
         movements (list): A list of possible movement types.
         breathing_patterns (list): A list of possible breathing patterns.
+        signal_weights (list): Relative weights of the signal strengths, or None for uniform.
+        movement_weights (list): Relative weights of the movement types, or None for uniform.
+        breathing_weights (list): Relative weights of the breathing patterns, or None for uniform.
+        signal_model (MarkovChain): The temporal model of the signal strength codes, or None to draw every
+                                    signal strength independently.
+        movement_model (MarkovChain): The temporal model of the movement codes, or None for independent draws.
+        breathing_model (MarkovChain): The temporal model of the breathing pattern codes, or None for
+                                       independent draws.
+        propagation (PropagationModel): Derives the signal strength from the device's position, or None. Takes
+                                        precedence over the signal weights and model.
+        position (tuple): The device's (x, y) position in metres for the propagation model, or None to place it
+                          at random on first use.
+        rng (RandomStream): The simulator's own random stream.
+        sink (OutputSink): Where simulated readings are emitted.
+        latest_signal (str): The signal strength drawn by the latest scheduled sensing event.
+        latest_movement (str): The movement drawn by the latest scheduled sensing event.
+        latest_breathing (str): The breathing pattern drawn by the latest scheduled sensing event.
     """
 
-    def __init__(self):
+    def __init__(self, rng=None, sink=None):
         """
         Initializes the WiFiSimulator with predefined signal strengths, movements, and breathing patterns.
+
+        Args:
+            rng: The random source: a seed, a random.Random, a numpy.random.Generator or a RandomStream.
+                 Defaults to fresh OS entropy.
+            sink (OutputSink, optional): Where simulated readings are emitted. Defaults to the console.
         """
         self.signals = ['Strong', 'Weak', 'No Signal']
         self.movements = ['None', 'Walking', 'Running', 'Falling']
         self.breathing_patterns = ['Normal', 'Fast', 'Slow']
+        self.signal_weights = None
+        self.movement_weights = None
+        self.breathing_weights = None
+        self.signal_model = None
+        self.movement_model = None
+        self.breathing_model = None
+        self.propagation = None
+        self.position = None
+        self.rng = make_stream(rng)
+        self.sink = sink or ConsoleSink()
+        self.latest_signal = None
+        self.latest_movement = None
+        self.latest_breathing = None
+        self._states = {}
 
     def simulate_signal(self):
         """
@@ -47,7 +164,13 @@ class WiFiSimulator:
         Returns:
             str: The simulated signal strength.
         """
-        return random.choice(self.signals)
+        if self.propagation is not None:
+            if self.position is None:
+                self.position = tuple(self.propagation.floor_plan.random_positions(1, self.rng)[0].tolist())
+            return self.signals[self.propagation.signal_codes([self.position], self.rng)[0]]
+        if self.signal_model is None:
+            return choose(self.signals, self.signal_weights, self.rng)
+        return self.signals[self._advance('signal', self.signal_model)]
 
     def simulate_movement(self):
         """
@@ -56,7 +179,9 @@ class WiFiSimulator:
         Returns:
             str: The simulated movement.
         """
-        return random.choice(self.movements)
+        if self.movement_model is None:
+            return choose(self.movements, self.movement_weights, self.rng)
+        return self.movements[self._advance('movement', self.movement_model)]
 
     def simulate_breathing(self):
         """
@@ -65,18 +190,171 @@ class WiFiSimulator:
         Returns:
             str: The simulated breathing pattern.
         """
-        return random.choice(self.breathing_patterns)
+        if self.breathing_model is None:
+            return choose(self.breathing_patterns, self.breathing_weights, self.rng)
+        return self.breathing_patterns[self._advance('breathing', self.breathing_model)]
 
-    def run(self):
+    def simulate_signal_batch(self, n, previous=None, positions=None):
+        """
+        Simulates n WiFi signal strengths at once.
+
+        Args:
+            n (int): The number of samples.
+            previous (numpy.ndarray, optional): The previous codes of n independent chains to advance by one step
+                                                when a signal model is set. Ignored otherwise.
+            positions (numpy.ndarray, optional): The (n, 2) positions of the devices when a propagation model is
+                                                 set. Defaults to random positions. Ignored otherwise.
+
+        Returns:
+            tuple: A code array and the label table the codes index into.
+        """
+        labels = tuple(self.signals)
+        if self.propagation is not None:
+            if positions is None:
+                positions = self.propagation.floor_plan.random_positions(n, self.rng)
+            return self.propagation.signal_codes(positions, self.rng), labels
+        if self.signal_model is None:
+            return draw_codes(n, len(labels), self.signal_weights, self.rng), labels
+        return self.signal_model.advance_batch(n, previous, self.rng), labels
+
+    def simulate_movement_batch(self, n, previous=None):
+        """
+        Simulates n movements at once.
+
+        Args:
+            n (int): The number of samples.
+            previous (numpy.ndarray, optional): The previous codes of n independent chains to advance by one step
+                                                when a movement model is set. Ignored otherwise.
+
+        Returns:
+            tuple: A code array and the label table the codes index into.
+        """
+        labels = tuple(self.movements)
+        if self.movement_model is None:
+            return draw_codes(n, len(labels), self.movement_weights, self.rng), labels
+        return self.movement_model.advance_batch(n, previous, self.rng), labels
+
+    def simulate_breathing_batch(self, n, previous=None):
+        """
+        Simulates n breathing patterns at once.
+
+        Args:
+            n (int): The number of samples.
+            previous (numpy.ndarray, optional): The previous codes of n independent chains to advance by one step
+                                                when a breathing model is set. Ignored otherwise.
+
+        Returns:
+            tuple: A code array and the label table the codes index into.
+        """
+        labels = tuple(self.breathing_patterns)
+        if self.breathing_model is None:
+            return draw_codes(n, len(labels), self.breathing_weights, self.rng), labels
+        return self.breathing_model.advance_batch(n, previous, self.rng), labels
+
+    def simulate_batch(self, n):
+        """
+        Simulates n samples of signal strength, movement, and breathing pattern at once.
+
+        Args:
+            n (int): The number of samples.
+
+        Returns:
+            WiFiSampleBatch: The samples as code arrays with their label tables.
+        """
+        signal, signal_labels = self.simulate_signal_batch(n)
+        movement, movement_labels = self.simulate_movement_batch(n)
+        breathing, breathing_labels = self.simulate_breathing_batch(n)
+        return WiFiSampleBatch(signal, movement, breathing, signal_labels, movement_labels, breathing_labels)
+
+    def spawn(self, n):
+        """
+        Creates copies of this simulator that draw from independent child streams of its random stream.
+
+        Args:
+            n (int): The number of copies.
+
+        Returns:
+            list: The WiFiSimulator copies.
+        """
+        children = []
+        for stream in self.rng.spawn(n):
+            child = copy.deepcopy(self, {id(self.sink): self.sink})
+            child.rng = stream
+            children.append(child)
+        return children
+
+    def schedule(self, scheduler, interval=2):
+        """
+        Registers WiFi sensing events on a discrete-event scheduler.
+
+        The first sensing happens immediately. Each sensing event draws a new signal strength, movement, and
+        breathing pattern into the latest_* attributes without printing.
+
+        Args:
+            scheduler (EventScheduler): The scheduler to register on.
+            interval (float or callable): The period in seconds, or a callable drawing each delay for
+                                          stochastic events.
+
+        Returns:
+            list: The event handle.
+        """
+        self._sense(scheduler)
+        if callable(interval):
+            return scheduler.schedule_stochastic(interval, self._sense)
+        return scheduler.schedule_periodic(interval, self._sense, start=scheduler.now() + interval)
+
+    def _advance(self, field, model):
+        # Steps the field's chain from its previous state, or draws a first state
+        self._states[field] = model.advance(self._states.get(field), self.rng)
+        return self._states[field]
+
+    def _sense(self, scheduler):
+        self.latest_signal = self.simulate_signal()
+        self.latest_movement = self.simulate_movement()
+        self.latest_breathing = self.simulate_breathing()
+
+    def run(self, clock=None, duration=None):
         """
         Continuously simulates WiFi signal strength, movement, and breathing patterns with a delay between each simulation.
+
+        Args:
+            clock (Clock, optional): The clock that paces the loop. Defaults to real time; pass a ScaledClock
+                                     or VirtualClock to run accelerated.
+            duration (float, optional): The simulated number of seconds to run for. Defaults to forever.
         """
-        while True:
+        clock = clock or RealTimeClock()
+        end = None if duration is None else clock.now() + duration
+        while end is None or clock.now() < end:
             signal = self.simulate_signal()
             movement = self.simulate_movement()
             breathing = self.simulate_breathing()
-            print(f"Detected signal: {signal}, Movement: {movement}, Breathing: {breathing}")
-            time.sleep(2)
+            self.sink.emit('wifi_reading', {'signal': signal, 'movement': movement, 'breathing': breathing})
+            clock.sleep(2)
+
+    async def arun(self, clock=None, duration=None, emit=None, jitter=0.0):
+        """
+        Asynchronous counterpart of run that sleeps without blocking the event loop, so that thousands of
+        simulators can run concurrently in one thread.
+
+        Args:
+            clock (Clock, optional): The clock that paces the loop. Defaults to real time; pass a ScaledClock
+                                     to run accelerated.
+            duration (float, optional): The simulated number of seconds to run for. Defaults to forever.
+            emit (callable, optional): An async callable awaited as emit(event, fields) for every reading, e.g. to
+                                       put it on a bounded queue. Defaults to emitting to the sink.
+            jitter (float): The largest relative deviation of each sleep from its nominal interval, e.g. 0.1.
+        """
+        clock = clock or RealTimeClock()
+        emit = emit or self._emit
+        end = None if duration is None else clock.now() + duration
+        while end is None or clock.now() < end:
+            fields = {'signal': self.simulate_signal(), 'movement': self.simulate_movement(),
+                      'breathing': self.simulate_breathing()}
+            await emit('wifi_reading', fields)
+            await clock.asleep(jittered(2, jitter, self.rng))
+
+    async def _emit(self, event, fields):
+        self.sink.emit(event, fields)
 
 if __name__ == "__main__":
     # Instantiate and run the WiFi simulator
@@ -5,7 +5,8 @@
 #
 # This feature file describes the scenarios for evaluating WiFi performance based on combined environmental
 # and embedded system factors using the CombinedSimulator.
-# It includes scenarios for determining WiFi performance levels (Excellent, Ideal, Optimized, Poor).
+# It includes scenarios for determining WiFi performance levels (Excellent, Ideal, Optimized, Poor). Scenarios for a
+# specific level draw their inputs from that level's conditional distribution, so they are deterministic.
 #
 # Feature: Describes the high-level behavior of the combined simulation.
 # Scenario: Defines specific situations and expected outcomes for the simulation.
@@ -17,17 +18,22 @@ Feature: Combined Simulation
 
   Scenario: Evaluate WiFi performance as Excellent
     Given the combined simulator is running
-    When I evaluate performance
+    When I evaluate performance for a "Excellent" sample
     Then the WiFi performance should be "Excellent"
 
   Scenario: Evaluate WiFi performance as Optimized
     Given the combined simulator is running
-    When I evaluate performance
+    When I evaluate performance for a "Optimized" sample
     Then the WiFi performance should be "Optimized"
 
+  Scenario: Evaluate WiFi performance as Ideal
+    Given the combined simulator is running
+    When I evaluate performance for a "Ideal" sample
+    Then the WiFi performance should be "Ideal"
+
   Scenario: Evaluate WiFi performance as Poor
     Given the combined simulator is running
-    When I evaluate performance
+    When I evaluate performance for a "Poor" sample
     Then the WiFi performance should be "Poor"
 
   Scenario: Evaluate WiFi performance as Normal
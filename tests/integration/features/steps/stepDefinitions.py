@@ -292,6 +292,18 @@ def step_impl(context):
     """
     context.performance = context.simulator.evaluate_performance()
 
+@when('I evaluate performance for a "{label}" sample')
+def step_impl(context, label):
+    """
+    Draws one input sample from the conditional distribution of a performance level and evaluates it.
+
+    Args:
+        context: Behave context object for sharing data between steps.
+        label: The performance level to draw a sample for.
+    """
+    sample = context.simulator.sample_given(label, 1)
+    context.performance = context.simulator.classify_performance(*sample.row(0))
+
 @then('the WiFi performance should be "Excellent"')
 def step_impl(context):
     """
@@ -322,6 +334,16 @@ def step_impl(context):
     """
     assert context.performance == 'Optimized'
 
+@then('the WiFi performance should be "Poor"')
+def step_impl(context):
+    """
+    Verifies that the WiFi performance is evaluated as "Poor".
+
+    Args:
+        context: Behave context object for sharing data between steps.
+    """
+    assert context.performance == 'Poor'
+
 @then('the WiFi performance should not be "Poor"')
 def step_impl(context):
     """
@@ -0,0 +1,61 @@
+"""
+Unit Tests for BreathingEstimator
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the BreathingEstimator class, including tests for the sliding DFT against
+an exact DFT, and for estimating breathing labels from simulated CSI.
+
+Modules:
+    - numpy: Provides the test streams.
+    - pytest: Provides approximate comparisons.
+    - scripts.breathingEstimator: Imports the estimator to be tested.
+    - scripts.csiGenerator: Provides the simulated CSI streams.
+
+Tests:
+    - test_sliding_dft_matches_exact: Verifies that incremental updates track the exact DFT of the window.
+    - test_pure_tone_rate: Verifies the interpolated rate of a sinusoid between bins.
+    - test_labels_from_csi: Verifies that every link's breathing label is recovered from simulated CSI.
+"""
+
+import numpy as np
+import pytest
+from scripts.breathingEstimator import BreathingEstimator, csi_amplitude
+from scripts.csiGenerator import CSIGenerator
+
+def test_sliding_dft_matches_exact():
+    """
+    Tests that single-sample and block updates leave the same spectrum as an exact DFT of the window.
+    """
+    estimator = BreathingEstimator(n_links=3, sample_rate=10, window_seconds=20)
+    stream = np.random.default_rng(0).random((437, 3))
+    for frame in stream[:100]:
+        estimator.update(frame)
+    estimator.update(stream[100:])
+    incremental = estimator._spectrum.copy()
+    estimator._refresh()
+    np.testing.assert_allclose(incremental, estimator._spectrum, atol=1e-9)
+
+def test_pure_tone_rate():
+    """
+    Tests that a 17 breaths per minute sinusoid, between two DFT bins, is estimated close to its rate.
+    """
+    estimator = BreathingEstimator(sample_rate=20, window_seconds=30)
+    time = np.arange(1200) / 20
+    assert np.isnan(estimator.rates()[0])
+    estimator.update(np.sin(2 * np.pi * 17 / 60 * time)[:, None])
+    assert estimator.ready
+    assert estimator.rates()[0] == pytest.approx(17, abs=0.5)
+
+def test_labels_from_csi():
+    """
+    Tests that the breathing pattern behind each link's simulated CSI is recovered.
+    """
+    patterns = ['Normal', 'Fast', 'Slow']
+    stream = np.stack([csi_amplitude(CSIGenerator(rng=seed).generate(3500, breathing=pattern))
+                       for seed, pattern in enumerate(patterns)], axis=1)
+    estimator = BreathingEstimator(n_links=3)
+    for frame in stream:
+        estimator.update(frame)
+    assert estimator.labels() == patterns
@@ -0,0 +1,86 @@
+"""
+Unit Tests for CSIGenerator
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the CSIGenerator class, including tests for buffer reuse, the breathing
+modulation, signal-dependent noise, and frames driven by WiFiSimulator batches.
+
+Modules:
+    - numpy: Provides the spectral checks.
+    - pytest: Provides exception checks.
+    - scripts.csiGenerator: Imports the CSIGenerator class to be tested.
+    - scripts.wifiSimulation: Imports the WiFiSimulator driving the frames.
+
+Tests:
+    - test_fills_preallocated_buffer: Verifies the frame shape and that frames are written into a given buffer.
+    - test_breathing_rate_is_visible: Verifies that the breathing rate is the dominant frequency of the phase.
+    - test_signal_controls_noise: Verifies that weaker signals make noisier frames.
+    - test_generate_batch: Verifies frames driven by a batch of simulator samples and seed reproducibility.
+    - test_walk_stays_in_room: Verifies that a long walk keeps the reflected path within the room.
+"""
+
+import numpy as np
+import pytest
+from scripts.csiGenerator import BREATHING_RATES_BPM, PATH_LENGTH_RANGE, CSIGenerator
+from scripts.wifiSimulation import WiFiSimulator
+
+def test_fills_preallocated_buffer():
+    """
+    Tests that generate writes complex64 frames into a preallocated buffer and rejects mismatched buffers.
+    """
+    generator = CSIGenerator(n_antennas=2, n_subcarriers=56, rng=1)
+    out = np.empty((100, 2, 56), dtype=np.complex64)
+    assert generator.generate(100, out=out) is out
+    assert generator.frame == 100
+    with pytest.raises(ValueError):
+        generator.generate(10, out=out)
+
+@pytest.mark.parametrize("breathing", ['Normal', 'Fast', 'Slow'])
+def test_breathing_rate_is_visible(breathing):
+    """
+    Tests that the antenna phase difference of a still person oscillates at the breathing rate.
+
+    Args:
+        breathing (str): The breathing pattern to generate.
+    """
+    generator = CSIGenerator(rng=2)
+    frames = generator.generate(6000, breathing=breathing)
+    phase = np.unwrap(np.angle(frames[:, 0, 10] * np.conj(frames[:, 1, 10])))
+    spectrum = np.abs(np.fft.rfft(phase - phase.mean()))
+    frequencies = np.fft.rfftfreq(len(phase), 1 / generator.sample_rate)
+    peak = frequencies[1 + np.argmax(spectrum[1:])]
+    assert peak * 60 == pytest.approx(BREATHING_RATES_BPM[breathing], abs=1)
+
+def test_signal_controls_noise():
+    """
+    Tests that frames of a weak signal deviate more from their mean than frames of a strong signal.
+    """
+    strong = CSIGenerator(rng=3).generate(2000, signal='Strong')
+    weak = CSIGenerator(rng=3).generate(2000, signal='Weak')
+    spread = lambda frames: np.std(np.abs(frames[:, 0, 0]))
+    assert spread(weak) > 2 * spread(strong)
+
+def test_generate_batch():
+    """
+    Tests that each simulator sample drives one segment of frames and that a seed reproduces the frames.
+    """
+    batch = WiFiSimulator(rng=4).simulate_batch(5)
+    frames = CSIGenerator(rng=5).generate_batch(batch, frames_per_sample=50)
+    assert frames.shape == (250, 3, 30)
+    np.testing.assert_array_equal(frames, CSIGenerator(rng=5).generate_batch(batch, frames_per_sample=50))
+
+def test_walk_stays_in_room():
+    """
+    Tests that the path length of the reflection stays within the room over minutes of running, while still
+    covering most of it.
+    """
+    generator = CSIGenerator(n_antennas=1, n_subcarriers=1, rng=6)
+    low, high = PATH_LENGTH_RANGE
+    lengths = []
+    for _ in range(60):
+        generator.generate(500, movement='Running')
+        lengths.append(high - abs(generator._walk - (high - low)))
+    assert low <= min(lengths) and max(lengths) <= high
+    assert max(lengths) - min(lengths) > (high - low) / 2
@@ -0,0 +1,110 @@
+"""
+Unit Tests for the Climate Model
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the ClimateModel class, including tests for the diurnal and seasonal cycles,
+humidity coupling, weather anomalies, chunked series and the simulators reading it.
+
+Modules:
+    - numpy: Provides the series statistics.
+    - pytest: Provides the testing framework.
+    - scripts.climateModel: Imports the ClimateModel class to be tested.
+    - scripts.environmentalSimulation: Provides the simulator reading the model.
+    - scripts.fleet: Provides the fleet whose devices read the model.
+    - scripts.outputSinks: Silences the simulators.
+
+Tests:
+    - test_cycles: Verifies the coldest day, the warmest hour and the humidity's coupling to temperature.
+    - test_weather_anomaly: Verifies the spread and correlation time of the weather anomaly.
+    - test_chunks_match_series: Verifies that chunked and earlier readings continue one consistent series.
+    - test_simulators_read_climate: Verifies simulator and fleet readings and one model evaluation per reading.
+"""
+
+import numpy as np
+import pytest
+from scripts.climateModel import DAY, ClimateModel
+from scripts.environmentalSimulation import EnvironmentalSimulator
+from scripts.fleet import Fleet
+from scripts.outputSinks import NullSink
+
+def test_cycles():
+    """
+    Tests that without weather and noise the coldest day, the warmest hour and per-site means are as configured
+    and that humidity falls as the temperature rises.
+    """
+    quiet = {'weather': 0, 'humidity_weather': 0, 'noise': 0}
+    model = ClimateModel(sites=2, mean=[5, 20], coldest_day=[15, 196], diurnal=0, **quiet)
+    temperature, _ = model.series(0, 365, step=DAY)
+    assert temperature.dtype == np.float32 and temperature.shape == (2, 365)
+    assert temperature[0].argmin() == 15 and temperature[1].argmin() == 196
+    assert temperature.mean(axis=1) == pytest.approx([5, 20], abs=0.1)
+    model = ClimateModel(sites=2, seasonal=0, warmest_hour=[15, 3], **quiet)
+    temperature, humidity = model.series(0, 24, step=3600)
+    assert temperature[0].argmax() == 15 and temperature[1].argmax() == 3
+    assert np.corrcoef(temperature[0], humidity[0])[0, 1] < -0.99
+    with pytest.raises(ValueError):
+        ClimateModel(weather_days=0)
+
+def test_weather_anomaly():
+    """
+    Tests that the weather anomaly has the configured standard deviation and decays over its correlation time.
+    """
+    model = ClimateModel(weather=3, weather_days=2, noise=0, rng=1)
+    cycles = ClimateModel(weather=0, humidity_weather=0, noise=0)
+    anomaly = (model.series(0, 50_000, step=3600)[0] - cycles.series(0, 50_000, step=3600)[0])[0]
+    assert anomaly.std() == pytest.approx(3, rel=0.15)
+    lag = 48
+    assert np.corrcoef(anomaly[:-lag], anomaly[lag:])[0, 1] == pytest.approx(np.exp(-1), abs=0.1)
+
+def test_chunks_match_series():
+    """
+    Tests that chunks concatenate to the series of the same times and that earlier times extend the weather
+    consistently.
+    """
+    model = ClimateModel.random_sites(3, rng=2, noise=0)
+    later = model.series(40 * DAY, 1000, step=2)
+    chunks = list(model.chunks(40 * DAY, 1000, step=2, chunk_size=300))
+    assert [chunk[0] for chunk in chunks] == [0, 300, 600, 900]
+    assert np.allclose(np.concatenate([chunk[1] for chunk in chunks], axis=1), later[0])
+    model.series(0, 10, step=3600)
+    assert np.allclose(model.series(40 * DAY, 1000, step=2)[1], later[1])
+    humidity = model.series(0, 10_000, step=600)[1]
+    assert humidity.min() >= 0 and humidity.max() <= 100
+
+def test_simulators_read_climate():
+    """
+    Tests that an EnvironmentalSimulator reads its site at its scheduled time and that a fleet reads one site
+    per device at the fleet's time, evaluating the model once for the temperature and humidity of a reading.
+    """
+    def counted(model):
+        evaluations = []
+        sample = model.sample
+        model.sample = lambda time, sites: evaluations.append(time) or sample(time, sites)
+        return evaluations
+
+    model = ClimateModel(sites=2, mean=[0, 30], seasonal=0, diurnal=0, weather=0, humidity_weather=0, noise=0)
+    evaluations = counted(model)
+    simulator = EnvironmentalSimulator(rng=3, sink=NullSink())
+    simulator.climate_model = model
+    simulator.site = 1
+    assert simulator.simulate_temperature() == pytest.approx(30)
+    assert simulator.simulate_humidity() == pytest.approx(65)
+    assert len(evaluations) == 1
+    simulator.simulate_temperature()
+    assert len(evaluations) == 2
+    batch = simulator.simulate_temperature_batch(5)
+    assert batch.dtype == np.float32 and batch.tolist() == pytest.approx([0, 30, 0, 30, 0])
+    climate = ClimateModel.random_sites(4, rng=5, noise=0)
+    fleet = Fleet(10, rng=4)
+    fleet.simulator.environmental_simulator.climate_model = climate
+    fleet = Fleet(10, simulator=fleet.simulator)
+    evaluations = counted(climate)
+    fleet.tick(30)
+    assert len(evaluations) == len(set(evaluations)) == 30 and evaluations[-1] == fleet.time
+    temperature, humidity = climate.at(fleet.time, noise=False)
+    assert fleet.temperature.dtype == np.float32
+    assert np.allclose(fleet.temperature, temperature[np.arange(10) % 4])
+    assert np.allclose(fleet.humidity, humidity[np.arange(10) % 4])
+    assert sum(fleet.counts().values()) == 10
@@ -0,0 +1,70 @@
+"""
+Unit Tests for the Simulation Clocks
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the clocks, including tests for virtual and scaled time and for
+running the simulators' loops on accelerated clocks.
+
+Modules:
+    - time: Provides the wall-clock measurements.
+    - scripts.clock: Imports the clocks to be tested.
+    - scripts.wifiSimulation, scripts.embeddedSystem: Import the simulators whose run loops are paced.
+
+Tests:
+    - test_real_time_clock: Verifies that real time is wall-clock time.
+    - test_virtual_clock: Verifies that sleeping advances virtual time instantly.
+    - test_scaled_clock: Verifies that a scaled clock sleeps for a fraction of the simulated time.
+    - test_run_cadence: Verifies that accelerated runs keep the 2 s and 5 s cadences.
+"""
+
+import time
+from scripts.clock import RealTimeClock, ScaledClock, VirtualClock
+from scripts.wifiSimulation import WiFiSimulator
+from scripts.embeddedSystem import EmbeddedSystemSimulator
+
+def test_real_time_clock():
+    """
+    Tests that RealTimeClock reads seconds since the Unix epoch, as the climate model expects.
+    """
+    clock = RealTimeClock()
+    assert abs(clock.now() - time.time()) < 0.1
+    before = clock.now()
+    clock.sleep(0.01)
+    assert clock.now() - before >= 0.01
+
+def test_virtual_clock():
+    """
+    Tests that VirtualClock advances simulated time on sleep without waiting.
+    """
+    clock = VirtualClock(start=10)
+    started = time.monotonic()
+    clock.sleep(86400)
+    assert clock.now() == 86410
+    assert time.monotonic() - started < 0.1
+
+def test_scaled_clock():
+    """
+    Tests that ScaledClock sleeps for the simulated duration divided by the speedup.
+    """
+    clock = ScaledClock(1000)
+    started = time.monotonic()
+    clock.sleep(50)
+    elapsed = time.monotonic() - started
+    assert 0.04 <= elapsed < 0.5
+    assert clock.now() >= 50
+
+def test_run_cadence(capsys):
+    """
+    Tests that the WiFi loop ticks every 2 s and the embedded loop every 5 s on a virtual clock.
+
+    Args:
+        capsys: The pytest fixture capturing printed output.
+    """
+    WiFiSimulator(rng=1).run(VirtualClock(), duration=60)
+    EmbeddedSystemSimulator(rng=1).run(VirtualClock(), duration=60)
+    output = capsys.readouterr().out
+    assert output.count("Detected signal") == 30
+    assert output.count("Sending data") == 6
+    assert output.count("Received response") == 6
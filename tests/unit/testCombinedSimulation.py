@@ -1,5 +1,7 @@
 import pytest
-from scripts.combinedSimulation import CombinedSimulator
+from scripts.combinedSimulation import CombinedSimulator, PERFORMANCE_LABELS
+from scripts.climateModel import ClimateModel
+from scripts.stateModels import MarkovChain
 
 @pytest.fixture
 def simulator():
@@ -23,3 +25,122 @@ def test_evaluate_performance(simulator):
     performance = simulator.evaluate_performance()
     print(f"Evaluated Performance: {performance}")
     assert performance in ['Optimized', 'Excellent'], f"Test failed: Performance is {performance}"
+
+def test_evaluate_arrays_matches_rules(simulator):
+    """
+    Tests that evaluate_arrays agrees with classify_performance on every categorical combination.
+
+    Args:
+        simulator (CombinedSimulator): The CombinedSimulator instance provided by the fixture.
+    """
+    wifi = simulator.wifi_simulator
+    responses = simulator.embedded_simulator.responses
+    for temperature, humidity in [(25, 45), (12, 65), (-5, 90), (45, 50)]:
+        for r, response in enumerate(responses):
+            for s, signal in enumerate(wifi.signals):
+                for m, movement in enumerate(wifi.movements):
+                    codes, _ = simulator.evaluate_arrays([temperature], [humidity], [r], [s], [m])
+                    expected = simulator.classify_performance(temperature, humidity, response, signal, movement)
+                    assert PERFORMANCE_LABELS[codes[0]] == expected
+
+def test_evaluate_performance_batch(simulator):
+    """
+    Tests that evaluate_performance_batch returns one label code per sample and consistent counts.
+
+    Args:
+        simulator (CombinedSimulator): The CombinedSimulator instance provided by the fixture.
+    """
+    codes, counts = simulator.evaluate_performance_batch(10000)
+    assert len(codes) == 10000
+    assert set(counts) == set(PERFORMANCE_LABELS)
+    assert sum(counts.values()) == 10000
+    assert counts['Poor'] > counts['Excellent']
+
+def test_performance_distribution_matches_enumeration(simulator):
+    """
+    Tests that performance_distribution matches a brute-force enumeration of classify_performance.
+
+    Args:
+        simulator (CombinedSimulator): The CombinedSimulator instance provided by the fixture.
+    """
+    wifi = simulator.wifi_simulator
+    environment = simulator.environmental_simulator
+    counts = dict.fromkeys(PERFORMANCE_LABELS, 0)
+    for signal in wifi.signals:
+        for movement in wifi.movements:
+            for response in simulator.embedded_simulator.responses:
+                for temperature in environment.temperatures:
+                    for humidity in environment.humidities:
+                        counts[simulator.classify_performance(temperature, humidity, response, signal, movement)] += 1
+    total = sum(counts.values())
+    distribution = simulator.performance_distribution()
+    for label in PERFORMANCE_LABELS:
+        assert distribution[label] == pytest.approx(counts[label] / total, abs=1e-12)
+
+def test_performance_distribution_with_weights(simulator):
+    """
+    Tests that performance_distribution honors weights configured on the simulators.
+
+    Args:
+        simulator (CombinedSimulator): The CombinedSimulator instance provided by the fixture.
+    """
+    simulator.wifi_simulator.signal_weights = [1, 0, 0]
+    simulator.wifi_simulator.movement_weights = [1, 0, 0, 0]
+    simulator.embedded_simulator.response_weights = [1, 0, 0]
+    distribution = simulator.performance_distribution()
+    assert distribution['Excellent'] == pytest.approx(11 / 51 * 31 / 101)
+    assert distribution['Poor'] == 0
+
+def test_sample_given(simulator):
+    """
+    Tests that sample_given only draws inputs that classify as the requested performance level.
+
+    Args:
+        simulator (CombinedSimulator): The CombinedSimulator instance provided by the fixture.
+    """
+    for label in PERFORMANCE_LABELS:
+        batch, weights = simulator.sample_given(label, 5000, return_weights=True)
+        codes, counts = simulator.evaluate_arrays(*batch.columns())
+        assert counts[label] == 5000
+        assert simulator.classify_performance(*batch.row(0)) == label
+        assert weights[0] == pytest.approx(simulator.performance_distribution()[label])
+
+def test_sample_given_impossible_label(simulator):
+    """
+    Tests that sample_given rejects unknown levels and levels with probability zero.
+
+    Args:
+        simulator (CombinedSimulator): The CombinedSimulator instance provided by the fixture.
+    """
+    with pytest.raises(ValueError):
+        simulator.sample_given('Normal', 1)
+    simulator.wifi_simulator.signal_weights = [0, 0, 1]
+    with pytest.raises(ValueError):
+        simulator.sample_given('Excellent', 1)
+
+def test_exact_methods_reject_models(simulator):
+    """
+    Tests that performance_distribution and sample_given refuse to enumerate when a temporal or climate model is
+    set, since the result would not describe what the simulators draw.
+
+    Args:
+        simulator (CombinedSimulator): The CombinedSimulator instance provided by the fixture.
+    """
+    simulator.environmental_simulator.climate_model = ClimateModel(rng=1)
+    with pytest.raises(ValueError, match="climate_model"):
+        simulator.performance_distribution()
+    simulator.environmental_simulator.climate_model = None
+    simulator.wifi_simulator.signal_model = MarkovChain.sticky(len(simulator.wifi_simulator.signals), 0.9)
+    with pytest.raises(ValueError, match="signal_model"):
+        simulator.sample_given('Optimized', 10)
+
+def test_seeded_runs_reproducible():
+    """
+    Tests that simulators with the same seed, and their spawned copies, produce identical evaluations.
+    """
+    first, second = CombinedSimulator(rng=11), CombinedSimulator(rng=11)
+    assert first.evaluate_performance_batch(1000)[0].tolist() == second.evaluate_performance_batch(1000)[0].tolist()
+    shards = [child.evaluate_performance_batch(1000)[0].tolist() for child in CombinedSimulator(rng=11).spawn(2)]
+    again = [child.evaluate_performance_batch(1000)[0].tolist() for child in CombinedSimulator(rng=11).spawn(2)]
+    assert shards == again
+    assert shards[0] != shards[1]
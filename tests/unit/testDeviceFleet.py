@@ -0,0 +1,75 @@
+"""
+Unit Tests for DeviceFleet
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the async simulator loops and the DeviceFleet class, including tests for
+consuming a mixed fleet, backpressure from bounded queues, and consumer errors.
+
+Modules:
+    - asyncio: Runs the async loops.
+    - collections: Counts the consumed readings.
+    - scripts.deviceFleet: Imports the DeviceFleet class to be tested.
+    - scripts.clock: Provides the clocks that accelerate the runs.
+    - scripts.wifiSimulation: Imports the WiFiSimulator whose async loop is tested.
+
+Tests:
+    - test_arun_emits_readings: Verifies that arun emits one reading per interval to an async callable.
+    - test_fleet_consumes_every_reading: Verifies that every produced reading reaches the shared consumer.
+    - test_fleet_backpressure_and_errors: Verifies that a slow consumer blocks the devices and that its errors are counted.
+"""
+
+import asyncio
+import collections
+from scripts.deviceFleet import DeviceFleet
+from scripts.clock import ScaledClock, VirtualClock
+from scripts.wifiSimulation import WiFiSimulator
+
+def test_arun_emits_readings():
+    """
+    Tests that WiFiSimulator.arun emits a reading every 2 simulated seconds through the given callable.
+    """
+    readings = []
+
+    async def emit(event, fields):
+        readings.append((event, fields))
+
+    asyncio.run(WiFiSimulator(rng=1).arun(VirtualClock(), duration=20, emit=emit))
+    assert len(readings) == 10
+    assert all(event == 'wifi_reading' and set(fields) == {'signal', 'movement', 'breathing'}
+               for event, fields in readings)
+
+def test_fleet_consumes_every_reading():
+    """
+    Tests that a mixed fleet delivers every reading of every device to the consumer.
+    """
+    received = collections.Counter()
+    fleet = DeviceFleet(wifi=300, embedded=100, environmental=100, rng=2, partitions=4)
+    stats = fleet.run(lambda device_id, event, fields: received.update([event]), duration=30,
+                      clock=ScaledClock(500))
+    assert stats['devices'] == 500
+    assert stats['produced'] == stats['consumed'] == sum(received.values())
+    assert set(received) == {'wifi_reading', 'send', 'receive', 'environment_reading'}
+    assert stats['errors'] == 0
+
+def test_fleet_backpressure_and_errors():
+    """
+    Tests that a slow async consumer fills the queues and makes the devices wait, so they produce fewer readings
+    than against a fast consumer, and that its errors are counted.
+    """
+    async def consumer(device_id, event, fields):
+        await asyncio.sleep(0.001)
+        if device_id % 10 == 0:
+            raise RuntimeError("rejected")
+
+    async def free_running(device_id, event, fields):
+        pass
+
+    fleet = DeviceFleet(wifi=200, rng=3, queue_size=8)
+    baseline = fleet.run(free_running, duration=10, clock=ScaledClock(50))
+    stats = fleet.run(consumer, duration=10, clock=ScaledClock(50))
+    assert stats['max_queue_depth'] == 8 and stats['blocked'] > 0
+    assert stats['produced'] < baseline['produced'] / 2
+    assert stats['errors'] > 0
+    assert stats['consumed'] + stats['errors'] == stats['produced']
@@ -16,6 +16,7 @@ Tests:
     - test_receive_data: Verifies that the response received is one of the expected values.
     - test_invalid_send_data: Verifies that the data sent is not an invalid value.
     - test_invalid_receive_data: Verifies that the response received is not an invalid value.
+    - test_receive_data_batch: Verifies that batch response codes index into the response label table.
 """
 
 import pytest
@@ -70,3 +71,15 @@ def test_invalid_receive_data(simulator):
     """
     response = simulator.receive_data()
     assert response == 'Invalid Response', "Test failed intentionally: response is not 'Invalid Response'"
+
+def test_receive_data_batch(simulator):
+    """
+    Tests the receive_data_batch method of EmbeddedSystemSimulator.
+
+    Args:
+        simulator: The EmbeddedSystemSimulator instance provided by the fixture.
+    """
+    codes, labels = simulator.receive_data_batch(5000)
+    assert labels == ('Acknowledge', 'Error', 'Timeout')
+    assert len(codes) == 5000
+    assert codes.max() < len(labels)
@@ -16,6 +16,8 @@ Tests:
     - test_humidity: Verifies that the simulated humidity is within the expected range.
     - test_invalid_temperature: Verifies that the simulated temperature is not an invalid value.
     - test_invalid_humidity: Verifies that the simulated humidity is not an invalid value.
+    - test_temperature_batch: Verifies that batch temperatures are within the expected range.
+    - test_humidity_batch: Verifies that batch humidities are within the expected range.
 """
 
 import pytest
@@ -70,3 +72,25 @@ def test_invalid_humidity(simulator):
     """
     humidity = simulator.simulate_humidity()
     assert humidity < 0 or humidity > 100, "Test failed intentionally: humidity is within the valid range"
+
+def test_temperature_batch(simulator):
+    """
+    Tests the simulate_temperature_batch method of EnvironmentalSimulator.
+
+    Args:
+        simulator: The EnvironmentalSimulator instance provided by the fixture.
+    """
+    temperatures = simulator.simulate_temperature_batch(5000)
+    assert len(temperatures) == 5000
+    assert temperatures.min() >= -10 and temperatures.max() <= 40
+
+def test_humidity_batch(simulator):
+    """
+    Tests the simulate_humidity_batch method of EnvironmentalSimulator.
+
+    Args:
+        simulator: The EnvironmentalSimulator instance provided by the fixture.
+    """
+    humidities = simulator.simulate_humidity_batch(5000)
+    assert len(humidities) == 5000
+    assert humidities.min() >= 0 and humidities.max() <= 100
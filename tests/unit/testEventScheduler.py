@@ -0,0 +1,106 @@
+"""
+Unit Tests for EventScheduler
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the EventScheduler class, including tests for event ordering, periodic,
+stochastic and cancelled events, and for simulators registered on a shared scheduler.
+
+Modules:
+    - scripts.eventScheduler: Imports the EventScheduler class to be tested.
+    - scripts.combinedSimulation: Imports the CombinedSimulator registered on the scheduler.
+
+Tests:
+    - test_time_order: Verifies that events fire in time order, and same-time events in scheduling order.
+    - test_same_time_order_across_periods: Verifies that repeating events keep their registration order.
+    - test_periodic_and_until: Verifies periodic occurrences and that run stops at the until time.
+    - test_stochastic_and_cancel: Verifies stochastic intervals and cancelling a repeating event.
+    - test_combined_sees_latest_state: Verifies that scheduled evaluations classify the components' latest state.
+"""
+
+from scripts.eventScheduler import EventScheduler
+from scripts.combinedSimulation import CombinedSimulator
+
+def test_time_order():
+    """
+    Tests that events fire in time order and that events due at the same time keep their scheduling order.
+    """
+    scheduler = EventScheduler()
+    fired = []
+    scheduler.schedule_at(3, lambda s: fired.append('c'))
+    scheduler.schedule_at(1, lambda s: fired.append('a'))
+    scheduler.schedule_at(3, lambda s: fired.append('d'))
+    scheduler.schedule_after(2, lambda s: fired.append('b'))
+    assert scheduler.run() == 4
+    assert fired == ['a', 'b', 'c', 'd']
+    assert scheduler.now() == 3
+
+def test_same_time_order_across_periods():
+    """
+    Tests that periodic events with different intervals fire in registration order whenever they are due at the
+    same time, and that a combined evaluation at a faster WiFi cadence classifies the WiFi state of its own time.
+    """
+    scheduler = EventScheduler()
+    fired = []
+    scheduler.schedule_periodic(1, lambda s: fired.append(('fast', s.now())))
+    scheduler.schedule_periodic(2, lambda s: fired.append(('slow', s.now())))
+    scheduler.run(until=6)
+    assert [event for event in fired if event[1] % 2 == 0] == [(name, time) for time in (0, 2, 4, 6)
+                                                                for name in ('fast', 'slow')]
+    scheduler = EventScheduler()
+    simulator = CombinedSimulator(rng=5)
+    sensed = []
+    simulate_signal = simulator.wifi_simulator.simulate_signal
+    simulator.wifi_simulator.simulate_signal = lambda: sensed.append(scheduler.now()) or simulate_signal()
+    evaluations = []
+    simulator.schedule(scheduler, interval=2, wifi_interval=1,
+                       on_evaluation=lambda time, performance: evaluations.append(sensed[-1] == time))
+    scheduler.run(until=60)
+    assert len(evaluations) == 31 and all(evaluations)
+
+def test_periodic_and_until():
+    """
+    Tests that a periodic event fires once per interval and that run advances the clock to the until time.
+    """
+    scheduler = EventScheduler()
+    times = []
+    scheduler.schedule_periodic(5, lambda s: times.append(s.now()))
+    scheduler.run(until=22)
+    assert times == [0, 5, 10, 15, 20]
+    assert scheduler.now() == 22
+
+def test_stochastic_and_cancel():
+    """
+    Tests that a stochastic event uses the drawn intervals and that cancel stops future occurrences.
+    """
+    scheduler = EventScheduler()
+    delays = iter([1, 2, 3, 4, 5])
+    times = []
+    handle = scheduler.schedule_stochastic(lambda: next(delays), lambda s: times.append(s.now()))
+    scheduler.run(until=6)
+    assert times == [1, 3, 6]
+    scheduler.cancel(handle)
+    assert scheduler.run(until=100) == 0
+
+def test_combined_sees_latest_state():
+    """
+    Tests that each scheduled evaluation classifies the latest state of the sub-simulators.
+    """
+    scheduler = EventScheduler()
+    simulator = CombinedSimulator(rng=4)
+    evaluations = []
+
+    def on_evaluation(time, performance):
+        wifi = simulator.wifi_simulator
+        environment = simulator.environmental_simulator
+        expected = simulator.classify_performance(environment.latest_temperature, environment.latest_humidity,
+                                                  simulator.embedded_simulator.latest_response,
+                                                  wifi.latest_signal, wifi.latest_movement)
+        evaluations.append((time, performance == expected))
+
+    simulator.schedule(scheduler, on_evaluation=on_evaluation)
+    scheduler.run(until=3600)
+    assert len(evaluations) == 1801
+    assert all(matches for _, matches in evaluations)
+    assert simulator.embedded_simulator.latest_data in ['Data1', 'Data2', 'Data3']
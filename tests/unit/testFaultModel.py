@@ -0,0 +1,113 @@
+"""
+Unit Tests for the Fault Model
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the GilbertElliott fault model, the RetryPolicy and the RetrySimulation,
+including tests for burst statistics, the closed-form retry analysis and the simulator's faulty link.
+
+Modules:
+    - numpy: Provides the outcome statistics.
+    - pytest: Provides the testing framework.
+    - scripts.faultModel: Imports the classes to be tested.
+    - scripts.embeddedSystem: Provides the simulator whose link is faulty.
+    - scripts.outputSinks: Silences the simulator.
+    - scripts.sampling: Provides seeded random streams.
+
+Tests:
+    - test_burst_statistics: Verifies the phase share, mean burst length and outcome rates of long streams.
+    - test_retry_matches_loop: Verifies the vectorized retry analysis against a message-by-message loop.
+    - test_policy_tradeoffs: Verifies that retries raise delivery and amplification and that timeouts bound latency.
+    - test_simulator_fault_model: Verifies that the simulator's responses follow its fault model.
+"""
+
+import numpy as np
+import pytest
+from scripts.faultModel import ACKNOWLEDGE, TIMEOUT, GilbertElliott, RetryPolicy, RetrySimulation
+from scripts.embeddedSystem import EmbeddedSystemSimulator
+from scripts.outputSinks import NullSink
+from scripts.sampling import make_stream
+
+def test_burst_statistics():
+    """
+    Tests that a million packets spend the configured share of time in bursts of the configured mean length and
+    that their outcomes follow the stationary outcome rates.
+    """
+    model = GilbertElliott.from_bursts(mean_burst=8, bad_fraction=0.1)
+    stream = make_stream(1)
+    phases = model.phases(1_000_000, rng=stream)
+    assert phases.dtype == np.uint8 and len(phases) == 1_000_000
+    assert abs(phases.mean() - 0.1) < 0.01
+    edges = np.diff(np.concatenate(([0], phases, [0])).astype(np.int8))
+    bursts = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+    assert abs(bursts.mean() - model.mean_burst()) < 0.3
+    codes, last = model.outcomes(1_000_000, rng=stream)
+    assert last in (0, 1)
+    assert np.allclose(np.bincount(codes, minlength=3) / len(codes), model.outcome_rates(), atol=0.005)
+    with pytest.raises(ValueError):
+        GilbertElliott(to_bad=0)
+
+def test_retry_matches_loop():
+    """
+    Tests that the closed-form retry analysis gives the same messages, deliveries and latencies as sending the
+    messages one at a time.
+    """
+    simulation = RetrySimulation(GilbertElliott.from_bursts(4, 0.2), spread=0.5, rng=make_stream(2))
+    policy = RetryPolicy(max_attempts=3, timeout=0.03, base_delay=0.01)
+    outcomes, round_trips = simulation.draw(5000)
+    report = simulation.run(policy, draws=(outcomes, round_trips))
+    delays = policy.delays()
+    latencies, messages, i = [], 0, 0
+    while i < len(outcomes):
+        seconds, delivered, start = 0.0, False, i
+        for attempt in range(policy.max_attempts):
+            if i == len(outcomes):
+                break
+            late = outcomes[i] == TIMEOUT or round_trips[i] > policy.timeout
+            seconds += policy.timeout if late else round_trips[i]
+            i += 1
+            if outcomes[i - 1] == ACKNOWLEDGE and not late:
+                delivered = True
+                break
+            seconds += delays[attempt]
+        else:
+            messages += 1
+            continue
+        if not delivered:
+            break
+        messages += 1
+        latencies.append(seconds)
+    assert report['messages'] == messages and report['delivered'] == len(latencies)
+    assert report['mean_latency'] == pytest.approx(np.mean(latencies))
+    assert report['p99'] == pytest.approx(np.quantile(latencies, 0.99))
+
+def test_policy_tradeoffs():
+    """
+    Tests that on common outcomes more attempts deliver more messages at the cost of more packets, and that a
+    shorter timeout lowers tail latency on a link losing packets.
+    """
+    simulation = RetrySimulation(GilbertElliott.from_bursts(10, 0.05), rng=make_stream(3))
+    single, retried, short = simulation.compare([RetryPolicy(max_attempts=1, timeout=0.5),
+                                                 RetryPolicy(max_attempts=5, timeout=0.5),
+                                                 RetryPolicy(max_attempts=5, timeout=0.05)], packets=200_000)
+    assert single['retry_amplification'] == 1.0
+    assert retried['delivery_ratio'] > single['delivery_ratio']
+    assert retried['retry_amplification'] > 1.0
+    assert short['p99'] < retried['p99'] and short['goodput'] > retried['goodput']
+    assert retried['delivered'] + retried['abandoned'] == retried['messages']
+
+def test_simulator_fault_model():
+    """
+    Tests that a simulator with a fault model draws bursty responses one at a time and as a continued sequence.
+    """
+    simulator = EmbeddedSystemSimulator(rng=4, sink=NullSink())
+    simulator.fault_model = GilbertElliott(to_bad=0.05, to_good=0.5, good=(1, 0, 0), bad=(0, 1, 1))
+    responses = [simulator.receive_data() for _ in range(500)]
+    assert set(responses) == {'Acknowledge', 'Error', 'Timeout'}
+    codes, labels = simulator.receive_data_sequence(100_000)
+    assert labels == tuple(simulator.responses)
+    failures = codes != ACKNOWLEDGE
+    assert abs(failures.mean() - 0.05 / 0.55) < 0.01
+    # Failures cluster: a failure follows a failure far more often than the failure rate
+    assert failures[1:][failures[:-1]].mean() > 0.4
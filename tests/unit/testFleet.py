@@ -0,0 +1,65 @@
+"""
+Unit Tests for Fleet
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the Fleet class, including tests for its compact state, vectorized ticks,
+staggered embedded responses, and per-device and aggregate views.
+
+Modules:
+    - numpy: Provides array comparisons.
+    - pytest: Provides exception checks.
+    - scripts.fleet: Imports the Fleet class to be tested.
+    - scripts.combinedSimulation: Imports the performance labels.
+
+Tests:
+    - test_compact_state: Verifies the bytes per device and the initial evaluation.
+    - test_tick_updates_in_place: Verifies that ticks keep views current and stagger embedded responses.
+    - test_views: Verifies the per-device, decoded, counted and selected views.
+"""
+
+import numpy as np
+import pytest
+from scripts.fleet import Fleet
+from scripts.combinedSimulation import PERFORMANCE_LABELS
+
+def test_compact_state():
+    """
+    Tests that each device takes a few bytes and that every device starts with an evaluated performance.
+    """
+    fleet = Fleet(10_000, rng=1)
+    assert fleet.nbytes / len(fleet) <= 16
+    codes, _ = fleet.simulator.evaluate_arrays(fleet.temperature, fleet.humidity, fleet.response,
+                                               fleet.signal, fleet.movement)
+    np.testing.assert_array_equal(codes, fleet.performance)
+
+def test_tick_updates_in_place():
+    """
+    Tests that ticks update the arrays in place and refresh each device's response once per response period.
+    """
+    fleet = Fleet(1_000, rng=2, response_period=5)
+    performance = fleet.performance
+    responses = fleet.response.copy()
+    counts = fleet.tick()
+    assert performance is fleet.performance
+    assert sum(counts.values()) == 1_000
+    assert fleet.time == 2
+    unchanged = np.ones(1_000, dtype=bool)
+    unchanged[1::5] = False
+    np.testing.assert_array_equal(fleet.response[unchanged], responses[unchanged])
+
+def test_views():
+    """
+    Tests that device, decode, counts and devices_with agree with each other.
+    """
+    fleet = Fleet(500, rng=3)
+    fleet.tick(3)
+    poor = fleet.devices_with('performance', 'Poor')
+    assert len(poor) == fleet.counts()['Poor']
+    assert set(fleet.decode('performance', poor)) <= {'Poor'}
+    assert fleet.device(int(poor[0]))['performance'] == 'Poor'
+    assert set(fleet.counts('signal')) == set(fleet.simulator.wifi_simulator.signals)
+    assert set(fleet.counts()) == set(PERFORMANCE_LABELS)
+    with pytest.raises(ValueError):
+        fleet.counts('temperature')
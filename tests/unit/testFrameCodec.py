@@ -0,0 +1,91 @@
+"""
+Unit Tests for the Frame Codec
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the binary frame codec, including tests for scalar and batch round trips,
+corrupt and truncated buffers, and the frames produced by the EmbeddedSystemSimulator.
+
+Modules:
+    - numpy: Provides the code arrays of the batches.
+    - pytest: Provides the testing framework.
+    - scripts.frameCodec: Imports the codec to be tested.
+    - scripts.embeddedSystem: Provides the simulator producing frames.
+    - scripts.outputSinks: Silences the simulator.
+
+Tests:
+    - test_scalar_round_trip: Verifies that one frame decodes to its fields and a zero-copy payload.
+    - test_batch_round_trip: Verifies batch encoding into a buffer and decoding of every frame.
+    - test_corrupt_and_truncated: Verifies strict errors, resynchronization and incomplete trailing frames.
+    - test_simulator_frames: Verifies the simulator's frames, sequence numbers and decoded labels.
+"""
+
+import numpy as np
+import pytest
+from scripts.frameCodec import (FRAME_DATA, FRAME_RESPONSE, OVERHEAD, decode_batch, decode_frame, encode_batch,
+                                encode_frame, frame_size)
+from scripts.embeddedSystem import EmbeddedSystemSimulator
+from scripts.outputSinks import NullSink
+
+def test_scalar_round_trip():
+    """
+    Tests that a frame decodes to its kind, code, wrapped sequence number and payload view.
+    """
+    frame = encode_frame(FRAME_DATA, 2, 2**32 + 7, b'Data3')
+    assert len(frame) == frame_size(5) == OVERHEAD + 5
+    buffer = bytearray(b'xx' + frame)
+    kind, code, sequence, payload, end = decode_frame(buffer, 2)
+    assert (kind, code, sequence, bytes(payload), end) == (FRAME_DATA, 2, 7, b'Data3', len(buffer))
+    buffer[2 + 10] = ord('Z')
+    assert payload[0] == ord('Z')
+
+def test_batch_round_trip():
+    """
+    Tests that a batch encoded into a preallocated buffer decodes to the same fields and payloads.
+    """
+    codes = np.array([0, 1, 2, 1], dtype=np.uint8)
+    payloads = [b'', b'a', b'bc', b'def']
+    out = bytearray(sum(map(len, payloads)) + 4 * OVERHEAD + 3)
+    frames = encode_batch([FRAME_DATA, FRAME_RESPONSE] * 2, codes, [5, 6, 7, 8], payloads, out)
+    assert frames.obj is out
+    batch = decode_batch(frames)
+    assert len(batch) == 4 and batch.errors == 0 and batch.consumed == len(frames)
+    assert batch.kind.tolist() == [0, 1, 0, 1]
+    assert np.array_equal(batch.code, codes) and batch.sequence.tolist() == [5, 6, 7, 8]
+    assert [bytes(batch.payload(i)) for i in range(4)] == payloads
+
+def test_corrupt_and_truncated():
+    """
+    Tests that corrupt frames raise in strict mode and are skipped otherwise, and that an incomplete trailing
+    frame is left unconsumed.
+    """
+    frames = bytearray(encode_batch(FRAME_RESPONSE, [0, 1, 2], [1, 2, 3]))
+    frames[OVERHEAD + 4] ^= 0xFF  # The sequence number of the second frame
+    with pytest.raises(ValueError):
+        decode_batch(frames)
+    with pytest.raises(ValueError):
+        decode_frame(frames, OVERHEAD)
+    batch = decode_batch(frames, strict=False)
+    assert batch.sequence.tolist() == [1, 3] and batch.errors == 1
+    partial = decode_batch(bytes(frames[:2 * OVERHEAD + 5]), strict=False)
+    assert partial.sequence.tolist() == [1] and partial.consumed == 2 * OVERHEAD
+    with pytest.raises(ValueError):
+        decode_frame(frames[:OVERHEAD - 1])
+
+def test_simulator_frames():
+    """
+    Tests that the simulator's scalar and batch frames decode to its values with consecutive sequence numbers.
+    """
+    simulator = EmbeddedSystemSimulator(rng=3, sink=NullSink())
+    kind, code, sequence, payload, _ = decode_frame(simulator.send_frame())
+    assert kind == FRAME_DATA and sequence == 0 and bytes(payload).decode() == simulator.data_values[code]
+    kind, code, sequence, payload, _ = decode_frame(simulator.receive_frame())
+    assert kind == FRAME_RESPONSE and sequence == 1 and len(payload) == 0
+    simulator.sequence = 2**32 - 2
+    responses = decode_batch(simulator.receive_frames_batch(1000))
+    assert responses.sequence[:3].tolist() == [2**32 - 2, 2**32 - 1, 0] and simulator.sequence == 998
+    assert set(responses.labels(simulator.responses)) <= set(simulator.responses)
+    data = decode_batch(simulator.send_frames_batch(1000))
+    labels = data.labels(simulator.data_values)
+    assert all(bytes(data.payload(i)).decode() == labels[i] for i in range(len(data)))
@@ -0,0 +1,135 @@
+"""
+Unit Tests for the Transports and Gateway
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the loopback transports, the stand-in Gateway and the GatewayBenchmark
+harness, including tests for round trips over every backend, sequence-matched responses and benchmark reports.
+
+Modules:
+    - asyncio: Runs the gateways and devices.
+    - pytest: Provides the testing framework.
+    - scripts.gateway: Imports the Gateway and GatewayBenchmark classes to be tested.
+    - scripts.transport: Imports the transports and the Channel class to be tested.
+    - scripts.embeddedSystem: Provides the devices.
+    - scripts.frameCodec: Encodes the data frames.
+    - scripts.outputSinks: Silences the devices.
+
+Tests:
+    - test_round_trip_every_transport: Verifies that devices exchange frames with a gateway over every backend.
+    - test_gateway_echoes_sequences: Verifies that pipelined requests get the responses echoing their sequences.
+    - test_channel_orders_full_queue: Verifies that requests pipelined past a full queue keep their responses.
+    - test_channel_fails_on_close: Verifies that outstanding requests fail when the gateway goes away.
+    - test_benchmark_report: Verifies the message count, latency percentiles and device sweep of the harness.
+"""
+
+import asyncio
+import pytest
+from scripts.gateway import Gateway, GatewayBenchmark
+from scripts.transport import Channel, QueueTransport, TcpTransport, UnixTransport
+from scripts.embeddedSystem import EmbeddedSystemSimulator
+from scripts.frameCodec import FRAME_DATA, encode_frame
+from scripts.outputSinks import NullSink
+
+@pytest.mark.parametrize('transport', [QueueTransport, UnixTransport, TcpTransport])
+def test_round_trip_every_transport(transport):
+    """
+    Tests that two devices sharing a channel exchange frames with an acknowledging gateway over every backend.
+    """
+    async def exchange():
+        gateway = Gateway(transport())
+        await gateway.start()
+        channel = await Channel.open(gateway.transport)
+        devices = [EmbeddedSystemSimulator(seed, NullSink()) for seed in (1, 2)]
+        responses = await asyncio.gather(*(device.aexchange(channel) for device in devices for _ in range(5)))
+        await channel.close()
+        await gateway.stop()
+        return gateway, devices, responses
+
+    gateway, devices, responses = asyncio.run(exchange())
+    assert responses == ['Acknowledge'] * 10
+    assert gateway.frames == 10 and gateway.errors == 0 and gateway.connections == 1
+    assert all(device.sequence == 5 and device.latest_response == 'Acknowledge' for device in devices)
+
+def test_gateway_echoes_sequences():
+    """
+    Tests that pipelined requests resolve to the response codes drawn by the gateway's simulator, in order, and
+    that a response echoing the wrong sequence number is reported.
+    """
+    async def exchange():
+        responder = EmbeddedSystemSimulator(7, NullSink())
+        expected, _ = EmbeddedSystemSimulator(7, NullSink()).receive_data_batch(20)
+        gateway = Gateway(QueueTransport(), responder)
+        await gateway.start()
+        channel = await Channel.open(gateway.transport)
+        codes = await asyncio.gather(*(channel.request(encode_frame(FRAME_DATA, 0, sequence), sequence)
+                                       for sequence in range(20)))
+        with pytest.raises(ValueError):
+            await channel.request(encode_frame(FRAME_DATA, 0, 100), 101)
+        await channel.close()
+        await gateway.stop()
+        return codes, expected.tolist()
+
+    codes, expected = asyncio.run(exchange())
+    assert codes == expected
+
+def test_channel_orders_full_queue():
+    """
+    Tests that many more requests than the queue holds, pipelined on one channel by devices that send again as
+    soon as they are answered, each get the response echoing their own sequence number.
+    """
+    async def exchange():
+        gateway = Gateway(QueueTransport(queue_size=1))
+        await gateway.start()
+        channel = await Channel.open(gateway.transport)
+
+        async def device(index):
+            return [await channel.request(encode_frame(FRAME_DATA, 0, sequence), sequence)
+                    for sequence in range(index * 10, index * 10 + 10)]
+
+        codes = await asyncio.gather(*(device(index) for index in range(50)))
+        await channel.close()
+        await gateway.stop()
+        return codes, gateway.frames
+
+    codes, frames = asyncio.run(exchange())
+    assert codes == [[0] * 10] * 50 and frames == 500
+
+def test_channel_fails_on_close():
+    """
+    Tests that a request waiting on a gateway that stops fails with a ConnectionError instead of hanging.
+    """
+    class Silent(Gateway):
+        async def _handle(self, connection):
+            while await connection.recv():
+                pass
+
+    async def exchange():
+        gateway = Silent(TcpTransport())
+        await gateway.start()
+        channel = await Channel.open(gateway.transport)
+        request = asyncio.create_task(channel.request(encode_frame(FRAME_DATA, 0, 0), 0))
+        await asyncio.sleep(0.01)
+        await gateway.stop()
+        with pytest.raises(ConnectionError):
+            await asyncio.wait_for(request, 5)
+        await channel.close()
+
+    asyncio.run(exchange())
+
+def test_benchmark_report():
+    """
+    Tests that the harness sends every message over pooled channels and reports ordered latency percentiles,
+    and that a sweep drives growing subsets of the devices against one gateway.
+    """
+    benchmark = GatewayBenchmark(UnixTransport(), devices=20, connections=4, rng=3)
+    report = benchmark.run(messages_per_device=10)
+    assert report['devices'] == 20 and report['connections'] == 4
+    assert report['messages'] == 200 and report['errors'] == 0
+    assert report['messages_per_second'] > 0
+    assert 0 < report['p50'] <= report['p99']
+    reports = benchmark.sweep([5, 20], messages_per_device=3)
+    assert [report['messages'] for report in reports] == [15, 60]
+    with pytest.raises(ValueError):
+        benchmark.run(messages_per_device=1, devices=21)
@@ -0,0 +1,37 @@
+"""
+Unit Tests for the Latency Histograms
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the log-bucketed latency histogram, including tests for quantile bounds,
+latency budgets and merging.
+
+Modules:
+    - numpy: Provides the recorded latencies.
+    - pytest: Provides approximate comparisons.
+    - scripts.latencyHistogram: Imports the LatencyHistogram class to be tested.
+
+Tests:
+    - test_latency_histogram: Verifies quantile bounds, budgets and merging.
+"""
+
+import numpy as np
+import pytest
+from scripts.latencyHistogram import LatencyHistogram
+
+def test_latency_histogram():
+    """
+    Tests that quantiles are bucket upper bounds and that merged histograms add their counts.
+    """
+    histogram = LatencyHistogram()
+    histogram.record(np.full(99, 0.010))
+    histogram.record(2.0)
+    assert 0.010 <= histogram.quantile(0.5) < 0.0113
+    assert histogram.quantile(1.0) >= 2.0
+    assert histogram.fraction_within(0.5) == pytest.approx(0.99)
+    other = LatencyHistogram()
+    other.record([0.010])
+    histogram.merge(other)
+    assert len(histogram) == 101
+    assert histogram.maximum == 2.0
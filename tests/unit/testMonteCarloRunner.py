@@ -0,0 +1,79 @@
+"""
+Unit Tests for MonteCarloRunner
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the MonteCarloRunner class, including tests for sharded runs,
+reproducibility across pool sizes, progress reporting and cancellation.
+
+Modules:
+    - pytest: Provides the testing framework.
+    - scripts.combinedSimulation: Imports the CombinedSimulator to be sharded.
+    - scripts.monteCarloRunner: Imports the MonteCarloRunner class to be tested.
+    - scripts.outputSinks: Provides a file sink that cannot be sent to workers.
+
+Tests:
+    - test_run_in_process: Verifies sample counts, histograms and sensor statistics of an in-process run.
+    - test_pool_matches_in_process: Verifies that a process pool gives the same summary as an in-process run.
+    - test_pool_with_file_sink: Verifies that a simulator writing to a file can be sharded across processes.
+    - test_progress_and_cancel: Verifies that progress is reported and that cancellation stops a run.
+"""
+
+import pytest
+from scripts.combinedSimulation import CombinedSimulator
+from scripts.monteCarloRunner import MonteCarloRunner
+from scripts.outputSinks import BufferedFileSink
+
+def test_run_in_process():
+    """
+    Tests an in-process run of MonteCarloRunner.
+    """
+    summary = MonteCarloRunner(CombinedSimulator(rng=1), workers=0, shard_size=10000).run(35000)
+    assert summary.samples == 35000
+    assert summary.label_counts.sum() == 35000
+    assert summary.movement_counts.sum() == 35000
+    assert summary.temperature_stats()[0] == pytest.approx(15, abs=0.5)
+    assert summary.humidity_stats()[0] == pytest.approx(50, abs=1)
+    assert not summary.cancelled
+
+def test_pool_matches_in_process():
+    """
+    Tests that the summary of a process pool run does not depend on the number of workers.
+    """
+    local = MonteCarloRunner(CombinedSimulator(rng=2), workers=0, shard_size=5000).run(20000)
+    pooled = MonteCarloRunner(CombinedSimulator(rng=2), workers=2, shard_size=5000).run(20000)
+    assert pooled.label_counts.tolist() == local.label_counts.tolist()
+    assert pooled.temperature_sum == local.temperature_sum
+
+def test_pool_with_file_sink(tmp_path):
+    """
+    Tests that the shards of a simulator whose sink holds an open file are sent to workers without it.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+    """
+    with BufferedFileSink(tmp_path / "out.log") as sink:
+        summary = MonteCarloRunner(CombinedSimulator(rng=4, sink=sink), workers=1, shard_size=5000).run(10000)
+    assert summary.samples == 10000
+
+def test_progress_and_cancel():
+    """
+    Tests that progress is reported after each shard, that cancel stops the run early and that a cancel issued
+    before a run cancels only that run.
+    """
+    runner = MonteCarloRunner(CombinedSimulator(rng=3), workers=0, shard_size=1000)
+    reports = []
+
+    def progress(done, total):
+        reports.append(done)
+        if done >= 3000:
+            runner.cancel()
+
+    summary = runner.run(10000, progress=progress)
+    assert reports == [1000, 2000, 3000]
+    assert summary.samples == 3000
+    assert summary.cancelled
+    runner.cancel()
+    assert runner.run(10000).samples == 0
+    assert runner.run(2000).samples == 2000
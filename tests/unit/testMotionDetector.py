@@ -0,0 +1,66 @@
+"""
+Unit Tests for the Motion Detector
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the motion detection pipeline, including tests for movement classification
+from simulated CSI and for fall detection latency against a budget.
+
+Modules:
+    - numpy: Provides the test streams.
+    - pytest: Provides approximate comparisons.
+    - scripts.motionDetector: Imports the detector and latency monitor to be tested.
+    - scripts.csiGenerator: Provides the simulated CSI streams.
+    - scripts.wifiSimulation: Provides the batches driving the CSI movement.
+
+Tests:
+    - test_classifies_movements: Verifies that every movement state is recognized from simulated CSI.
+    - test_fall_latency_within_budget: Verifies that every fall is detected within the window-bound budget.
+"""
+
+import numpy as np
+import pytest
+from scripts.motionDetector import DetectionLatency, MotionDetector, MOVEMENT_LABELS
+from scripts.csiGenerator import CSIGenerator
+from scripts.wifiSimulation import WiFiSampleBatch
+
+def _stream(sequence, seed, seconds_per_state=2):
+    """
+    Generates CSI and the true movement codes for a sequence of movement codes.
+    """
+    movement = np.array(sequence, dtype=np.uint8)
+    zeros = np.zeros(len(movement), dtype=np.uint8)
+    batch = WiFiSampleBatch(zeros, movement, zeros, ('Strong',), MOVEMENT_LABELS, ('Normal',))
+    generator = CSIGenerator(rng=seed)
+    frames_per_state = seconds_per_state * generator.sample_rate
+    return generator.generate_batch(batch, frames_per_state), np.repeat(movement, frames_per_state)
+
+def test_classifies_movements():
+    """
+    Tests that after each window the detector reports the simulated movement state of every link.
+    """
+    streams = [_stream([code, code], seed) for seed, code in enumerate(range(len(MOVEMENT_LABELS)))]
+    frames = np.stack([frames for frames, _ in streams], axis=1)
+    truth = np.stack([truth for _, truth in streams], axis=1)
+    detector = MotionDetector(n_links=len(streams))
+    codes = detector.process(frames)
+    settled = slice(detector.window, None)
+    assert (codes[settled] == truth[settled]).mean() > 0.95
+    assert detector.speeds()[MOVEMENT_LABELS.index('Walking')] == pytest.approx(1.4, abs=0.2)
+
+def test_fall_latency_within_budget():
+    """
+    Tests that every fall onset is detected, within the window length plus processing time.
+    """
+    sequence = [0, 3, 0, 1, 3, 2, 0, 3]
+    streams = [_stream(sequence, seed) for seed in range(4)]
+    frames = np.stack([frames for frames, _ in streams], axis=1)
+    truth = np.stack([truth for _, truth in streams], axis=1)
+    detector = MotionDetector(n_links=4)
+    monitor = DetectionLatency(4, budget=0.5)
+    detector.process(frames, truth, monitor)
+    falls = monitor.report()['Falling']
+    assert falls['detected'] == 12 and falls['missed'] == 0
+    assert falls['within_budget'] == 1.0
+    assert falls['p99'] <= 0.5
@@ -0,0 +1,101 @@
+"""
+Unit Tests for the Output Sinks
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the output sinks, including tests for the console format, batched file and
+JSON-lines output, the bounded ring buffer, and simulators routing their output through a sink.
+
+Modules:
+    - json: Parses the JSON-lines output.
+    - pickle: Checks that file sinks refuse to cross a process boundary.
+    - pytest: Provides the tmp_path and capsys fixtures.
+    - scripts.outputSinks: Imports the sinks to be tested.
+    - scripts.clock: Provides the virtual clock for the simulator runs.
+    - scripts.combinedSimulation, scripts.embeddedSystem: Import the simulators that emit events.
+
+Tests:
+    - test_console_sink: Verifies that the console sink prints the original messages.
+    - test_buffered_file_sink: Verifies that events are written in batches and on close.
+    - test_json_lines_sink: Verifies the JSON-lines records.
+    - test_ring_buffer_sink: Verifies that only the most recent events are kept.
+    - test_simulators_use_sink: Verifies that simulators emit through their sink instead of printing.
+"""
+
+import json
+import pickle
+import pytest
+from scripts.outputSinks import BufferedFileSink, ConsoleSink, JsonLinesSink, RingBufferSink
+from scripts.clock import VirtualClock
+from scripts.combinedSimulation import CombinedSimulator
+from scripts.embeddedSystem import EmbeddedSystemSimulator
+
+def test_console_sink(capsys):
+    """
+    Tests that ConsoleSink prints the same lines the simulators used to print.
+
+    Args:
+        capsys: The pytest fixture capturing printed output.
+    """
+    sink = ConsoleSink()
+    sink.emit('send', {'data': 'Data1'})
+    sink.emit('performance', {'performance': 'Ideal'})
+    assert capsys.readouterr().out == "Sending data: Data1\nWiFi Performance: Ideal\n"
+
+def test_buffered_file_sink(tmp_path):
+    """
+    Tests that BufferedFileSink writes once its buffer fills, writes the remainder on close and cannot be pickled.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+    """
+    path = tmp_path / "out.log"
+    with BufferedFileSink(path, buffer_size=3) as sink:
+        for i in range(4):
+            sink.emit('receive', {'response': f"R{i}"})
+        assert path.read_text().splitlines() == ["Received response: R0", "Received response: R1",
+                                                 "Received response: R2"]
+    assert path.read_text().splitlines()[-1] == "Received response: R3"
+    with pytest.raises(TypeError):
+        pickle.dumps(sink)
+
+def test_json_lines_sink(tmp_path):
+    """
+    Tests that JsonLinesSink writes one JSON object per event.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+    """
+    path = tmp_path / "out.jsonl"
+    with JsonLinesSink(path) as sink:
+        sink.emit('environment_reading', {'temperature': 21, 'humidity': 40})
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert records == [{'event': 'environment_reading', 'temperature': 21, 'humidity': 40}]
+
+def test_ring_buffer_sink():
+    """
+    Tests that RingBufferSink keeps only the most recent events and counts all of them.
+    """
+    sink = RingBufferSink(capacity=2)
+    for data in ['Data1', 'Data2', 'Data3']:
+        sink.emit('send', {'data': data})
+    assert sink.total == 3
+    assert sink.events() == [('send', {'data': 'Data2'}), ('send', {'data': 'Data3'})]
+    assert sink.messages() == ["Sending data: Data2", "Sending data: Data3"]
+
+def test_simulators_use_sink(capsys):
+    """
+    Tests that the simulators emit through their sink, which the combined simulator shares with its parts.
+
+    Args:
+        capsys: The pytest fixture capturing printed output.
+    """
+    sink = RingBufferSink()
+    simulator = CombinedSimulator(rng=2, sink=sink)
+    simulator.run(VirtualClock(), duration=10)
+    EmbeddedSystemSimulator(rng=2, sink=sink).send_data()
+    assert capsys.readouterr().out == ""
+    events = [event for event, _ in sink.events()]
+    assert events == ['receive', 'combined_reading', 'performance'] * 5 + ['send']
+    assert simulator.spawn(1)[0].sink is sink
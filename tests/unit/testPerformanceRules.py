@@ -0,0 +1,155 @@
+"""
+Unit Tests for the Performance Rules
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the configurable performance rules, including tests for the compiled
+classifiers, loading rule files, validation, and hot reloading into a running simulator.
+
+Modules:
+    - json, os, pickle: Write rule files, bump their modification times and copy rule sets.
+    - numpy: Provides the arrays passed to the evaluators.
+    - pytest: Provides the testing framework.
+    - scripts.performanceRules: Imports the rules and the reloader to be tested.
+    - scripts.combinedSimulation: Provides the simulator the rules are installed on.
+    - scripts.outputSinks: Silences the simulator.
+
+Tests:
+    - test_default_rules_match_chain: Verifies that the default rules reproduce the original if/elif chain.
+    - test_scalar_and_array_agree: Verifies that the compiled classifier and the array evaluator agree.
+    - test_load_formats: Verifies that JSON, TOML and YAML files load the same rules.
+    - test_invalid_rules: Verifies that malformed rules and unknown labels are rejected.
+    - test_hot_reload: Verifies that file changes replace the rules and recompile the performance table.
+"""
+
+import json
+import os
+import pickle
+import numpy as np
+import pytest
+from scripts.performanceRules import DEFAULT_RULES, PERFORMANCE_LABELS, PerformanceRules, RuleReloader
+from scripts.combinedSimulation import CombinedSimulator
+from scripts.outputSinks import NullSink
+
+SITE_RULES = {
+    'default': 'Poor',
+    'rules': [
+        {'label': 'Excellent', 'signal': ['Strong'], 'temperature': [18, 24]},
+        {'label': 'Optimized', 'movement': ['None', 'Walking']},
+    ],
+}
+
+def _chain(temperature, humidity, embedded_response, signal, movement):
+    """
+    The rule chain the CombinedSimulator hard-coded before rules became configurable.
+    """
+    if (signal == 'Strong' and 20 <= temperature <= 30 and 30 <= humidity <= 60
+            and embedded_response == 'Acknowledge' and movement == 'None'):
+        return 'Excellent'
+    if (signal in ['Strong', 'Weak'] and 10 <= temperature <= 35 and 20 <= humidity <= 70
+            and embedded_response in ['Acknowledge', 'Timeout'] and movement in ['None', 'Walking']):
+        return 'Ideal'
+    if (signal in ['Strong', 'Weak'] and -10 <= temperature <= 40 and 0 <= humidity <= 100
+            and movement in ['None', 'Walking', 'Running']):
+        return 'Optimized'
+    return 'Poor'
+
+def test_default_rules_match_chain():
+    """
+    Tests that the default rules classify every sample of a grid like the original chain, including values
+    outside the simulators' ranges.
+    """
+    rules = PerformanceRules.default_rules()
+    for signal in ['Strong', 'Weak', 'No Signal']:
+        for movement in ['None', 'Walking', 'Running', 'Falling']:
+            for response in ['Acknowledge', 'Error', 'Timeout']:
+                for temperature in range(-15, 46, 5):
+                    for humidity in range(-5, 106, 5):
+                        expected = _chain(temperature, humidity, response, signal, movement)
+                        assert rules.classify(temperature, humidity, response, signal, movement) == expected
+
+def test_scalar_and_array_agree():
+    """
+    Tests that the array evaluator agrees with the compiled classifier for a site's rules.
+    """
+    rules = PerformanceRules.from_dict(SITE_RULES)
+    signals, movements, responses = ['Strong', 'Weak'], ['None', 'Walking', 'Running'], ['Acknowledge', 'Error']
+    rng = np.random.default_rng(0)
+    temperature = rng.integers(-10, 41, 500)
+    humidity = rng.integers(0, 101, 500)
+    signal, movement, response = rng.integers(0, 2, 500), rng.integers(0, 3, 500), rng.integers(0, 2, 500)
+    codes = rules.evaluate(temperature, humidity, response, signal, movement, responses, signals, movements)
+    for i in range(500):
+        expected = rules.classify(temperature[i], humidity[i], responses[response[i]], signals[signal[i]],
+                                  movements[movement[i]])
+        assert PERFORMANCE_LABELS[codes[i]] == expected
+    assert pickle.loads(pickle.dumps(rules)).classify(20, 50, 'Error', 'Strong', 'Running') == 'Excellent'
+
+def test_load_formats(tmp_path):
+    """
+    Tests that the same rules written as JSON, TOML and YAML load to equal configurations.
+    """
+    (tmp_path / 'rules.json').write_text(json.dumps(SITE_RULES))
+    (tmp_path / 'rules.toml').write_text(
+        'default = "Poor"\n\n[[rules]]\nlabel = "Excellent"\nsignal = ["Strong"]\ntemperature = [18, 24]\n\n'
+        '[[rules]]\nlabel = "Optimized"\nmovement = ["None", "Walking"]\n')
+    configurations = [PerformanceRules.load(str(tmp_path / 'rules.json')).to_dict(),
+                      PerformanceRules.load(str(tmp_path / 'rules.toml')).to_dict()]
+    yaml = pytest.importorskip('yaml')
+    (tmp_path / 'rules.yaml').write_text(yaml.safe_dump(SITE_RULES))
+    configurations.append(PerformanceRules.load(str(tmp_path / 'rules.yaml')).to_dict())
+    assert all(configuration == configurations[0] for configuration in configurations)
+    assert PerformanceRules.from_dict(DEFAULT_RULES).to_dict()['rules'][0]['temperature'] == [20, 30]
+
+def test_invalid_rules():
+    """
+    Tests that malformed rules are rejected when built and unknown labels when installed on a simulator.
+    """
+    with pytest.raises(ValueError):
+        PerformanceRules([{'label': 'Superb'}])
+    with pytest.raises(ValueError):
+        PerformanceRules([{'label': 'Ideal', 'temperature': [30, 20]}])
+    with pytest.raises(ValueError):
+        PerformanceRules([{'label': 'Ideal', 'temperature': [False, True]}])
+    with pytest.raises(ValueError):
+        PerformanceRules(json.loads('[{"label": "Ideal", "humidity": [NaN, 60]}]'))
+    with pytest.raises(ValueError):
+        PerformanceRules(json.loads('[{"label": "Ideal", "humidity": [40, Infinity]}]'))
+    with pytest.raises(ValueError):
+        PerformanceRules([{'label': 'Ideal', 'pressure': [1, 2]}])
+    with pytest.raises(ValueError):
+        PerformanceRules([{'label': 'Ideal', 'signal': 'Strong'}])
+    with pytest.raises(ValueError):
+        PerformanceRules([{'label': 'Ideal', 'movement': {'Walking': 1}}])
+    simulator = CombinedSimulator(sink=NullSink())
+    with pytest.raises(ValueError):
+        simulator.set_rules({'rules': [{'label': 'Ideal', 'signal': ['Strnog']}]})
+
+def test_hot_reload(tmp_path):
+    """
+    Tests that a reloader installs changed rule files, recompiles the table and keeps the rules on bad files.
+    """
+    path = tmp_path / 'site.json'
+    path.write_text(json.dumps(DEFAULT_RULES))
+    simulator = CombinedSimulator(1, sink=NullSink())
+    reloader = RuleReloader(simulator, str(path))
+    sample = ([22], [80], [0], [0], [2])  # 22 degrees, 80% humidity, Acknowledge, Strong, Running
+    assert PERFORMANCE_LABELS[simulator.evaluate_arrays(*sample)[0][0]] == 'Optimized'
+    assert not reloader.poll()
+
+    path.write_text(json.dumps(SITE_RULES))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    assert reloader.poll() and reloader.reloads == 2
+    assert PERFORMANCE_LABELS[simulator.evaluate_arrays(*sample)[0][0]] == 'Excellent'
+    assert simulator.classify_performance(22, 80, 'Acknowledge', 'Strong', 'Running') == 'Excellent'
+
+    path.write_text('{"rules": [')
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 2))
+    assert not reloader.poll() and reloader.error is not None
+    assert simulator.classify_performance(22, 80, 'Acknowledge', 'Strong', 'Running') == 'Excellent'
+
+    path.write_text(json.dumps({'rules': [{'label': 'Ideal', 'signal': 5}]}))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 3))
+    assert not reloader.poll() and isinstance(reloader.error, ValueError)
+    assert simulator.classify_performance(22, 80, 'Acknowledge', 'Strong', 'Running') == 'Excellent'
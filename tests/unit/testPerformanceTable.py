@@ -0,0 +1,105 @@
+"""
+Unit Tests for PerformanceTable
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the PerformanceTable class, including tests for compiling the
+performance rules, scalar and array lookups, and rebuilding when value lists change.
+
+Modules:
+    - pytest: Provides the testing framework.
+    - numpy: Provides the arrays passed to the lookups.
+    - scripts.combinedSimulation: Imports the CombinedSimulator whose rules are compiled.
+
+Tests:
+    - test_compile_shape: Verifies that the table spans the simulators' domain.
+    - test_lookup_matches_rules: Verifies that scalar lookups agree with classify_performance.
+    - test_lookup_arrays_matches_rules: Verifies that array lookups agree with the mask evaluation.
+    - test_rebuild_on_change: Verifies that the table recompiles when a value list changes.
+    - test_outside_domain: Verifies that samples outside the domain are rejected.
+"""
+
+import pytest
+import numpy as np
+from scripts.combinedSimulation import CombinedSimulator, PERFORMANCE_LABELS
+
+@pytest.fixture
+def simulator():
+    """
+    Fixture that provides an instance of CombinedSimulator.
+
+    Returns:
+        CombinedSimulator: An instance of CombinedSimulator.
+    """
+    return CombinedSimulator()
+
+def test_compile_shape(simulator):
+    """
+    Tests that the compiled table spans 3 signals x 4 movements x 3 responses x 51 temperatures x 101 humidities.
+
+    Args:
+        simulator: The CombinedSimulator instance provided by the fixture.
+    """
+    table = simulator.performance_table.refresh()
+    assert table.table.shape == (3, 4, 3, 51, 101)
+    assert table.table.dtype == np.uint8
+
+def test_lookup_matches_rules(simulator):
+    """
+    Tests the lookup method of PerformanceTable against classify_performance.
+
+    Args:
+        simulator: The CombinedSimulator instance provided by the fixture.
+    """
+    wifi = simulator.wifi_simulator
+    for temperature in range(-10, 41, 5):
+        for humidity in range(0, 101, 10):
+            for response in simulator.embedded_simulator.responses:
+                for signal in wifi.signals:
+                    for movement in wifi.movements:
+                        code = simulator.performance_table.lookup(temperature, humidity, response, signal, movement)
+                        expected = simulator.classify_performance(temperature, humidity, response, signal, movement)
+                        assert PERFORMANCE_LABELS[code] == expected
+
+def test_lookup_arrays_matches_rules(simulator):
+    """
+    Tests the lookup_arrays method of PerformanceTable against evaluate_rules on random samples.
+
+    Args:
+        simulator: The CombinedSimulator instance provided by the fixture.
+    """
+    rng = np.random.default_rng(7)
+    n = 20000
+    arrays = (rng.integers(-10, 41, n), rng.integers(0, 101, n), rng.integers(0, 3, n),
+              rng.integers(0, 3, n), rng.integers(0, 4, n))
+    codes = simulator.performance_table.lookup_arrays(*arrays)
+    assert np.array_equal(codes, simulator.evaluate_rules(*arrays))
+
+def test_rebuild_on_change(simulator):
+    """
+    Tests that changing a simulator's value list recompiles the table.
+
+    Args:
+        simulator: The CombinedSimulator instance provided by the fixture.
+    """
+    table = simulator.performance_table.refresh()
+    simulator.wifi_simulator.signals.append('Medium')
+    assert not table.is_current()
+    assert table.lookup(25, 45, 'Acknowledge', 'Medium', 'None') == PERFORMANCE_LABELS.index('Poor')
+    assert table.table.shape[0] == 4
+
+def test_outside_domain(simulator):
+    """
+    Tests that samples outside the compiled domain are rejected by lookups and still classified by evaluate_arrays.
+
+    Args:
+        simulator: The CombinedSimulator instance provided by the fixture.
+    """
+    table = simulator.performance_table
+    assert table.lookup(41, 45, 'Acknowledge', 'Strong', 'None') is None
+    assert table.lookup(25, 45, 'Acknowledge', 'Unknown', 'None') is None
+    with pytest.raises(ValueError):
+        table.lookup_arrays([41], [45], [0], [0], [0])
+    codes, counts = simulator.evaluate_arrays([41], [45], [0], [0], [0])
+    assert counts['Poor'] == 1
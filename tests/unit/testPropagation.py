@@ -0,0 +1,110 @@
+"""
+Unit Tests for the Propagation Model
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the FloorPlan and PropagationModel classes, including tests for path loss,
+the candidate-based strongest access point search, thresholds and the simulators using positions.
+
+Modules:
+    - time: Measures the duration of a large tick.
+    - numpy: Provides the positions and RSSI arrays.
+    - pytest: Provides the testing framework.
+    - scripts.propagation: Imports the classes to be tested.
+    - scripts.fleet: Provides the fleet whose devices are placed in a floor plan.
+    - scripts.outputSinks: Silences the simulators.
+    - scripts.sampling: Provides seeded random streams.
+    - scripts.wifiSimulation: Provides the simulator deriving its signal strength from a position.
+
+Tests:
+    - test_path_loss: Verifies free-space loss at 1 m and the decay of RSSI with distance.
+    - test_strongest_matches_full_matrix: Verifies the candidate search against the full broadcast RSSI matrix.
+    - test_thresholds: Verifies the conversion of RSSI into labels and threshold validation.
+    - test_large_building_tick: Verifies that 1,000 access points and 100,000 devices take well under a second.
+    - test_simulators_use_positions: Verifies the signal strengths of a simulator and a fleet in a floor plan.
+"""
+
+import time
+import numpy as np
+import pytest
+from scripts.propagation import FloorPlan, PropagationModel
+from scripts.fleet import Fleet
+from scripts.outputSinks import NullSink
+from scripts.sampling import make_stream
+from scripts.wifiSimulation import WiFiSimulator
+
+def test_path_loss():
+    """
+    Tests that without shadowing the RSSI is the transmit power minus 40 dB at 1 m at 2.4 GHz and falls by
+    10 n dB per decade of distance.
+    """
+    plan = FloorPlan(100, 10, [(0, 5)], tx_power=20)
+    model = PropagationModel(plan, exponent=3, shadowing=0, rng=make_stream(1))
+    assert model.reference_loss == pytest.approx(40.05, abs=0.01)
+    rssi = model.rssi([(1, 5), (10, 5), (100, 5)])[:, 0]
+    assert rssi == pytest.approx([20 - 40.05, -50.05, -80.05], abs=0.01)
+
+def test_strongest_matches_full_matrix():
+    """
+    Tests that the strongest access point found among each cell's candidates is the maximum of the full RSSI
+    matrix, with shadowing and randomly placed access points, for positions inside and around the building.
+    """
+    stream = make_stream(2)
+    plan = FloorPlan(200, 120, stream.generator.random((60, 2)) * (200, 120), tx_power=[17, 20, 23] * 20)
+    model = PropagationModel(plan, shadowing=8, cell_size=7, rng=stream)
+    outside = stream.generator.random((3000, 2)) * (400, 320) - (100, 100)
+    positions = np.vstack([plan.random_positions(5000, stream), outside])
+    full = model.rssi(positions)
+    rssi, best = model.strongest(positions, chunk_size=777)
+    assert np.allclose(rssi, full.max(axis=1), atol=1e-3)
+    assert np.array_equal(best, full.argmax(axis=1))
+    assert model._candidates.shape[1] < len(plan)
+
+def test_thresholds():
+    """
+    Tests that RSSI is converted into codes at the configured thresholds and that invalid thresholds are
+    rejected.
+    """
+    plan = FloorPlan(10, 10, [(5, 5)])
+    model = PropagationModel(plan, thresholds={'Strong': -60, 'Weak': -75}, rng=make_stream(3))
+    assert model.classify(np.array([-50, -60, -60.5, -75, -90])).tolist() == [0, 0, 1, 1, 2]
+    with pytest.raises(ValueError):
+        PropagationModel(plan, thresholds={'Strong': -80, 'Weak': -70})
+    with pytest.raises(ValueError):
+        PropagationModel(plan, thresholds={'Weak': -70})
+
+def test_large_building_tick():
+    """
+    Tests that one reading of 100,000 devices in a building with 1,000 access points takes well under a second
+    and yields every label.
+    """
+    stream = make_stream(4)
+    plan = FloorPlan(2000, 1000, stream.generator.random((1000, 2)) * (2000, 1000))
+    model = PropagationModel(plan, rng=stream)
+    positions = plan.random_positions(100_000, stream)
+    start = time.perf_counter()
+    codes = model.signal_codes(positions, stream)
+    assert time.perf_counter() - start < 0.5
+    assert len(codes) == 100_000 and set(np.unique(codes).tolist()) == {0, 1, 2}
+
+def test_simulators_use_positions():
+    """
+    Tests that a WiFiSimulator near an access point reads a strong signal, one far outside the building none,
+    and that a fleet places its devices and derives their signal strengths from their positions.
+    """
+    plan = FloorPlan(300, 300, [(10, 10)])
+    model = PropagationModel(plan, shadowing=0, fading=0, rng=make_stream(5))
+    simulator = WiFiSimulator(rng=5, sink=NullSink())
+    simulator.propagation = model
+    simulator.position = (12, 10)
+    assert simulator.simulate_signal() == 'Strong'
+    simulator.position = (290, 290)
+    assert simulator.simulate_signal() == 'No Signal'
+    fleet = Fleet(1000, rng=6)
+    fleet.simulator.wifi_simulator.propagation = model
+    fleet = Fleet(1000, simulator=fleet.simulator)
+    assert fleet.position.shape == (1000, 2)
+    fleet.tick()
+    expected = model.classify(model.strongest(fleet.position)[0])
+    assert np.array_equal(fleet.signal, expected)
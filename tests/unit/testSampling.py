@@ -0,0 +1,73 @@
+"""
+Unit Tests for the Sampling Utilities
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the sampling helpers, including tests for weighted draws and for seeding
+and spawning RandomStreams.
+
+Modules:
+    - random: Provides the random.Random injected into streams.
+    - pytest: Provides the testing framework.
+    - numpy: Provides the arrays and generators used by the tests.
+    - scripts.sampling: Imports the helpers to be tested.
+
+Tests:
+    - test_probabilities: Verifies weight normalization and validation.
+    - test_draw_codes_weighted: Verifies that zero-weight values are never drawn.
+    - test_stream_reproducible: Verifies that equal seeds give equal scalar and batch draws.
+    - test_stream_injected_generators: Verifies that injected generators are used directly.
+    - test_spawn_independent: Verifies that spawned streams differ from each other and are reproducible.
+"""
+
+import random
+import pytest
+import numpy as np
+from scripts.sampling import RandomStream, draw_codes, make_stream, probabilities
+
+def test_probabilities():
+    """
+    Tests that probabilities normalizes weights and rejects invalid ones.
+    """
+    assert np.allclose(probabilities(4), 0.25)
+    assert np.allclose(probabilities(3, [2, 1, 1]), [0.5, 0.25, 0.25])
+    with pytest.raises(ValueError):
+        probabilities(3, [1, 1])
+    with pytest.raises(ValueError):
+        probabilities(2, [0, 0])
+
+def test_draw_codes_weighted():
+    """
+    Tests that draw_codes never draws values with zero weight.
+    """
+    codes = draw_codes(10000, 3, [1, 0, 3], RandomStream(1))
+    assert set(np.unique(codes).tolist()) == {0, 2}
+
+def test_stream_reproducible():
+    """
+    Tests that two streams with the same seed produce the same scalar and batch draws.
+    """
+    first, second = RandomStream(42), RandomStream(42)
+    assert [first.random.random() for _ in range(5)] == [second.random.random() for _ in range(5)]
+    assert np.array_equal(first.generator.integers(0, 100, 50), second.generator.integers(0, 100, 50))
+    assert make_stream(first) is first
+
+def test_stream_injected_generators():
+    """
+    Tests that an injected random.Random or numpy Generator is used for its kind of draws.
+    """
+    scalar = random.Random(3)
+    assert RandomStream(scalar).random is scalar
+    generator = np.random.default_rng(3)
+    assert RandomStream(generator).generator is generator
+
+def test_spawn_independent():
+    """
+    Tests that spawned child streams differ from each other and are reproducible from the parent seed.
+    """
+    children = RandomStream(5).spawn(3)
+    again = RandomStream(5).spawn(3)
+    draws = [child.generator.integers(0, 2**32, 4).tolist() for child in children]
+    assert draws == [child.generator.integers(0, 2**32, 4).tolist() for child in again]
+    assert len({tuple(d) for d in draws}) == 3
@@ -0,0 +1,119 @@
+"""
+Unit Tests for the State Models
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the temporal state models, including tests for alias-table sampling,
+Markov chain steps, bounded random walks and their use by the simulators and the fleet.
+
+Modules:
+    - numpy: Provides the arrays used by the tests.
+    - pytest: Provides the testing framework.
+    - scripts.stateModels: Imports the models to be tested.
+    - scripts.sampling: Provides seeded random streams and value dtypes.
+    - scripts.wifiSimulation, scripts.environmentalSimulation: Provide the simulators driven by the models.
+    - scripts.combinedSimulation, scripts.fleet: Provide the fleet advancing many chains per tick.
+    - scripts.outputSinks: Silences the simulators.
+
+Tests:
+    - test_alias_table_frequencies: Verifies that scalar and batch draws follow the weights.
+    - test_markov_chain_batch_step: Verifies batch transition frequencies and the stationary distribution.
+    - test_from_mapping: Verifies label-keyed transitions and the rejection of unknown labels.
+    - test_bounded_random_walk: Verifies that walks stay in range and move by at most max_step.
+    - test_simulators_follow_models: Verifies that simulators and the fleet honour forbidden transitions.
+"""
+
+import numpy as np
+import pytest
+from scripts.stateModels import AliasTable, BoundedRandomWalk, MarkovChain
+from scripts.sampling import RandomStream, value_table
+from scripts.wifiSimulation import WiFiSimulator
+from scripts.environmentalSimulation import EnvironmentalSimulator
+from scripts.combinedSimulation import CombinedSimulator
+from scripts.fleet import Fleet
+from scripts.outputSinks import NullSink
+
+def test_alias_table_frequencies():
+    """
+    Tests that scalar and batch draws from an alias table occur in proportion to the weights.
+    """
+    rng = RandomStream(1)
+    table = AliasTable([5, 0, 3, 2])
+    batch = np.bincount(table.draw_batch(100000, rng), minlength=4) / 100000
+    scalar = np.bincount([table.draw(rng) for _ in range(20000)], minlength=4) / 20000
+    assert np.allclose(batch, [0.5, 0, 0.3, 0.2], atol=0.01)
+    assert np.allclose(scalar, [0.5, 0, 0.3, 0.2], atol=0.02)
+    assert batch[1] == 0 and scalar[1] == 0
+
+def test_markov_chain_batch_step():
+    """
+    Tests that a batch step follows each state's transition row and that a sticky chain keeps its weights as
+    stationary distribution.
+    """
+    chain = MarkovChain([[0, 1, 1], [1, 0, 0], [0, 0, 1]])
+    states = np.repeat(np.arange(3), 30000).astype(np.uint8)
+    following = chain.step_batch(states, RandomStream(2))
+    assert set(following[states == 1].tolist()) == {0}
+    assert set(following[states == 2].tolist()) == {2}
+    assert np.mean(following[states == 0] == 1) == pytest.approx(0.5, abs=0.02)
+    sticky = MarkovChain.sticky(3, stay=0.8, weights=[2, 1, 1])
+    assert np.allclose(sticky.stationary(), [0.5, 0.25, 0.25])
+    assert sticky.transitions[0, 0] == pytest.approx(0.9)
+
+def test_from_mapping():
+    """
+    Tests that label-keyed transitions build the matching matrix and that unknown labels are rejected.
+    """
+    labels = ['None', 'Walking', 'Running', 'Falling']
+    chain = MarkovChain.from_mapping(labels, {'Falling': {'None': 1}, 'Running': {'Running': 3, 'Walking': 1}})
+    assert chain.transitions[3].tolist() == [1, 0, 0, 0]
+    assert chain.transitions[2].tolist() == [0, 0.25, 0.75, 0]
+    assert chain.transitions[0].tolist() == [1, 0, 0, 0]
+    with pytest.raises(ValueError):
+        MarkovChain.from_mapping(labels, {'Jumping': {'None': 1}})
+
+def test_bounded_random_walk():
+    """
+    Tests that walks stay within their bounds, move by at most max_step and keep the value dtype.
+    """
+    rng = RandomStream(3)
+    walk = BoundedRandomWalk.over(list(range(-10, 41)), max_step=2)
+    values = walk.advance_batch(5000, rng=rng)
+    assert values.dtype == value_table(list(range(-10, 41))).dtype
+    for _ in range(50):
+        following = walk.advance_batch(5000, values, rng)
+        assert np.abs(following.astype(int) - values).max() <= 2
+        values = following
+    assert values.min() >= -10 and values.max() <= 40
+    value = walk.advance(None, rng)
+    for _ in range(500):
+        value, previous = walk.advance(value, rng), value
+        assert -10 <= value <= 40 and abs(value - previous) <= 2
+
+def test_simulators_follow_models():
+    """
+    Tests that scalar draws of the simulators and batch ticks of the fleet never take a forbidden transition.
+    """
+    wifi = WiFiSimulator(rng=4, sink=NullSink())
+    wifi.movement_model = MarkovChain.from_mapping(wifi.movements, {
+        'None': {'None': 8, 'Walking': 1, 'Falling': 1}, 'Walking': {'Walking': 8, 'None': 1, 'Running': 1},
+        'Running': {'Running': 8, 'Walking': 2}, 'Falling': {'None': 1}})
+    movements = [wifi.simulate_movement() for _ in range(2000)]
+    assert ('Falling', 'Running') not in set(zip(movements, movements[1:]))
+    assert ('Falling', 'Falling') not in set(zip(movements, movements[1:]))
+
+    environment = EnvironmentalSimulator(rng=5, sink=NullSink())
+    environment.temperature_model = BoundedRandomWalk.over(environment.temperatures)
+    temperatures = [environment.simulate_temperature() for _ in range(500)]
+    assert max(abs(b - a) for a, b in zip(temperatures, temperatures[1:])) <= 1
+
+    simulator = CombinedSimulator(6, sink=NullSink())
+    simulator.wifi_simulator.movement_model = wifi.movement_model
+    simulator.environmental_simulator.temperature_model = environment.temperature_model
+    fleet = Fleet(10000, simulator)
+    falling = fleet.movement == simulator.wifi_simulator.movements.index('Falling')
+    temperature = fleet.temperature.astype(int)
+    fleet.tick()
+    assert (fleet.movement[falling] == 0).all()
+    assert np.abs(fleet.temperature - temperature).max() <= 1
@@ -0,0 +1,84 @@
+"""
+Unit Tests for the Threshold Sweep
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the threshold sweep, including tests against direct reclassification of the
+samples, the process pool, and the result table.
+
+Modules:
+    - numpy: Provides the arrays compared by the tests.
+    - pytest: Provides the testing framework.
+    - scripts.thresholdSweep: Imports the sweep to be tested.
+    - scripts.performanceRules: Reclassifies the samples directly for comparison.
+    - scripts.combinedSimulation: Provides the simulator whose rules are swept.
+    - scripts.outputSinks: Silences the simulator.
+
+Tests:
+    - test_matches_reclassification: Verifies grid point counts against classifying every sample directly.
+    - test_pool_matches_serial: Verifies that chunks evaluated in a process pool give the same counts.
+    - test_result_table: Verifies the grid shape, best point, CSV output and parameter validation.
+"""
+
+import numpy as np
+import pytest
+from scripts.thresholdSweep import ThresholdSweep
+from scripts.performanceRules import PerformanceRules
+from scripts.combinedSimulation import CombinedSimulator
+from scripts.outputSinks import NullSink
+
+GRID = {'Excellent.temperature.low': range(16, 24, 2), 'Excellent.temperature.high': [26, 30, 34],
+        'Ideal.humidity.low': [10, 20, 30], '2.temperature.high': [30, 40]}
+
+@pytest.fixture
+def sweep():
+    """
+    Fixture that provides a serial sweep over 20,000 simulated samples.
+
+    Returns:
+        ThresholdSweep: The sweep.
+    """
+    return ThresholdSweep(CombinedSimulator(7, sink=NullSink()), n=20000, workers=0)
+
+def test_matches_reclassification(sweep):
+    """
+    Tests that the counts of every grid point equal those of classifying every sample under that point's rules.
+    """
+    result = sweep.run(GRID)
+    samples = sweep.samples
+    assert len(result) == 4 * 3 * 3 * 2
+    for i in range(len(result)):
+        config = sweep.simulator.rules.to_dict()
+        rules = {'Excellent': config['rules'][0], 'Ideal': config['rules'][1], '2': config['rules'][2]}
+        for name in result.parameters:
+            rule, condition, bound = name.split('.')
+            rules[rule][condition][['low', 'high'].index(bound)] = result.values[name][i].item()
+        codes = PerformanceRules.from_dict(config).evaluate(*samples.columns(), samples.response_labels,
+                                                             samples.signal_labels, samples.movement_labels)
+        assert np.array_equal(np.bincount(codes, minlength=4), result.counts[i])
+
+def test_pool_matches_serial(sweep):
+    """
+    Tests that a sweep split into chunks across worker processes matches the serial sweep.
+    """
+    pooled = ThresholdSweep(sweep.simulator, sweep.samples, workers=2, chunk_size=20)
+    assert np.array_equal(pooled.run(GRID).counts, sweep.run(GRID).counts)
+
+def test_result_table(sweep, tmp_path):
+    """
+    Tests the grid-shaped fractions, the best point, the CSV table and rejection of unknown parameters.
+    """
+    result = sweep.run(GRID)
+    excellent = result.grid('Excellent')
+    assert excellent.shape == (4, 3, 3, 2)
+    assert np.allclose(result.fractions.sum(axis=1), 1)
+    best = result.best('Excellent')
+    assert best['Excellent.temperature.low'] == 16 and best['Excellent.temperature.high'] == 34
+    assert best['fraction'] == pytest.approx(excellent.max())
+    result.to_csv(str(tmp_path / 'sweep.csv'))
+    lines = (tmp_path / 'sweep.csv').read_text().splitlines()
+    assert lines[0].split(',')[:2] == ['Excellent.temperature.low', 'Excellent.temperature.high']
+    assert len(lines) == len(result) + 1
+    with pytest.raises(ValueError):
+        sweep.run({'Excellent.pressure.low': [1]})
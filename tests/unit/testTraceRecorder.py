@@ -0,0 +1,136 @@
+"""
+Unit Tests for the Trace Recorder
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for the trace writer and reader, including tests for growing and compacting
+the columnar file, zero-copy column views, and recording the simulators.
+
+Modules:
+    - numpy: Provides array comparisons.
+    - pytest: Provides the tmp_path fixture and exception checks.
+    - scripts.traceRecorder: Imports the trace writer, reader and recording functions to be tested.
+    - scripts.combinedSimulation, scripts.wifiSimulation, scripts.environmentalSimulation: Import the simulators
+      to record.
+    - scripts.climateModel: Imports the climate model read by the environmental simulator.
+
+Tests:
+    - test_round_trip_with_growth: Verifies that chunks survive capacity growth and compaction.
+    - test_reader_views_are_zero_copy: Verifies that columns are read-only views of the mapped file.
+    - test_record_combined: Verifies that recorded performance codes match re-evaluated inputs.
+    - test_record_wifi_labels: Verifies that recorded codes decode to the simulator's labels.
+    - test_record_climate: Verifies that climate readings are stored as floats at every row's time.
+    - test_invalid_trace: Verifies that non-trace files and ragged chunks are rejected.
+"""
+
+import numpy as np
+import pytest
+from scripts.traceRecorder import TraceReader, TraceWriter, record_combined, record_environment, record_wifi
+from scripts.combinedSimulation import CombinedSimulator, PERFORMANCE_LABELS
+from scripts.wifiSimulation import WiFiSimulator
+from scripts.environmentalSimulation import EnvironmentalSimulator
+from scripts.climateModel import ClimateModel
+
+def test_round_trip_with_growth(tmp_path):
+    """
+    Tests that rows appended beyond the preallocated capacity are kept intact and the file is compacted on close.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+    """
+    path = tmp_path / "trace.bin"
+    with TraceWriter(path, [('a', '<i4'), ('b', '<f8'), ('c', 'u1')], capacity=4) as writer:
+        for start in range(0, 50, 7):
+            rows = np.arange(start, min(start + 7, 50))
+            writer.append({'a': rows, 'b': rows / 2, 'c': rows % 3})
+    with TraceReader(path) as reader:
+        assert len(reader) == 50
+        np.testing.assert_array_equal(reader['a'], np.arange(50))
+        np.testing.assert_array_equal(reader['b'], np.arange(50) / 2)
+        np.testing.assert_array_equal(reader['c'], np.arange(50) % 3)
+        assert [len(chunk['a']) for chunk in reader.chunks(20)] == [20, 20, 10]
+    assert path.stat().st_size < 65536 + 3 * 64 + 50 * 13
+
+def test_reader_views_are_zero_copy(tmp_path):
+    """
+    Tests that reader columns are read-only views of the memory map rather than copies.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+    """
+    path = tmp_path / "trace.bin"
+    with TraceWriter(path, [('x', '<i2')], metadata={'seed': 7}) as writer:
+        writer.append({'x': [1, 2, 3]})
+    reader = TraceReader(path)
+    column = reader.column('x')
+    assert isinstance(column.base, np.memmap) or isinstance(column.base.base, np.memmap)
+    assert not column.flags.writeable
+    assert reader.metadata == {'seed': 7}
+
+def test_record_combined(tmp_path):
+    """
+    Tests that the recorded performance codes equal a fresh evaluation of the recorded inputs.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+    """
+    path = tmp_path / "combined.bin"
+    simulator = CombinedSimulator(rng=11)
+    assert record_combined(simulator, path, 10_000, chunk_size=3_000) == 10_000
+    reader = TraceReader(path)
+    assert reader.labels['performance'] == list(PERFORMANCE_LABELS)
+    codes, _ = simulator.evaluate_arrays(reader['temperature'], reader['humidity'], reader['response'],
+                                         reader['signal'], reader['movement'])
+    np.testing.assert_array_equal(codes, reader['performance'])
+    np.testing.assert_array_equal(reader['time'][:3], [0, 2, 4])
+
+def test_record_wifi_labels(tmp_path):
+    """
+    Tests that recorded WiFi codes decode to the simulator's signal, movement and breathing labels.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+    """
+    path = tmp_path / "wifi.bin"
+    simulator = WiFiSimulator(rng=5)
+    record_wifi(simulator, path, 100)
+    reader = TraceReader(path)
+    assert set(reader.decode('signal')) <= set(simulator.signals)
+    assert set(reader.decode('breathing', 10, 20)) <= set(simulator.breathing_patterns)
+
+def test_record_climate(tmp_path):
+    """
+    Tests that readings of a climate model are recorded as float32 columns, each row read at the simulator's site
+    at its own time rather than once per chunk.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+    """
+    simulator = EnvironmentalSimulator(rng=2)
+    simulator.climate_model = ClimateModel(sites=3, noise=0.0, rng=4)
+    simulator.site = 2
+    simulator.climate_time = 1000.0
+    temperature, humidity = simulator.climate_model.series(1000.0, 500, step=600.0)
+    path = tmp_path / "environment.bin"
+    record_environment(simulator, path, 500, chunk_size=200, interval=600.0)
+    reader = TraceReader(path)
+    assert reader['temperature'].dtype == np.float32 and reader['humidity'].dtype == np.float32
+    np.testing.assert_allclose(reader['temperature'], temperature[2], atol=1e-3)
+    np.testing.assert_allclose(reader['humidity'], humidity[2], atol=1e-3)
+    assert len(np.unique(reader['temperature'][:200])) > 100
+
+def test_invalid_trace(tmp_path):
+    """
+    Tests that the reader rejects files without the trace header and the writer rejects ragged chunks.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+    """
+    path = tmp_path / "bogus.bin"
+    path.write_bytes(b"not a trace")
+    with pytest.raises(ValueError):
+        TraceReader(path)
+    with TraceWriter(tmp_path / "trace.bin", [('a', 'u1'), ('b', 'u1')]) as writer:
+        with pytest.raises(ValueError):
+            writer.append({'a': [1, 2], 'b': [1]})
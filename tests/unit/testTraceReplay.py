@@ -0,0 +1,123 @@
+"""
+Unit Tests for Trace Replay
+
+Author: Louis H
+Date: 2026-10-18
+
+This module contains unit tests for replaying recorded inputs through the CombinedSimulator, including tests
+for trace, CSV and JSON-lines sources, chunked reading, and paced replay.
+
+Modules:
+    - numpy: Provides array comparisons.
+    - pytest: Provides the tmp_path fixture and exception checks.
+    - scripts.traceReplay: Imports the replay sources and replayer to be tested.
+    - scripts.traceRecorder: Records the trace to replay.
+    - scripts.outputSinks: Captures the replayed output.
+    - scripts.clock: Provides the virtual and real-time clocks for paced replay.
+    - scripts.combinedSimulation: Imports the CombinedSimulator and performance labels.
+
+Tests:
+    - test_trace_replay_matches_recording: Verifies that chunked replay reproduces the recorded performance.
+    - test_csv_replay_through_evaluate_performance: Verifies scalar CSV replay, including unknown labels.
+    - test_json_lines_sink_round_trip: Verifies that a JsonLinesSink recording replays to the same results.
+    - test_paced_replay: Verifies that paced replay waits for the recorded intervals.
+    - test_paced_replay_out_of_order: Verifies that paced replay of unsorted times never waits backwards.
+"""
+
+import numpy as np
+import pytest
+from scripts.traceReplay import CsvReplaySource, JsonLinesReplaySource, TraceReplaySource, TraceReplayer
+from scripts.traceRecorder import TraceReader, record_combined
+from scripts.outputSinks import JsonLinesSink, RingBufferSink
+from scripts.clock import RealTimeClock, VirtualClock
+from scripts.combinedSimulation import CombinedSimulator, PERFORMANCE_LABELS
+
+def test_trace_replay_matches_recording(tmp_path):
+    """
+    Tests that replaying a recorded trace in chunks reproduces its recorded performance codes.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+    """
+    path = tmp_path / "combined.bin"
+    record_combined(CombinedSimulator(rng=3), path, 5_000)
+    replayer = TraceReplayer(CombinedSimulator(rng=0, sink=RingBufferSink()), TraceReplaySource(path, 1_024))
+    codes = np.concatenate([codes for _, codes in replayer.evaluate()])
+    np.testing.assert_array_equal(codes, TraceReader(path)['performance'])
+    assert sum(replayer.performance_counts().values()) == 5_000
+
+def test_csv_replay_through_evaluate_performance(tmp_path):
+    """
+    Tests that CSV samples are replayed through evaluate_performance, keeping labels the simulators never produce.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+    """
+    path = tmp_path / "incident.csv"
+    path.write_text("temperature,humidity,response,signal,movement\n"
+                    "25,50,Acknowledge,Strong,None\n"
+                    "20.5,30,Timeout,Weak,Walking\n"
+                    "25,50,Acknowledge,Invalid Signal,None\n")
+    sink = RingBufferSink()
+    replayer = TraceReplayer(CombinedSimulator(rng=0, sink=sink), CsvReplaySource(path, chunk_size=2))
+    assert replayer.run() == 3
+    performances = [fields['performance'] for event, fields in sink.events() if event == 'performance']
+    assert performances == ['Excellent', 'Ideal', 'Poor']
+    with pytest.raises(ValueError):
+        replayer.performance_counts()
+
+def test_json_lines_sink_round_trip(tmp_path):
+    """
+    Tests that the readings written by a JsonLinesSink replay to the performance levels evaluated live.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+    """
+    path = tmp_path / "readings.jsonl"
+    with JsonLinesSink(path) as sink:
+        simulator = CombinedSimulator(rng=8, sink=sink)
+        live = [simulator.evaluate_performance() for _ in range(50)]
+    replayer = TraceReplayer(CombinedSimulator(rng=0), JsonLinesReplaySource(path, chunk_size=16))
+    codes = np.concatenate([codes for _, codes in replayer.evaluate()])
+    assert [PERFORMANCE_LABELS[code] for code in codes] == live
+
+def test_paced_replay(tmp_path):
+    """
+    Tests that a paced replay sleeps for the intervals between recorded times.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+    """
+    path = tmp_path / "timed.csv"
+    path.write_text("time,temperature,humidity,response,signal,movement\n"
+                    "100,25,50,Acknowledge,Strong,None\n"
+                    "103,25,50,Acknowledge,Strong,None\n"
+                    "110,25,50,Acknowledge,Strong,None\n")
+    clock = VirtualClock()
+    replayer = TraceReplayer(CombinedSimulator(rng=0, sink=RingBufferSink()), CsvReplaySource(path))
+    replayer.run(clock, paced=True)
+    assert clock.now() == 10
+
+def test_paced_replay_out_of_order(tmp_path):
+    """
+    Tests that a paced replay of a CSV with unsorted times replays late rows at once instead of sleeping for a
+    negative interval, on both the virtual and the real-time clock.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+    """
+    path = tmp_path / "unsorted.csv"
+    path.write_text("time,temperature,humidity,response,signal,movement\n"
+                    "100,25,50,Acknowledge,Strong,None\n"
+                    "110,25,50,Acknowledge,Strong,None\n"
+                    "105,25,50,Acknowledge,Strong,None\n"
+                    "115,25,50,Acknowledge,Strong,None\n")
+    clock = VirtualClock()
+    replayer = TraceReplayer(CombinedSimulator(rng=0, sink=RingBufferSink()), CsvReplaySource(path))
+    assert replayer.run(clock, paced=True) == 4
+    assert clock.now() == 15
+    path.write_text("time,temperature,humidity,response,signal,movement\n"
+                    "0.02,25,50,Acknowledge,Strong,None\n"
+                    "0.01,25,50,Acknowledge,Strong,None\n")
+    replayer = TraceReplayer(CombinedSimulator(rng=0, sink=RingBufferSink()), CsvReplaySource(path))
+    assert replayer.run(RealTimeClock(), paced=True) == 2
@@ -18,6 +18,8 @@ Tests:
     - test_invalid_signal: Verifies that the simulated signal strength is not an invalid value.
     - test_invalid_movement: Verifies that the simulated movement is not an invalid value.
     - test_invalid_breathing: Verifies that the simulated breathing pattern is not an invalid value.
+    - test_signal_batch: Verifies that batch signal codes index into the signal label table.
+    - test_simulate_batch: Verifies the struct-of-arrays batch shape, labels and counts.
 """
 
 import pytest
@@ -92,3 +94,32 @@ def test_invalid_breathing(simulator):
     """
     breathing = simulator.simulate_breathing()
     assert breathing == 'Holding Breath', "Test failed intentionally: breathing is not 'Holding Breath'"
+
+
+def test_signal_batch(simulator):
+    """
+    Tests the simulate_signal_batch method of WiFiSimulator.
+
+    Args:
+        simulator: The WiFiSimulator instance provided by the fixture.
+    """
+    codes, labels = simulator.simulate_signal_batch(1000)
+    assert labels == ('Strong', 'Weak', 'No Signal')
+    assert codes.dtype.itemsize == 1
+    assert len(codes) == 1000
+    assert codes.max() < len(labels)
+
+def test_simulate_batch(simulator):
+    """
+    Tests the simulate_batch method of WiFiSimulator.
+
+    Args:
+        simulator: The WiFiSimulator instance provided by the fixture.
+    """
+    batch = simulator.simulate_batch(30000)
+    assert len(batch) == 30000
+    assert batch.nbytes == 3 * 30000
+    assert set(batch.decode('movement')) <= {'None', 'Walking', 'Running', 'Falling'}
+    counts = batch.counts('breathing')
+    assert sum(counts.values()) == 30000
+    assert all(8000 < count < 12000 for count in counts.values())